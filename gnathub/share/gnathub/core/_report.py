@@ -21,15 +21,25 @@ prior to export.
 import GNAThub
 
 import collections
+import collections.abc
+import fnmatch
+import gzip
+import hashlib
 import json
 import logging
+import multiprocessing
 import os
+import sqlite3
+import tempfile
 import time
 import re
+import shutil
 
 from enum import Enum
+from functools import partial
 from itertools import chain
 
+import pygments
 import pygments.lexers
 import pygments.util
 
@@ -37,30 +47,111 @@ from pygments import highlight
 from pygments.formatters import HtmlFormatter
 
 
+def _encode_json(obj, indent=2, separators=None):
+    """Return the JSON-encoded representation of `obj`.
+
+    If `obj` holds values that cannot be serialized, they are encoded as
+    ``null`` and non-ASCII characters are kept as is.
+
+    :param obj: object to serialize
+    :param indent: the indentation level, or None for a single line
+    :type indent: int or None
+    :param separators: the item and key separators, see :func:`json.dumps`
+    :type separators: (str, str) or None
+    :rtype: str
+    """
+
+    def encode_string(s):
+        if isinstance(obj, str):
+            return s.encode("utf-8")
+    try:
+        return json.dumps(obj, indent=indent, separators=separators)
+    except TypeError:
+        return json.dumps(obj, indent=indent, separators=separators,
+                          ensure_ascii=False, default=encode_string)
+
+
 def _write_json(output, obj, indent=2):
     """Dump a JSON-encoded representation of `obj` into `output`.
 
     :param str output: path to the output file
     :param obj: object to serialize and save into `output`
     :type obj: dict or list or str or int
-    :param dict kwargs: the parameters to pass to the underlying
-        :func:`json.dumps` function; see :func:`json.dumps` documentation
-        for more information
+    :param indent: the indentation level, or None for a single line
+    :type indent: int or None
     :raises: IOError
-    :see: :func:`json.dumps`
+    :see: :func:`_encode_json`
     """
+    content = _encode_json(obj, indent=indent)
+    with open(output, 'w') as outfile:
+        outfile.write(content)
 
-    def encode_string(s):
-        if isinstance(obj, str):
-            return s.encode("utf-8")
-    try:
-        with open(output, 'w') as outfile:
-            outfile.write(json.dumps(obj, indent=indent))
-    except TypeError:
-        with open(output, 'w') as outfile:
-            outfile.write(json.dumps(obj, indent=indent,
-                                     ensure_ascii=False,
-                                     default=encode_string))
+
+def _stream_json(output, obj, indent=2):
+    """Dump a JSON-encoded representation of `obj` into `output`, piecewise.
+
+    Unlike :func:`_write_json`, the document is never serialized as a whole:
+    the members of `obj` are encoded and written one at a time. Members given
+    as iterators (eg. generators) are written as JSON arrays, one item at a
+    time, as the iterator produces them. The same applies to the members of
+    items which are dictionaries, at any depth. Everything else is encoded
+    by :func:`_encode_json`.
+
+    With the default indentation the output is the same as the one of
+    :func:`_write_json`.
+
+    :param str output: path to the output file
+    :param dict obj: object to serialize and save into `output`
+    :param indent: the indentation level, or None for the most compact
+        representation
+    :type indent: int or None
+    :raises: IOError
+    """
+    if indent is None:
+        separators = (',', ':')
+
+        def newline(level):
+            return ''
+    else:
+        separators = (',', ': ')
+
+        def newline(level):
+            return '\n' + ' ' * (indent * level)
+
+    def encode(value, level):
+        return _encode_json(value, indent, separators).replace(
+            '\n', newline(level))
+
+    def is_streamed(value):
+        return isinstance(value, collections.abc.Iterator) or (
+            isinstance(value, dict) and any(
+                is_streamed(member) for member in value.values()))
+
+    item_separator, key_separator = separators
+
+    def write(outfile, value, level):
+        if isinstance(value, collections.abc.Iterator):
+            outfile.write('[')
+            empty = True
+            for item in value:
+                outfile.write('{}{}'.format(
+                    '' if empty else item_separator, newline(level + 1)))
+                write(outfile, item, level + 1)
+                empty = False
+            outfile.write(']' if empty else newline(level) + ']')
+        elif level == 0 or is_streamed(value):
+            outfile.write('{')
+            for count, (key, member) in enumerate(value.items()):
+                outfile.write('{}{}{}{}'.format(
+                    item_separator if count else '', newline(level + 1),
+                    encode(key, level + 1), key_separator))
+                write(outfile, member, level + 1)
+            outfile.write(newline(level) + '}' if value else '}')
+        else:
+            outfile.write(encode(value, level))
+
+    with open(output, 'w') as outfile:
+        write(outfile, obj, 0)
 
 
 def _count_extra_newlines(lines):
@@ -102,6 +193,356 @@ class _HtmlFormatter(HtmlFormatter):
         return source
 
 
+class LexerCache(object):
+    """Resolve the Pygments lexer to use for each source file, by suffix.
+
+    :func:`pygments.lexers.guess_lexer_for_filename` scans the whole lexer
+    registry and runs content heuristics for every file. Instead, the lexer
+    of a suffix is resolved once and its instance is shared by all the
+    sources with that suffix. The full guess is kept for suffixes that do
+    not designate a single lexer, and for the file names matched by a more
+    specific pattern than the suffix (eg. "CMakeLists.txt").
+    """
+
+    # The Pygments lexer of each project language
+    LANGUAGES = (('Ada', 'ada'), ('C', 'c'), ('C++', 'cpp'))
+
+    def __init__(self):
+        self.log = logging.getLogger(self.__class__.__name__)
+        self.lexers = {}
+        self.seeded = {}
+        self._registry = None
+
+    def seed(self, language, suffixes):
+        """Use the lexer of ``language`` for files with one of ``suffixes``.
+
+        Such suffixes take precedence over the patterns of the Pygments
+        lexers, eg. to support custom naming schemes.
+
+        :param str language: the name or alias of a Pygments lexer
+        :param collections.Iterable[str] suffixes: the file suffixes
+        """
+        lexer = pygments.lexers.get_lexer_by_name(language)
+        seeded = dict(self.seeded)
+        for suffix in suffixes:
+            if suffix:
+                seeded.setdefault(suffix, lexer)
+
+        # Check the longest suffixes first, eg. ".1.ada" before ".ada"
+        self.seeded = collections.OrderedDict(
+            sorted(seeded.items(), key=lambda item: -len(item[0])))
+
+    def seed_from_project(self):
+        """Seed the cache with the source suffixes of the project.
+
+        See :meth:`seed_languages`.
+        """
+        self.seed_languages(collections.OrderedDict(
+            (alias, GNAThub.Project.source_suffixes(language))
+            for language, alias in self.LANGUAGES))
+
+    def seed_languages(self, suffixes):
+        """Seed the cache with the source suffixes of several languages.
+
+        Suffixes shared by several languages, eg. ".h" for both C and C++,
+        are not seeded: the lexer of such files is guessed from their content.
+
+        :param suffixes: the source suffixes of each language, by name or
+            alias of its Pygments lexer
+        :type suffixes: dict[str, collections.Iterable[str]]
+        """
+        suffixes = {
+            alias: set(language_suffixes)
+            for alias, language_suffixes in suffixes.items()}
+        counts = collections.Counter(chain(*suffixes.values()))
+        for alias, language_suffixes in suffixes.items():
+            ambiguous = [s for s in language_suffixes if s and counts[s] > 1]
+            if ambiguous:
+                self.log.debug('%s: not seeded for %s', ambiguous, alias)
+            self.seed(alias, language_suffixes.difference(ambiguous))
+
+    def _resolve(self, filename):
+        """Return the only lexer matching ``filename``, if any.
+
+        :param str filename: the base name of a source file
+        :rtype: pygments.lexer.Lexer or None
+        """
+        if self._registry is None:
+            self._registry = []
+            for name, _, _, _ in pygments.lexers.get_all_lexers():
+                cls = pygments.lexers.find_lexer_class(name)
+                self._registry.append(
+                    (cls, tuple(cls.filenames) + tuple(cls.alias_filenames)))
+
+        matches = [
+            cls for cls, patterns in self._registry
+            if any(fnmatch.fnmatchcase(filename, p) for p in patterns)]
+        return matches[0]() if len(matches) == 1 else None
+
+    def _resolve_suffix(self, suffix):
+        """Return the lexer of any file with ``suffix``, if any.
+
+        The lexer is resolved for the ``*<suffix>`` pattern. The patterns of
+        the registry which do not cover all the files with ``suffix``, but
+        may match some of them, are returned as well: such files are rather
+        resolved by name.
+
+        :param str suffix: the suffix of a source file, eg. ".txt"
+        :return: the lexer, or None, and the more specific patterns
+        :rtype: (pygments.lexer.Lexer or None, tuple[str])
+        """
+        generic = '*' + suffix
+        lexer = self._resolve(generic)
+        specific = tuple(
+            p for _, patterns in self._registry for p in patterns
+            if not fnmatch.fnmatchcase(generic, p) and (
+                p.endswith(suffix) or p[-1:] in ('*', '?', ']')))
+        return lexer, specific
+
+    def get(self, path, content, log):
+        """Return the lexer to use to highlight a source file.
+
+        :param str path: the path to the source file
+        :param str content: the content of the source file
+        :param logging.Logger log: the logger to use
+        :rtype: pygments.lexer.Lexer
+        """
+        filename = os.path.basename(path)
+        for suffix, lexer in self.seeded.items():
+            if filename.endswith(suffix):
+                return lexer
+
+        suffix = os.path.splitext(filename)[1]
+        if suffix:
+            if suffix not in self.lexers:
+                self.lexers[suffix] = self._resolve_suffix(suffix)
+                self.log.debug(
+                    '%s: lexer is %s', suffix, self.lexers[suffix][0])
+            lexer, specific = self.lexers[suffix]
+            if any(fnmatch.fnmatchcase(filename, p) for p in specific):
+                lexer = self._resolve(filename)
+            if lexer is not None:
+                return lexer
+
+        # Unknown or ambiguous suffix: guess from the file name and content;
+        # fall back on "Null" lexer if no match.
+        try:
+            return pygments.lexers.guess_lexer_for_filename(path, content)
+        except pygments.util.ClassNotFound:
+            log.warn('could not guess lexer from file: %s', path)
+            log.warn('fall back to using TextLexer (ie. no highlighting)')
+            return pygments.lexers.special.TextLexer()
+
+
+class HighlightCache(object):
+    """On-disk cache of highlighted sources, shared across report runs.
+
+    Highlighting only depends on the content of the source, the lexer and the
+    version of Pygments: the highlighted lines are saved under a hash of
+    those, one file per source. The cache is disabled until :meth:`open` is
+    called. Entries are evicted, least recently used first, when the cache
+    grows larger than ``max_size`` bytes.
+
+    The size of the cache is recorded in the ``SIZE_FILE`` file of its
+    directory, and the size of each entry saved since in the ``ADDED_FILE``
+    one, so that the cache is only walked to evict entries once it grew too
+    large.
+
+    Several processes can use the same cache concurrently.
+    """
+
+    VERSION = 1
+    SIZE_FILE = 'size'
+    ADDED_FILE = 'added'
+
+    def __init__(self):
+        self.log = logging.getLogger(self.__class__.__name__)
+        self.path = None
+        self.max_size = 0
+
+    def open(self, path, max_size=512 * 1024 * 1024):
+        """Enable the cache.
+
+        :param str path: the directory holding the cache
+        :param int max_size: the maximum size of the cache, in bytes
+        """
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self.path = path
+        self.max_size = max_size
+
+    def key(self, content, lexer):
+        """Return the key of a highlighted source.
+
+        :param content: the content of the source
+        :type content: str or bytes
+        :param pygments.lexer.Lexer lexer: the lexer used to highlight it
+        :rtype: str
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8', 'surrogateescape')
+        digest = hashlib.sha1(content)
+        digest.update('\0'.join([
+            str(self.VERSION), pygments.__version__,
+            type(lexer).__module__, type(lexer).__name__,
+            _HtmlFormatter.__name__
+        ]).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.path, key[:2], key[2:] + '.json')
+
+    def get(self, key):
+        """Return the highlighted lines saved under ``key``, if any.
+
+        :param str key: see :meth:`key`
+        :rtype: list[str] or None
+        """
+        if self.path is None:
+            return None
+
+        entry = self._entry(key)
+        try:
+            with open(entry, 'r') as infile:
+                lines = json.load(infile)
+            # Record the access for the eviction
+            os.utime(entry, None)
+        except (IOError, OSError, ValueError):
+            return None
+        return lines
+
+    def put(self, key, lines):
+        """Save highlighted lines under ``key``.
+
+        :param str key: see :meth:`key`
+        :param list[str] lines: the highlighted lines
+        """
+        if self.path is None:
+            return
+
+        entry = self._entry(key)
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            # Write to a temporary file first so that concurrent readers
+            # never see a partial entry.
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(entry))
+            try:
+                with os.fdopen(fd, 'w') as outfile:
+                    json.dump(lines, outfile, separators=(',', ':'))
+                size = os.path.getsize(tmp)
+                try:
+                    # The entry replaces one saved by another process
+                    size -= os.path.getsize(entry)
+                except OSError:
+                    pass
+                os.replace(tmp, entry)
+            except BaseException:
+                os.remove(tmp)
+                raise
+            # Short appends are not interleaved: entries can be saved by
+            # several processes at once.
+            added = os.path.join(self.path, self.ADDED_FILE)
+            with open(added, 'a') as outfile:
+                outfile.write('{}\n'.format(size))
+        except (IOError, OSError, TypeError, ValueError):
+            self.log.exception('failed to save highlighted source')
+
+    def _read_size(self):
+        """Return the recorded size of the cache, if any.
+
+        :rtype: int or None
+        """
+        try:
+            with open(os.path.join(self.path, self.SIZE_FILE), 'r') as infile:
+                return int(infile.read())
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _take_added(self):
+        """Return the size of the entries saved since the last eviction.
+
+        :rtype: int
+        """
+        added = os.path.join(self.path, self.ADDED_FILE)
+        # Entries saved from now on are recorded in a new file
+        taken = '{}.{}'.format(added, os.getpid())
+        try:
+            os.replace(added, taken)
+        except OSError:
+            return 0
+        try:
+            with open(taken, 'r') as infile:
+                return sum(int(line) for line in infile if line.strip())
+        except (IOError, ValueError):
+            return 0
+        finally:
+            os.remove(taken)
+
+    def _write_size(self, size):
+        """Record the size of the cache.
+
+        :param int size: the size of the cache, in bytes
+        """
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.path)
+            with os.fdopen(fd, 'w') as outfile:
+                outfile.write(str(size))
+            os.replace(tmp, os.path.join(self.path, self.SIZE_FILE))
+        except (IOError, OSError):
+            self.log.exception('failed to save highlight cache size')
+
+    def evict(self):
+        """Remove the least recently used entries beyond the maximum size.
+
+        The cache is only walked when its recorded size, plus the size of the
+        entries saved since, exceeds the maximum size, or is unknown. The
+        recorded size is an estimate when several processes evict entries at
+        once: the walk computes it again.
+        """
+        if self.path is None:
+            return
+
+        size, added = self._read_size(), self._take_added()
+        if size is not None:
+            size += added
+        if size is not None and size <= self.max_size:
+            self._write_size(size)
+            self.log.debug('highlight cache size: %d bytes', size)
+            return
+
+        entries, size = [], 0
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if root == self.path:
+                    # The recorded sizes, not an entry
+                    continue
+                entry = os.path.join(root, name)
+                try:
+                    stat = os.stat(entry)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry))
+                size += stat.st_size
+
+        entries.sort()
+        for _, entry_size, entry in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(entry)
+            except OSError:
+                continue
+            size -= entry_size
+        self._write_size(size)
+        self.log.debug('highlight cache size: %d bytes', size)
+
+
+# Shared by all sources; when sources are saved by worker processes, each
+# inherits the caches as they were when the pool was created.
+_LEXERS = LexerCache()
+_HIGHLIGHTS = HighlightCache()
+
+
 def _decorate_dict(obj, extra=None):
     """Decorate a Python dictionary with additional properties.
 
@@ -260,42 +701,6 @@ def _encode_coverage(char, status, extra=None):
     }, extra)
 
 
-def with_static(**kwargs):
-    """Declare static variables for functions with annotation."""
-
-    def decorate(func):
-        for k in kwargs:
-            setattr(func, k, kwargs[k])
-        return func
-    return decorate
-
-
-@with_static(rules=None)
-def _rule_by_id(rule_id):
-    """Return the :class:`GNAThub.Rule` with ``rule_id``.
-
-    :param int rule_id: the unique ID of the rule
-    :rtype: GNAThub.Rule
-    """
-    if _rule_by_id.rules is None:
-        _rule_by_id.rules = {rule.id: rule for rule in GNAThub.Rule.list()}
-    return _rule_by_id.rules[rule_id]
-
-
-@with_static(tools=None)
-def _tool_by_id(tool_id):
-    """Return the :class:`GNAThub.Tool` with ``tool_id``.
-
-    :param int tool_id: the unique ID of the tool
-    :rtype: GNAThub.Tool
-    """
-    if _tool_by_id.tools is None:
-        _tool_by_id.tools = {tool.id: tool for tool in GNAThub.Tool.list()}
-    return _tool_by_id.tools[tool_id]
-
-
-# TODO: after checking the FILENAME.json files, maybe erase this function
-# We will keep it for now, as it's used for un un-reviewd part
 def _inc_msg_count(store, key, gen_value, *args):
     """Increment the "message_count" property of a dictionary.
 
@@ -313,35 +718,16 @@ def _inc_msg_count(store, key, gen_value, *args):
     store[key]['_message_count'] += 1
 
 
-def get_list_index(elem, elem_list):
-    """Return the the index correspondng of the given dict in the given list
-
-    :param elem: the dictionary to update/add
-    :param elem_list: the list to update
-    """
-    for idx in range(len(elem_list)):
-        if elem_list[idx]['id'] == elem['id']:
-            return idx
-    return -1
+def _counted_list(store):
+    """Return the values of a store filled by :func:`_inc_msg_count`.
 
+    Values are listed in insertion order, ie. in the order in which their
+    first message was counted.
 
-def inc_msg_count(store, gen_value, *args):
-    """Increment the "message_count" property of a dictionary in a given list.
-
-    Create the dictionary and the "message_count" property if needed
-    and append it to the list.
-
-    :param store: the list to update
-    :param Function gen_value: the function to call to create the value
-        if missing from the dictionary (takes one positional `extra`
-        argument that is a dictionary, ie. see `_encode_*` functions)
-    :param list *args: arguments of the `gen_value` function
+    :param dict store: the dictionary to list
+    :rtype: list[dict[str, *]] or None
     """
-    tmp = gen_value(*args, extra={'_message_count': 0})
-    i = get_list_index(tmp, store)
-    if i == -1:
-        store.append(gen_value(*args, extra={'_message_count': 0}))
-    store[i]['_message_count'] += 1
+    return list(store.values()) or None
 
 
 class Average(object):
@@ -373,14 +759,48 @@ class Average(object):
         return self._acc / self._count
 
 
+class SourceFormat(collections.namedtuple(
+        'SourceFormat', ('compact', 'raw_content'))):
+    """How to JSON-encode source files.
+
+    ``compact``: whether to use the compact format. Messages are then only
+    listed once, in the ``messages`` field of the source: ``lines[n].messages``
+    holds the index of the messages in that list rather than the messages
+    themselves, ``lines[n].coverage`` is omitted (see the ``coverage`` field
+    of the source), and the JSON document is not indented. The source is
+    flagged with ``"compact": true``.
+
+    ``raw_content``: whether to keep the raw text of each line in
+    ``lines[n].content``, next to its highlighted version. The raw text is
+    always kept if the highlighting failed.
+    """
+
+    __slots__ = ()
+
+    @property
+    def indent(self):
+        """The indentation of the JSON document.
+
+        :rtype: int or None
+        """
+        return None if self.compact else 2
+
+
+DEFAULT_SOURCE_FORMAT = SourceFormat(compact=False, raw_content=True)
+
+
 # TODO: Chech the FILENAME.json files creation
 class SourceBuilder(object):
     """Representation of a source file."""
 
-    def __init__(self, project, path):
+    def __init__(self, project, path, messages):
         """
         :param str project: the name of the project
         :param str path: the path to the source
+        :param messages: the messages attached to this source, with their
+            rule and tool, see :meth:`GNAThub.Resource.list_all_messages`
+        :type messages: list[(GNAThub.MessageRecord, GNAThub.RuleRecord,
+            GNAThub.ToolRecord)]
         """
         self.project = project
         self.path = path
@@ -395,7 +815,8 @@ class SourceBuilder(object):
         self.message_count = collections.defaultdict(int)
         self.all_messages, self.all_annotations = [], []
         self.id_array = []
-        self._process_messages()
+        self._header = None
+        self._process_messages(messages)
 
     @property
     def file_coverage(self):
@@ -411,12 +832,14 @@ class SourceBuilder(object):
             for _, status in self.coverage.values()
         ) * 100 / len(self.coverage)
 
-    def _process_messages(self):
-        """Process all messages attached to this source file."""
-        for message in GNAThub.Resource.get(self.path).list_messages():
-            rule = _rule_by_id(message.rule_id)
-            tool = _tool_by_id(rule.tool_id)
+    def _process_messages(self, messages):
+        """Process all messages attached to this source file.
 
+        :param messages: see :meth:`__init__`
+        :type messages: list[(GNAThub.MessageRecord, GNAThub.RuleRecord,
+            GNAThub.ToolRecord)]
+        """
+        for message, rule, tool in messages:
             if rule.identifier == 'coverage':
                 # Only one coverage tool shall be used. The last entry
                 # overwrites previous ones.
@@ -462,16 +885,25 @@ class SourceBuilder(object):
         }
         return this
 
-    def to_json(self):
-        """Generate the JSON-encoded representation of a source file.
+    def _encode_header(self):
+        """Generate the database-dependent part of the source JSON encoding.
+
+        The ``lines`` field is left empty: it is filled by
+        :func:`_render_source` which only needs the source file itself, and
+        can thus run outside of the GNAThub process.
 
         :rtype: dict[str, *]
         """
-        if not os.path.isfile(self.path):
-            self.log.error('%s: not such file (%s)', self.filename, self.path)
-            return
+        if self._header is None:
+            self._header = self._do_encode_header()
+        return self._header
 
-        this = {
+    def _do_encode_header(self):
+        """Implementation of :meth:`_encode_header`.
+
+        :rtype: dict[str, *]
+        """
+        return {
             'project': self.project,
             'filename': self.filename,
             'source_dir': self.source_dir,
@@ -488,33 +920,108 @@ class SourceBuilder(object):
             'lines': None
         }
 
+    def fingerprint(self):
+        """Compute the fingerprint of the source file and of its messages.
+
+        Two sources with the same fingerprint have the same JSON-encoded
+        representation.
+
+        :return: the hexadecimal digest of the source content and the one of
+            its database-dependent encoding, ``None`` if the file is missing
+        :rtype: list[str] or None
+        """
         try:
-            try:
-                with open(self.path, 'r') as infile:
-                    content = infile.read()
-            except UnicodeDecodeError:
-                with open(self.path, 'rb') as infile:
-                    content = infile.read().decode('iso-8859-1').encode('utf8')
+            with open(self.path, 'rb') as infile:
+                content = hashlib.sha1(infile.read()).hexdigest()
         except IOError:
-            self.log.exception('failed to read source file: %s', self.path)
-            self.log.warn('report will be incomplete')
             return None
 
-        # NOTE: Pygments lexer seems to drop those leading and trailing new
-        # lines in its output. Add them back after HTMLization to avoid line
-        # desynchronization with the original files.
-        lines = content.splitlines()
-        lead_nl_count, trail_nl_count = _count_extra_newlines(lines)
+        messages = hashlib.sha1(json.dumps(
+            self._encode_header(), sort_keys=True).encode('utf-8'))
+        return [content, messages.hexdigest()]
 
-        # Select the appropriate lexer; fall back on "Null" lexer if no match.
-        try:
-            lex = pygments.lexers.guess_lexer_for_filename(self.path, content)
-        except pygments.util.ClassNotFound:
-            self.log.warn('could not guess lexer from file: %s', self.path)
-            self.log.warn('fall back to using TextLexer (ie. no highlighting)')
-            lex = pygments.lexers.special.TextLexer()
+    def to_json(self, fmt=DEFAULT_SOURCE_FORMAT):
+        """Generate the JSON-encoded representation of a source file.
 
-        # Attempt to highligth the source file; fall back to raw on failure.
+        :param SourceFormat fmt: the format of the encoding
+        :rtype: dict[str, *]
+        """
+        if not os.path.isfile(self.path):
+            self.log.error('%s: not such file (%s)', self.filename, self.path)
+            return
+
+        return _render_source(self.path, self._encode_header(), self.log, fmt)
+
+    def save_as(self, path, fmt=DEFAULT_SOURCE_FORMAT):
+        """Save the JSON-encoded representation of the source file to disk.
+
+        :param str path: the path to the output file
+        :param SourceFormat fmt: the format of the encoding
+        """
+        self.log.info('writing source %s', self.filename)
+        _write_json(path, self.to_json(fmt), indent=fmt.indent)
+
+    def save_as_async(self, pool, path, fmt=DEFAULT_SOURCE_FORMAT):
+        """Schedule the saving of the source file into a pool of workers.
+
+        Only the database-dependent part of the encoding is computed in the
+        calling process; highlighting and JSON encoding are done by the
+        worker.
+
+        :param multiprocessing.pool.Pool pool: the pool of workers
+        :param str path: the path to the output file
+        :param SourceFormat fmt: the format of the encoding
+        :rtype: multiprocessing.pool.AsyncResult
+        """
+        if not os.path.isfile(self.path):
+            self.log.error('%s: not such file (%s)', self.filename, self.path)
+            return pool.apply_async(_write_json, (path, None))
+
+        self.log.info('writing source %s', self.filename)
+        return pool.apply_async(
+            _save_source, (self.path, self._encode_header(), path, fmt))
+
+
+def _render_source(path, this, log, fmt=DEFAULT_SOURCE_FORMAT):
+    """Complete the JSON-encoded representation of a source file.
+
+    Read the source file, highlight it and fill the ``lines`` field of
+    ``this``. This function does not access the GNAThub database.
+
+    :param str path: the path to the source file
+    :param dict[str, *] this: the partial encoding, see
+        :meth:`SourceBuilder._encode_header`
+    :param logging.Logger log: the logger to use
+    :param SourceFormat fmt: the format of the encoding
+    :rtype: dict[str, *] or None
+    """
+    try:
+        try:
+            with open(path, 'r') as infile:
+                content = infile.read()
+        except UnicodeDecodeError:
+            with open(path, 'rb') as infile:
+                content = infile.read().decode('iso-8859-1').encode('utf8')
+    except IOError:
+        log.exception('failed to read source file: %s', path)
+        log.warn('report will be incomplete')
+        return None
+
+    # NOTE: Pygments lexer seems to drop those leading and trailing new
+    # lines in its output. Add them back after HTMLization to avoid line
+    # desynchronization with the original files.
+    lines = content.splitlines()
+    lead_nl_count, trail_nl_count = _count_extra_newlines(lines)
+
+    # Select the appropriate lexer
+    lex = _LEXERS.get(path, content, log)
+
+    # Reuse the highlighting of a previous run if the source is unchanged.
+    key = _HIGHLIGHTS.key(content, lex)
+    highlighted = _HIGHLIGHTS.get(key)
+
+    # Attempt to highligth the source file; fall back to raw on failure.
+    if highlighted is None:
         try:
             # HTML formatter outputting the decorated source code as a DOM.
             highlighted = (
@@ -527,43 +1034,298 @@ class SourceBuilder(object):
                     'expected {}, got {}'
                 ]).format(len(lines), len(highlighted)))
         except Exception:
-            self.log.exception('failed to generate HTML: %s', self.path)
-            self.log.warn('source file content may not be available')
+            log.exception('failed to generate HTML: %s', path)
+            log.warn('source file content may not be available')
             highlighted = None
+        else:
+            _HIGHLIGHTS.put(key, highlighted)
 
-        this['lines'] = [{
-            'number': no,
-            'content': lines[no - 1],
-            'html_content': highlighted[no - 1] if highlighted else None,
-            'coverage': (
-                _encode_coverage(*self.coverage[no])
-                if no in self.coverage else None),
-            'messages': [
-                _encode_message(*message) for message in self.messages[no]
-            ] if no in self.messages else None,
-        } for no in range(1, len(lines) + 1)]
-
-        # Return the best-effort representation of the source file.
-        return this
+    coverage = this['coverage'] or {}
+    messages = collections.defaultdict(list)
+    for index, message in enumerate(this['messages'] or ()):
+        messages[message['line']].append(index if fmt.compact else message)
 
-    def save_as(self, path):
-        """Save the JSON-encoded representation of the source file to disk.
+    def encode_line(no):
+        line = {'number': no}
+        if fmt.raw_content or not highlighted:
+            line['content'] = lines[no - 1]
+        line['html_content'] = highlighted[no - 1] if highlighted else None
+        if not fmt.compact:
+            line['coverage'] = coverage.get(no)
+        if no in messages or not fmt.compact:
+            line['messages'] = messages[no] if no in messages else None
+        return line
+
+    if fmt.compact:
+        this['compact'] = True
+    this['lines'] = [encode_line(no) for no in range(1, len(lines) + 1)]
+
+    # Return the best-effort representation of the source file.
+    return this
+
+
+def _save_source(path, this, output, fmt):
+    """Render a source file and save its JSON-encoded representation.
+
+    This is the entry point of the worker processes of :class:`SourceWriter`.
+
+    :param str path: the path to the source file
+    :param dict[str, *] this: see :func:`_render_source`
+    :param str output: the path to the output file
+    :param SourceFormat fmt: see :func:`_render_source`
+    """
+    log = logging.getLogger(
+        '{}({})'.format(SourceBuilder.__name__, os.path.basename(path)))
+    _write_json(
+        output, _render_source(path, this, log, fmt), indent=fmt.indent)
+
+
+class SourceManifest(object):
+    """Fingerprints of the sources saved by a previous report generation.
+
+    This allows skipping the generation of sources whose content and messages
+    did not change since the last run.
+    """
+
+    # Bump this version whenever the JSON encoding of sources changes
+    VERSION = 1
+
+    def __init__(self, path, settings=None):
+        """
+        :param str path: the path to the manifest file
+        :param settings: the report settings having an impact on the
+            encoding; a change of settings invalidates the whole manifest
+        :type settings: dict[str, *] or None
+        """
+        self.path = path
+        self.log = logging.getLogger(self.__class__.__name__)
+        self.settings = dict(settings or {})
+        self.settings.update({
+            'version': self.VERSION,
+            'pygments': pygments.__version__
+        })
+        self.previous, self.current = {}, {}
+
+        if os.path.isfile(self.path):
+            try:
+                with open(self.path, 'r') as infile:
+                    manifest = json.load(infile)
+                if manifest.get('settings') == self.settings:
+                    self.previous = manifest.get('sources') or {}
+                else:
+                    self.log.info('report settings changed, regenerate all')
+            except (IOError, ValueError):
+                self.log.exception('%s: invalid manifest, ignore', self.path)
+
+    def is_up_to_date(self, output, fingerprint):
+        """Whether ``output`` was generated from a source of same fingerprint.
+
+        Sources sharing the same base name are saved to the same output: only
+        the first one of a run can be considered up to date.
+
+        :param str output: the path to the output file
+        :param list[str] fingerprint: see :meth:`SourceBuilder.fingerprint`
+        :rtype: boolean
+        """
+        key = os.path.basename(output)
+        return (
+            fingerprint is not None and key not in self.current and
+            self.previous.get(key) == fingerprint and os.path.isfile(output))
+
+    def update(self, output, fingerprint):
+        """Record the fingerprint of the source saved as ``output``.
+
+        :param str output: the path to the output file
+        :param list[str] fingerprint: see :meth:`SourceBuilder.fingerprint`
+        """
+        self.current[os.path.basename(output)] = fingerprint
 
+    def save(self):
+        """Save the fingerprints of the sources of this run to disk."""
+        _write_json(self.path, {
+            'settings': self.settings,
+            'sources': self.current
+        }, indent=None)
+
+
+class SourceWriter(object):
+    """Save sources JSON-encoded representation, possibly in parallel.
+
+    With more than one job, sources are highlighted and encoded by a pool of
+    forked worker processes. Only the database queries are performed by the
+    calling process, in the order sources are given, so that the index built
+    alongside stays deterministic.
+    """
+
+    def __init__(self, jobs=1, manifest=None, fmt=DEFAULT_SOURCE_FORMAT):
+        """
+        :param int jobs: the number of worker processes to use; ``0`` means
+            one per CPU
+        :param manifest: if not ``None``, skip sources that did not change
+            since the generation of this manifest
+        :type manifest: SourceManifest or None
+        :param SourceFormat fmt: the format of the encoding
+        """
+        self.log = logging.getLogger(self.__class__.__name__)
+        self.jobs = jobs if jobs > 0 else multiprocessing.cpu_count()
+        self.manifest = manifest
+        self.fmt = fmt
+        self.pool = None
+        self.pending = collections.deque()
+        self.skipped_count = 0
+
+        if self.jobs > 1:
+            try:
+                context = multiprocessing.get_context('fork')
+            except ValueError:
+                self.log.warn('fork not available: saving sources serially')
+            else:
+                self.log.debug('spawn %d source writers', self.jobs)
+                self.pool = context.Pool(self.jobs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        elif self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+
+    def save(self, source, path):
+        """Save the JSON-encoded representation of a source file.
+
+        :param SourceBuilder source: the source to save
         :param str path: the path to the output file
         """
-        self.log.info('writing source %s', self.filename)
-        _write_json(path, self.to_json(), indent=2)
+        if self.manifest is not None:
+            fingerprint = source.fingerprint()
+            up_to_date = self.manifest.is_up_to_date(path, fingerprint)
+            self.manifest.update(path, fingerprint)
+            if up_to_date:
+                self.log.debug('%s: up to date', source.filename)
+                self.skipped_count += 1
+                return
+
+        if self.pool is None:
+            source.save_as(path, self.fmt)
+            return
+
+        self.pending.append(source.save_as_async(self.pool, path, self.fmt))
+
+        # Bound the number of encoded sources waiting for a worker
+        while len(self.pending) > self.jobs * 4:
+            self.pending.popleft().get()
+
+    def close(self):
+        """Wait for all scheduled sources to be saved."""
+        if self.pool is not None:
+            while self.pending:
+                self.pending.popleft().get()
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+        # Only record the new fingerprints once all sources are saved
+        if self.manifest is not None:
+            self.manifest.save()
+
+
+def _gzip_file(path):
+    """Write the gzip-compressed copy of a file next to it.
+
+    The copy, ``<path>.gz``, has the same modification time as the file so that
+    readers can tell whether it is up to date.
+
+    :param str path: the path to the file
+    """
+    fd, tmp = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix='.', suffix='.gz')
+    try:
+        with os.fdopen(fd, 'wb') as output, open(path, 'rb') as content:
+            with gzip.GzipFile('', 'wb', fileobj=output, mtime=0) as gz:
+                shutil.copyfileobj(content, gz)
+        stat = os.stat(path)
+        os.utime(tmp, (stat.st_atime, stat.st_mtime))
+        os.replace(tmp, path + '.gz')
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def compress_json(directory, enabled=True, jobs=1):
+    """Synchronize the gzip-compressed copies of the JSON files of a tree.
+
+    Compress the JSON files having no up-to-date copy, or remove all copies if
+    compression is disabled.
+
+    :param str directory: the root of the tree
+    :param bool enabled: whether to compress the JSON files
+    :param int jobs: the number of worker processes to use; ``0`` means one
+        per CPU
+    :return: the number of files compressed
+    :rtype: int
+    """
+    stale = []
+    for root, _, files in os.walk(directory):
+        for filename in files:
+            path = os.path.join(root, filename)
+            if filename.endswith('.json.gz'):
+                if not enabled or not os.path.isfile(path[:-len('.gz')]):
+                    os.unlink(path)
+            elif enabled and filename.endswith('.json'):
+                try:
+                    compressed = os.stat(path + '.gz').st_mtime
+                except OSError:
+                    compressed = None
+                if compressed != os.stat(path).st_mtime:
+                    stale.append(path)
+
+    jobs = jobs if jobs > 0 else multiprocessing.cpu_count()
+    if jobs > 1 and len(stale) > 1:
+        pool = multiprocessing.get_context('fork').Pool(jobs)
+        try:
+            pool.map(_gzip_file, stale)
+        finally:
+            pool.terminate()
+            pool.join()
+    else:
+        for path in stale:
+            _gzip_file(path)
+    return len(stale)
+
+
+def _encode_source_file(source):
+    """Encode a source file as listed by its source directory.
+
+    :param dict[str, *] source: see :meth:`SourceBuilder.sources_to_json`
+    :rtype: dict[str, *]
+    """
+    return {
+        'filename': source['filename'],
+        'coverage': source['coverage'],
+        'message_count': source['message_count'],
+        '_total_message_count': source['_total_message_count']
+    }
 
 
 class SourceDirBuilder(object):
     """Representation of a source directory."""
 
-    def __init__(self, path):
+    def __init__(self, path, spilled_sources=None):
         """
         :param str path: the path to the source directory
+        :param spilled_sources: if not ``None``, the function returning the
+            JSON-encoded sources of the directory, read back when encoding
+            the directory rather than kept in memory, see
+            :meth:`SpilledSourceList.iter_source_dir`
+        :type spilled_sources: (() -> collections.Iterable[dict[str, *]])
+            or None
         """
         self.path = path
         self.source_files = []
+        self.spilled_sources = spilled_sources
         self.coverage = None
 
         self._coverage_avg = Average()
@@ -575,15 +1337,11 @@ class SourceDirBuilder(object):
         :param SourceBuilder source: the source to add to this directory
         """
         file_coverage = source.file_coverage
-        self.source_files.append({
-            'filename': source.filename,
-            'coverage': file_coverage,
-            'message_count': source.message_count,
-            '_total_message_count': sum(
-                len(messages) for messages in source.messages.values())
-        })
-        for _, _, tool in chain.from_iterable(iter(source.messages.values())):
-            self.message_count[tool.id] += 1
+        if self.spilled_sources is None:
+            self.source_files.append(_encode_source_file(
+                source.sources_to_json(source.project)))
+        for tool_id, count in source.message_count.items():
+            self.message_count[tool_id] += count
         self._coverage_avg.add(file_coverage)
 
     def to_json(self):
@@ -591,11 +1349,14 @@ class SourceDirBuilder(object):
 
         :rtype: dict[str, *]
         """
+        if self.spilled_sources is None:
+            sources = self.source_files
+        else:
+            sources = (_encode_source_file(source)
+                       for source in self.spilled_sources())
         return {
             'name': self.path,
-            'sources': [
-                source for source in self.source_files
-            ],
+            'sources': sources,
             'coverage': self._coverage_avg.compute(),
             'message_count': self.message_count or None,
             '_total_message_count': sum(self.message_count.values())
@@ -605,11 +1366,15 @@ class SourceDirBuilder(object):
 class ModuleBuilder(object):
     """Representation of a module (ie. a project)."""
 
-    def __init__(self, name):
+    def __init__(self, name, spilled_sources=None):
         """
         :param str name: the name of the project or subproject
+        :param spilled_sources: if not ``None``, the sources of the index,
+            from which the source directories read back their sources
+        :type spilled_sources: SpilledSourceList or None
         """
         self.name = name
+        self.spilled_sources = spilled_sources
         self.source_dirs = {}
         self.coverage = None
         self.log = logging.getLogger(
@@ -624,7 +1389,11 @@ class ModuleBuilder(object):
         :param SourceBuilder source: the source to add to this module
         """
         if source.source_dir not in self.source_dirs:
-            source_dir = SourceDirBuilder(source.source_dir)
+            source_dir = SourceDirBuilder(
+                source.source_dir,
+                None if self.spilled_sources is None else partial(
+                    self.spilled_sources.iter_source_dir,
+                    self.name, source.source_dir))
             self.source_dirs[source.source_dir] = source_dir
         self.source_dirs[source.source_dir].add_source(source)
 
@@ -640,10 +1409,10 @@ class ModuleBuilder(object):
         paths = list(self.source_dirs.keys())
         return {
             'name': self.name,
-            'source_dirs': [
+            'source_dirs': (
                 source_dir.to_json()
                 for path, source_dir in self.source_dirs.items()
-            ],
+            ),
             'coverage': self._coverage_avg.compute(),
             'message_count': self.message_count or None,
             '_total_message_count': sum(self.message_count.values()),
@@ -653,21 +1422,130 @@ class ModuleBuilder(object):
         }
 
 
+class SourceList(list):
+    """The JSON-encoded sources of the index, kept in memory."""
+
+    def iter_by_source_dir(self):
+        """Iterate over the sources, grouped by project and source directory.
+
+        Groups come in the order of their first source, and sources of a
+        group in the order they were added.
+
+        :rtype: collections.Iterable[dict[str, *]]
+        """
+        groups = collections.OrderedDict()
+        for source in self:
+            groups.setdefault(
+                (source['projectName'], source['source_dir']), []
+            ).append(source)
+        return chain.from_iterable(groups.values())
+
+    def close(self):
+        """Release the sources."""
+        del self[:]
+
+
+class SpilledSourceList(object):
+    """The JSON-encoded sources of the index, saved in a temporary database.
+
+    This is the bounded-memory equivalent of :class:`SourceList`: sources
+    are serialized as soon as they are added, and read back one at a time.
+    """
+
+    def __init__(self, directory):
+        """
+        :param str directory: the directory where to create the temporary
+            database
+        """
+        fd, self.path = tempfile.mkstemp(suffix='.db', dir=directory)
+        os.close(fd)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            'CREATE TABLE sources (seq INTEGER PRIMARY KEY,'
+            ' project TEXT, source_dir TEXT, data TEXT)')
+        self.connection.execute(
+            'CREATE INDEX sources_source_dir'
+            ' ON sources (project, source_dir, seq)')
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return self._select('SELECT data FROM sources ORDER BY seq')
+
+    def _select(self, query):
+        for data, in self.connection.execute(query):
+            yield json.loads(data)
+
+    def append(self, source):
+        """Save a JSON-encoded source.
+
+        :param dict[str, *] source: see :meth:`SourceBuilder.sources_to_json`
+        """
+        self.connection.execute(
+            'INSERT INTO sources (project, source_dir, data) VALUES (?, ?, ?)',
+            (source['projectName'], source['source_dir'],
+             json.dumps(source, separators=(',', ':'))))
+        self.count += 1
+
+    def iter_by_source_dir(self):
+        """See :meth:`SourceList.iter_by_source_dir`."""
+        return self._select(
+            'SELECT s.data FROM sources s,'
+            '  (SELECT project, source_dir, MIN(seq) AS first FROM sources'
+            '   GROUP BY project, source_dir) g'
+            ' WHERE s.project = g.project AND s.source_dir = g.source_dir'
+            ' ORDER BY g.first, s.seq')
+
+    def iter_source_dir(self, project, source_dir):
+        """Iterate over the sources of a source directory.
+
+        :param str project: the name of the project
+        :param str source_dir: the path to the source directory
+        :rtype: collections.Iterable[dict[str, *]]
+        """
+        for data, in self.connection.execute(
+                'SELECT data FROM sources'
+                ' WHERE project = ? AND source_dir = ? ORDER BY seq',
+                (project, source_dir)):
+            yield json.loads(data)
+
+    def close(self):
+        """Remove the temporary database."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+            os.remove(self.path)
+
+
 class IndexBuilder(object):
     """Representation of the HTML report index."""
 
-    def __init__(self):
+    # Maximum number of messages of a shard of the message index, see
+    # message_to_json. Sources are never split across shards.
+    SHARD_MESSAGE_COUNT = 20000
+
+    def __init__(self, spill=False):
+        """
+        :param bool spill: whether to save the JSON-encoded sources in a
+            temporary database rather than keeping them in memory, see
+            :class:`SpilledSourceList`
+        """
         self.source_files = GNAThub.Project.source_files()
         self.source_file_count = sum(
             len(sources)
             for sources in self.source_files.values())
         self.log = logging.getLogger(__name__)
 
-        self.tools, self.rules, self.props = [], [], []
-        # TODO: Find the way to fill self.ranking and self.review_status
-        self.ranking, self.review_status = [], []
+        # Encoded entities indexed by their ID, see _inc_msg_count
+        self.tools, self.rules, self.props = {}, {}, {}
+        # TODO: Find the way to fill self.review_status
+        self.ranking, self.review_status = {}, []
         self.modules = {}
-        self.sources = []
+        self.sources = (
+            SpilledSourceList(GNAThub.root()) if spill else SourceList())
+        self.spill = spill
         self.message_count = collections.defaultdict(int)
 
     def save_source(self, source):
@@ -678,94 +1556,151 @@ class IndexBuilder(object):
         :rtype: SourceBuilder
         """
         if source.project not in self.modules:
-            self.modules[source.project] = ModuleBuilder(source.project)
+            self.modules[source.project] = ModuleBuilder(
+                source.project, self.sources if self.spill else None)
         self.modules[source.project].add_source(source)
         self.sources.append(source.sources_to_json(source.project))
 
         for message, rule, tool in chain.from_iterable(
             iter(source.messages.values())
         ):
-            inc_msg_count(self.tools, _encode_tool, tool)
-            inc_msg_count(self.rules, _encode_rule, rule, tool)
-            inc_msg_count(self.ranking, _encode_ranking, message, tool)
+            _inc_msg_count(self.tools, tool.id, _encode_tool, tool)
+            _inc_msg_count(self.rules, rule.id, _encode_rule, rule, tool)
+            _inc_msg_count(self.ranking, message.ranking, _encode_ranking,
+                           message, tool)
             for prop in message.get_properties():
-                inc_msg_count(self.props, _encode_property, prop, tool)
+                _inc_msg_count(self.props, prop.id, _encode_property,
+                               prop, tool)
         for tool_id, count in source.message_count.items():
             self.message_count[tool_id] += count
 
         return source
 
-    def full_json(self, path):
+    def full_json(self, path, indent=2):
         """Create and fill an object,
         then create the JSON file to the given path
 
         This one is for debugging purpose
 
         :param path string: the path to create the file
+        :param indent: see :func:`_stream_json`
         """
         tmp = {
             'project': GNAThub.Project.name(),
             '_total_message_count': sum(self.message_count.values()),
             '_database': GNAThub.database(),
             'creation_time': int(time.time()),
-            'properties': self.props or None,
-            'tools': self.tools or None,
-            'rules': self.rules or None,
-            'ranking': self.ranking or None,
+            'properties': _counted_list(self.props),
+            'tools': _counted_list(self.tools),
+            'rules': _counted_list(self.rules),
+            'ranking': _counted_list(self.ranking),
             'review_status': self.review_status or None,
-            'modules': [module.to_json() for name,
-                        module in self.modules.items()],
-            'sources': self.sources
+            'modules': (module.to_json() for module in self.modules.values()),
+            'sources': iter(self.sources)
         }
-        _write_json(path, tmp, indent=2)
+        _stream_json(path, tmp, indent)
 
-    def code_to_json(self, path):
+    def code_to_json(self, path, indent=2):
         """Create and fill an object,
         then create the JSON file to the given path
 
         This one is for code navigation
 
         :param path string: the path to create the file
+        :param indent: see :func:`_stream_json`
         """
         tmp = {
-            'modules': [module.to_json()
-                        for name, module in self.modules.items()]
+            'modules': (module.to_json() for module in self.modules.values())
         }
-        _write_json(path, tmp, indent=2)
+        _stream_json(path, tmp, indent)
+
+    def _iter_message_shards(self):
+        """Split the sources in shards of the message index.
 
-    def message_to_json(self, path):
+        Each shard holds sources of a single source directory, and at most
+        SHARD_MESSAGE_COUNT messages (unless a single source has more).
+
+        :return: the project, source directory and sources of each shard
+        :rtype: collections.Iterable[(str, str, list[dict[str, *]])]
+        """
+        shard_key, shard_count, sources = None, 0, []
+        for source in self.sources.iter_by_source_dir():
+            key = (source['projectName'], source['source_dir'])
+            count = source['_total_message_count']
+            if sources and (key != shard_key or (
+                    shard_count and
+                    shard_count + count > self.SHARD_MESSAGE_COUNT)):
+                yield shard_key + (sources,)
+                shard_count, sources = 0, []
+            shard_key = key
+            shard_count += count
+            sources.append(source)
+
+        if sources:
+            yield shard_key + (sources,)
+
+    def message_to_json(self, path, shard_dir, indent=2):
         """Create and fill an object,
         then create the JSON file to the given path
 
-        This one is for message navigation
+        This one is for message navigation. The messages are saved in
+        shards, under ``shard_dir``, so that the web UI can load them one at
+        a time: the file created at ``path`` only lists the shards, along
+        with their message count.
 
         :param path string: the path to create the file
+        :param shard_dir string: the directory where to create the shards
+        :param indent: see :func:`_stream_json`
         """
+        shards = []
+        for project, source_dir, sources in self._iter_message_shards():
+            name = 'messages-{}.json'.format(len(shards))
+            _stream_json(os.path.join(shard_dir, name), {
+                'sources': iter(sources)
+            }, indent)
+
+            message_count = collections.defaultdict(int)
+            for source in sources:
+                for tool_id, count in source['message_count'].items():
+                    message_count[tool_id] += count
+            shards.append({
+                'file': '/'.join(
+                    os.path.relpath(shard_dir, os.path.dirname(path)).split(
+                        os.sep) + [name]),
+                'project': project,
+                'source_dir': source_dir,
+                'source_count': len(sources),
+                'message_count': message_count or None,
+                '_total_message_count': sum(message_count.values())
+            })
+
         tmp = {
-            'sources': self.sources
+            '_total_message_count': sum(self.message_count.values()),
+            'shards': iter(shards)
         }
-        _write_json(path, tmp, indent=2)
+        _stream_json(path, tmp, indent)
 
-    def filter_to_json(self, path):
+    def filter_to_json(self, path, indent=2):
         """Create and fill an object,
         then create the JSON file to the given path
 
         This one is for filter panel
 
         :param path string: the path to create the file
+        :param indent: see :func:`_stream_json`
         """
         tmp = {
             'project': GNAThub.Project.name(),
             '_total_message_count': sum(self.message_count.values()),
             '_database': GNAThub.database(),
             'creation_time': int(time.time()),
-            'properties': self.props or None,
-            'tools': self.tools or None,
-            'rules': self.rules or None,
-            'ranking': self.ranking or None,
+            'properties': _counted_list(self.props),
+            'tools': _counted_list(self.tools),
+            'rules': _counted_list(self.rules),
+            'ranking': _counted_list(self.ranking),
             'review_status': self.review_status or None
         }
-        _write_json(path, tmp, indent=2)
+        _stream_json(path, tmp, indent)
 
     def custom_review_to_json(self, path):
         """Create and fill an object,
@@ -800,16 +1735,52 @@ class IndexBuilder(object):
 class ReportBuilder(object):
     """Report builder."""
 
-    def __init__(self):
+    def __init__(self, spill=False):
+        """
+        :param bool spill: whether to bound the memory used to build the
+            report by spilling data to temporary databases; this is slower
+        """
         self.log = logging.getLogger(self.__class__.__name__)
-        self.index = IndexBuilder()
+        self.spill = spill
+        self.index = IndexBuilder(spill)
+        self.highlight_cache = _HIGHLIGHTS
+        _LEXERS.seed_from_project()
+        _HIGHLIGHTS.open(os.path.join(GNAThub.root(), 'cache', 'highlight'))
 
     def iter_sources(self):
         """Iterate over sources and yield JSON-encoded, augmenting the index.
 
+        All messages are read from the database at once, then dispatched to
+        their source. When spilling, messages are rather read source by
+        source, see :class:`GNAThub.MessageReader`.
+
+        :yield: SourceBuilder
+        """
+        if self.spill:
+            with GNAThub.MessageReader() as reader:
+                for source in self._iter_sources(reader.messages):
+                    yield source
+            return
+
+        messages = GNAThub.Resource.list_all_messages()
+        self.log.info('loaded messages of %d resources', len(messages))
+        for source in self._iter_sources(lambda path: messages.pop(path, [])):
+            yield source
+
+    def _iter_sources(self, get_messages):
+        """Implementation of :meth:`iter_sources`.
+
+        :param get_messages: the function returning the messages of a source
+            given its path
+        :type get_messages: (str) -> list
         :yield: SourceBuilder
         """
         for project, sources in self.index.source_files.items():
             for path in sources:
                 self.log.info('processing %s', path)
-                yield self.index.save_source(SourceBuilder(project, path))
+                yield self.index.save_source(
+                    SourceBuilder(project, path, get_messages(path)))
+
+    def close(self):
+        """Release the resources used to build the report."""
+        self.index.sources.close()
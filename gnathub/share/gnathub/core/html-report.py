@@ -27,7 +27,8 @@ import os
 from GNAThub import Console, Plugin, Reporter
 
 from shutil import copy2, copytree, rmtree
-from _report import ReportBuilder
+from _report import ReportBuilder, SourceFormat, SourceManifest, SourceWriter
+from _report import compress_json
 
 
 class HTMLReport(Plugin, Reporter):
@@ -58,6 +59,77 @@ class HTMLReport(Plugin, Reporter):
 
         return os.path.join(GNAThub.root(), self.name)
 
+    @property
+    def manifest_path(self):
+        """Return the path to the manifest of the generated sources.
+
+        It records the fingerprint of each source saved in the report so that
+        unchanged sources can be skipped by the next run.
+
+        :return: the full path to the manifest file
+        :rtype: str
+        """
+        return os.path.join(self.output_dir, 'sources.manifest')
+
+    @staticmethod
+    def _project_flag(name):
+        """Return whether a boolean project attribute is set to ``True``.
+
+        :param str name: the name of the attribute
+        :rtype: boolean
+        """
+        value = GNAThub.Project.property_as_string(name)
+        return value.strip().lower() == 'true'
+
+    @property
+    def json_indent(self):
+        """Return the indentation of the JSON-encoded report indexes.
+
+        Indexes are pretty-printed unless the ``Compact_JSON`` attribute of
+        the project is set to ``True``.
+
+        :return: the indentation level, or None for compact JSON
+        :rtype: int or None
+        """
+        return None if self._project_flag('Compact_JSON') else 2
+
+    @property
+    def source_format(self):
+        """Return the format of the JSON-encoded sources.
+
+        Sources use the compact format when the ``Compact_JSON`` attribute of
+        the project is set to ``True``. Their raw text is omitted when the
+        ``Omit_Raw_Content`` attribute is set to ``True``.
+
+        :rtype: SourceFormat
+        """
+        return SourceFormat(
+            compact=self._project_flag('Compact_JSON'),
+            raw_content=not self._project_flag('Omit_Raw_Content'))
+
+    @property
+    def compress(self):
+        """Return whether to write gzip-compressed copies of the JSON files.
+
+        This is enabled by setting the ``Compress_JSON`` attribute of the
+        project to ``True``. The WebUI server then sends the compressed copies
+        to the clients that accept them.
+
+        :rtype: boolean
+        """
+        return self._project_flag('Compress_JSON')
+
+    @property
+    def spill_to_disk(self):
+        """Return whether to bound the memory used to build the report.
+
+        This is enabled by setting the ``Spill_To_Disk`` attribute of the
+        project to ``True``.
+
+        :rtype: boolean
+        """
+        return self._project_flag('Spill_To_Disk')
+
     def verbose_info(self, message):
         if (GNAThub.verbose()):
             self.info(message)
@@ -68,6 +140,8 @@ class HTMLReport(Plugin, Reporter):
         # The output directory for the JSON-encoded report data
         data_output_dir = os.path.join(self.output_dir, 'data')
         data_src_output_dir = os.path.join(data_output_dir, 'src')
+        data_msg_output_dir = os.path.join(data_output_dir, 'messages')
+        report = None
 
         try:
             self.info('generate JSON-encoded report')
@@ -100,31 +174,50 @@ class HTMLReport(Plugin, Reporter):
 
             # The report builder initially starts empty. The more sources
             # processed, the more complete the report.
-            report = ReportBuilder()
+            report = ReportBuilder(self.spill_to_disk)
 
             # Generate the JSON-representation of each source of the project.
-            for count, source in enumerate(report.iter_sources(), start=1):
-                dest = '{}.json'.format(
-                    os.path.join(data_src_output_dir, source.filename))
-                source.save_as(dest)
-                self.log.debug('%s: saved as %s', source.filename, dest)
-                Console.progress(count, report.index.source_file_count, False)
+            # Highlighting and encoding are dispatched to GNAThub.jobs()
+            # worker processes, the index is still built in this process.
+            # Sources unchanged since the previous report are not re-saved.
+            # A change of format invalidates all sources.
+            source_format = self.source_format
+            manifest = SourceManifest(
+                self.manifest_path, source_format._asdict())
+            with SourceWriter(
+                    GNAThub.jobs(), manifest, source_format) as writer:
+                for count, source in enumerate(
+                        report.iter_sources(), start=1):
+                    dest = '{}.json'.format(
+                        os.path.join(data_src_output_dir, source.filename))
+                    writer.save(source, dest)
+                    self.log.debug('%s: saved as %s', source.filename, dest)
+                    Console.progress(
+                        count, report.index.source_file_count, False)
+            self.log.debug('%d source(s) up to date', writer.skipped_count)
+            report.highlight_cache.evict()
 
             # Generate the JSON-encoded report for message navigation.
+            # Remove the shards of the previous report, if any: their number
+            # depends on the messages.
+            if os.path.isdir(data_msg_output_dir):
+                rmtree(data_msg_output_dir)
+            os.makedirs(data_msg_output_dir)
             dest = os.path.join(data_output_dir, 'message.json')
-            report.index.message_to_json(dest)
+            report.index.message_to_json(
+                dest, data_msg_output_dir, self.json_indent)
             self.log.debug('message index saved as %s', dest)
             self.verbose_info('HTML report message generated in ' + dest)
 
             # Generate the JSON-encoded report for filter panel.
             dest = os.path.join(data_output_dir, 'filter.json')
-            report.index.filter_to_json(dest)
+            report.index.filter_to_json(dest, self.json_indent)
             self.log.debug('filter index saved as %s', dest)
             self.verbose_info('HTML report filter generated in ' + dest)
 
             # Generate the JSON-encoded report for code navigation.
             dest = os.path.join(data_output_dir, 'code.json')
-            report.index.code_to_json(dest)
+            report.index.code_to_json(dest, self.json_indent)
             self.log.debug('code index saved as %s', dest)
             self.verbose_info('HTML report code generated in ' + dest)
 
@@ -177,6 +270,12 @@ class HTMLReport(Plugin, Reporter):
                     self.log.debug('%s file copied in %s', copy_file, dest)
                     self.verbose_info(copy_file + ' file copied in ' + dest)
 
+            # Compress the JSON files written (or remove the compressed copies
+            # of a previous report if compression was disabled since).
+            count = compress_json(
+                data_output_dir, self.compress, GNAThub.jobs())
+            self.log.debug('%d JSON file(s) compressed', count)
+
         except Exception as why:
             self.log.exception('failed to generate the HTML report')
             self.error(str(why))
@@ -188,3 +287,7 @@ class HTMLReport(Plugin, Reporter):
 
         else:
             return GNAThub.EXEC_SUCCESS
+
+        finally:
+            if report is not None:
+                report.close()
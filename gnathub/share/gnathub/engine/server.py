@@ -15,14 +15,31 @@
 """GNAThub plug-in for launching the WebUI server.
 
 """
-from flask import Flask, request, make_response
+from flask import Flask, g, request, make_response, send_file
 from logging.config import dictConfig
+from datetime import datetime
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+from xml.etree import ElementTree
 
 import GNAThub
+import hashlib
 import os
+import queue
 import subprocess
 import re
 import json
+import shutil
+import signal
+import socket
+import tempfile
+import time
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, where the server runs in a single process
+    fcntl = None
 
 # To hide server banner, and so production warning.
 import sys
@@ -46,6 +63,34 @@ SERVER_LOG = os.path.join(GNATHUB_LOG, "webui_server.log")
 STATIC_FOLDER = os.environ.get('WEBUI_HTML_FOLDER')
 DEFAULT_PORT = 8080
 
+# The default timeout of requests served by worker processes, in seconds
+DEFAULT_REQUEST_TIMEOUT = 120
+
+# The directory where worker processes share their metrics
+METRICS_DIR = os.path.join(GNAThub.root(), 'webui-metrics')
+
+# The production bundles of the web UI have a content hash in their name,
+# and can thus be cached forever
+HASHED_ASSET = re.compile(
+    r'\.[0-9a-f]{16,}\.(bundle\.js|bundle\.map|chunk\.js|css)$')
+ONE_YEAR = 365 * 24 * 60 * 60
+
+# The journal of the review submissions, and the time to wait for other
+# submissions before importing one
+REVIEW_JOURNAL = os.path.join(GNAThub.root(), 'review-journal')
+REVIEW_BATCH_WINDOW = 1.0
+
+# The bounds of the delay between two attempts to import reviews, in seconds
+REVIEW_RETRY_MIN = 1.0
+REVIEW_RETRY_MAX = 300.0
+
+# The message rankings, by value
+RANKINGS = ['Annotation', 'Unspecified', 'Info', 'Low', 'Medium', 'High']
+
+# The default and maximum number of messages per page of /api/messages
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
 # Create logging handlers
 dictConfig({
     'version': 1,
@@ -85,10 +130,601 @@ dictConfig({
 })
 
 
+class FileIndex(object):
+    """Index of the files of a directory tree, by name.
+
+    The tree is walked once when the index is created. The index is then
+    refreshed when a lookup misses, or at most every REFRESH_INTERVAL
+    seconds otherwise: the modification time of the indexed directories is
+    checked, and the ones that changed since they were last scanned are
+    re-listed.
+    """
+
+    # The minimum delay between two refreshes caused by successful lookups
+    REFRESH_INTERVAL = 2.0
+
+    def __init__(self, root):
+        """
+        :param str root: the path to the root of the tree
+        """
+        self.root = root
+        self.lock = threading.Lock()
+        self.refreshed = time.time()
+
+        # The path to each directory => (mtime, file names, subdirectories)
+        self.dirs = {}
+
+        # The name of each file => the path to the directories containing it
+        self.files = {}
+
+        with self.lock:
+            self._scan(self.root)
+
+    @staticmethod
+    def _mtime(directory):
+        try:
+            return os.stat(directory).st_mtime
+        except OSError:
+            return None
+
+    def _scan(self, directory):
+        """(Re)index a directory, and the subdirectories not indexed yet.
+
+        :param str directory: the path to the directory
+        """
+        self._forget(directory, recursive=False)
+        mtime = self._mtime(directory)
+        try:
+            entries = os.listdir(directory)
+        except OSError:
+            # Drop the former content of the directory, but keep it in the
+            # index so that it is listed again by the next refresh
+            for path in self.dirs.get(directory, (None, (), ()))[2]:
+                self._forget(path, recursive=True)
+            self.dirs[directory] = (None, set(), set())
+            return
+
+        files, subdirs = set(), set()
+        for entry in entries:
+            path = os.path.join(directory, entry)
+            if os.path.isdir(path):
+                subdirs.add(path)
+            else:
+                files.add(entry)
+                self.files.setdefault(entry, set()).add(directory)
+        old_subdirs = self.dirs.get(directory, (None, (), ()))[2]
+        self.dirs[directory] = (mtime, files, subdirs)
+
+        for path in set(old_subdirs) - subdirs:
+            self._forget(path, recursive=True)
+        for path in subdirs:
+            if path not in self.dirs:
+                self._scan(path)
+
+    def _forget(self, directory, recursive):
+        """Remove the files of a directory from the index.
+
+        :param str directory: the path to the directory
+        :param bool recursive: whether to also remove the directory itself
+            and its subdirectories from the index
+        """
+        if directory not in self.dirs:
+            return
+        _, files, subdirs = self.dirs[directory]
+        for entry in files:
+            self.files[entry].discard(directory)
+            if not self.files[entry]:
+                del self.files[entry]
+        files.clear()
+        if recursive:
+            del self.dirs[directory]
+            for path in subdirs:
+                self._forget(path, recursive=True)
+
+    def refresh(self):
+        """Re-index the directories modified since they were last scanned."""
+        with self.lock:
+            self.refreshed = time.time()
+            if self.root not in self.dirs:
+                self._scan(self.root)
+            for directory, (mtime, _, _) in list(self.dirs.items()):
+                if directory in self.dirs and self._mtime(directory) != mtime:
+                    self._scan(directory)
+
+    def find(self, filename):
+        """Return the path to a file of the tree.
+
+        If several directories contain a file of that name, the deepest one
+        (in lexicographic order) is chosen.
+
+        :param str filename: the name of the file
+        :return: the full path to the file, or None if not found
+        :rtype: str | None
+        """
+        if time.time() - self.refreshed >= self.REFRESH_INTERVAL:
+            self.refresh()
+        path = self._lookup(filename)
+        if path is None or not os.path.isfile(path):
+            self.refresh()
+            path = self._lookup(filename)
+        return path
+
+    def _lookup(self, filename):
+        with self.lock:
+            directories = self.files.get(filename)
+            if not directories:
+                return None
+            return os.path.join(max(directories), filename)
+
+
+class FileCache(object):
+    """Cache of the values computed from data files.
+
+    An entry is invalidated as soon as the modification time or the size of
+    its file changes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+        # The path to each file => ((mtime, size), value)
+        self.entries = {}
+
+    def get(self, path, compute):
+        """Return the value computed from a file.
+
+        :param str path: the path to the file
+        :param compute: the function computing the value from the path
+        :type compute: (str) -> str
+        :rtype: str
+        """
+        stat = os.stat(path)
+        key = (stat.st_mtime, stat.st_size)
+        with self.lock:
+            entry = self.entries.get(path)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        value = compute(path)
+        with self.lock:
+            self.entries[path] = (key, value)
+        return value
+
+
+def _load_message_index(path):
+    """Return the message index, as served to the web UI.
+
+    Sharded indexes are served as-is, like other data files. The sources of
+    single-file indexes (generated by older versions of the HTML report) are
+    also grouped by file name in ``sourcekeys``.
+
+    :param str path: the path to message.json
+    :return: the converted index, or None if the file is served as-is
+    :rtype: str | None
+    """
+    with open(path, 'r') as myFile:
+        data = json.load(myFile)
+    if 'sources' not in data:
+        return None
+
+    # Convert messages list to a dict for performance sake
+    resp = {}
+    for s in data.get('sources'):
+        if s['filename'] not in resp:
+            resp[s['filename']] = []
+        resp[s['filename']].append(s)
+    data['sourcekeys'] = resp
+    return json.dumps(data)
+
+
+def _project_int(name, default):
+    """Return the value of an integer project attribute.
+
+    :param str name: the name of the attribute
+    :param int default: the value to use if the attribute is not set
+    :rtype: int
+    """
+    value = GNAThub.Project.property_as_string(name).strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        app.logger.error("%s: not an integer (%s)", name, value)
+        return default
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def _label(value):
+    return '"{}"'.format(str(value).replace('\\', '\\\\').replace(
+        '"', '\\"').replace('\n', '\\n'))
+
+
+class Metrics(object):
+    """Request metrics of the server, exposed in the Prometheus text format.
+
+    In the multi-process mode, each worker process saves a snapshot of its
+    metrics to a shared directory at most every SAVE_INTERVAL seconds, and
+    the metrics of all the processes are summed up when reported.
+    """
+
+    # The upper bounds of the request latency histogram buckets, in seconds
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    # The minimum time between two snapshots of the metrics, in seconds
+    SAVE_INTERVAL = 1.0
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.directory = None
+        self.saved = 0
+        self.timer = None
+        self.reset()
+
+    def reset(self):
+        """Forget the metrics recorded so far."""
+        self.in_flight = 0
+
+        # (route, method, status) => number of requests
+        self.requests = {}
+
+        # route => [count per bucket..., count, sum of latencies]
+        self.latency = {}
+
+        # route => number of bytes sent
+        self.bytes = {}
+
+        # codepeer_bridge operation => [number of runs, sum of durations]
+        self.bridge = {}
+
+    def share(self, directory):
+        """Save the metrics of this process to a shared directory.
+
+        The metrics inherited from the parent process are discarded: they
+        are reported by the parent process itself.
+
+        :param str directory: the directory where to save the metrics
+        """
+        with self.lock:
+            self.reset()
+            self.directory = directory
+            self.saved = 0
+            self.timer = None
+        self._save()
+
+    def start_request(self):
+        with self.lock:
+            self.in_flight += 1
+
+    def end_request(self, route, method, status, size, elapsed):
+        """Record a request.
+
+        :param str route: the route of the request
+        :param str method: the HTTP method of the request
+        :param int status: the status of the response
+        :param int size: the size of the response body, in bytes
+        :param float elapsed: the time spent serving the request, in seconds
+        """
+        with self.lock:
+            self.in_flight -= 1
+            key = (route, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.latency.setdefault(
+                route, [0] * (len(self.BUCKETS) + 2))
+            for index, bound in enumerate(self.BUCKETS):
+                if elapsed <= bound:
+                    histogram[index] += 1
+            histogram[-2] += 1
+            histogram[-1] += elapsed
+            self.bytes[route] = self.bytes.get(route, 0) + size
+        self._save()
+
+    def record_bridge(self, operation, elapsed):
+        """Record a run of codepeer_bridge.
+
+        :param str operation: the operation performed
+        :param float elapsed: the duration of the run, in seconds
+        """
+        with self.lock:
+            runs = self.bridge.setdefault(operation, [0, 0.0])
+            runs[0] += 1
+            runs[1] += elapsed
+        self._save()
+
+    def _snapshot(self):
+        with self.lock:
+            return {
+                'in_flight': self.in_flight,
+                'requests': [list(key) + [count]
+                             for key, count in self.requests.items()],
+                'latency': [[route] + histogram
+                            for route, histogram in self.latency.items()],
+                'bytes': list(self.bytes.items()),
+                'bridge': [[operation] + runs
+                           for operation, runs in self.bridge.items()]
+            }
+
+    def _save(self):
+        """Save a snapshot of the metrics, or schedule it.
+
+        Snapshots are saved at most every SAVE_INTERVAL seconds: the ones
+        requested meanwhile are merged into a single deferred one.
+        """
+        if self.directory is None:
+            return
+        with self.lock:
+            if self.timer is not None:
+                return
+            delay = self.saved + self.SAVE_INTERVAL - time.time()
+            if delay > 0:
+                self.timer = threading.Timer(delay, self._flush)
+                self.timer.daemon = True
+                self.timer.start()
+                return
+            self.saved = time.time()
+        self._write()
+
+    def _flush(self):
+        with self.lock:
+            self.timer = None
+            self.saved = time.time()
+        self._write()
+
+    def _write(self):
+        _atomic_write(
+            os.path.join(self.directory, '{}.json'.format(os.getpid())),
+            json.dumps(self._snapshot()))
+
+    def _snapshots(self):
+        """Return the snapshots of the metrics of all processes.
+
+        :rtype: list[dict]
+        """
+        if self.directory is None:
+            return [self._snapshot()]
+        # The snapshot of this process may not be saved yet
+        snapshots = [self._snapshot()]
+        for entry in os.listdir(self.directory):
+            pid, ext = os.path.splitext(entry)
+            if ext != '.json' or not pid.isdigit() or int(pid) == os.getpid():
+                continue
+            try:
+                with open(os.path.join(self.directory, entry), 'r') as myFile:
+                    snapshot = json.load(myFile)
+            except (IOError, OSError, ValueError):
+                continue
+            if not _is_alive(int(pid)):
+                # The requests of a worker which died are no longer served
+                snapshot['in_flight'] = 0
+            snapshots.append(snapshot)
+        return snapshots
+
+    def to_text(self):
+        """Return the metrics of the server in the Prometheus text format.
+
+        :rtype: str
+        """
+        in_flight, requests, latency, sizes, bridge = 0, {}, {}, {}, {}
+        for snapshot in self._snapshots():
+            in_flight += snapshot['in_flight']
+            for route, method, status, count in snapshot['requests']:
+                key = (route, method, status)
+                requests[key] = requests.get(key, 0) + count
+            for row in snapshot['latency']:
+                histogram = latency.setdefault(row[0], [0] * (len(row) - 1))
+                for index, value in enumerate(row[1:]):
+                    histogram[index] += value
+            for route, size in snapshot['bytes']:
+                sizes[route] = sizes.get(route, 0) + size
+            for operation, count, elapsed in snapshot['bridge']:
+                runs = bridge.setdefault(operation, [0, 0.0])
+                runs[0] += count
+                runs[1] += elapsed
+
+        lines = [
+            '# HELP gnathub_http_requests_in_flight'
+            ' Requests being served.',
+            '# TYPE gnathub_http_requests_in_flight gauge',
+            'gnathub_http_requests_in_flight {}'.format(in_flight),
+            '# HELP gnathub_http_requests_total'
+            ' Requests served, by route, method and status.',
+            '# TYPE gnathub_http_requests_total counter']
+        for (route, method, status), count in sorted(requests.items()):
+            lines.append(
+                'gnathub_http_requests_total'
+                '{{route={},method={},status={}}} {}'.format(
+                    _label(route), _label(method), _label(status), count))
+
+        lines.extend([
+            '# HELP gnathub_http_request_duration_seconds'
+            ' Time spent serving requests, by route.',
+            '# TYPE gnathub_http_request_duration_seconds histogram'])
+        for route, histogram in sorted(latency.items()):
+            for bound, count in zip(self.BUCKETS, histogram):
+                lines.append(
+                    'gnathub_http_request_duration_seconds_bucket'
+                    '{{route={},le="{}"}} {}'.format(
+                        _label(route), bound, count))
+            lines.extend([
+                'gnathub_http_request_duration_seconds_bucket'
+                '{{route={},le="+Inf"}} {}'.format(
+                    _label(route), histogram[-2]),
+                'gnathub_http_request_duration_seconds_sum'
+                '{{route={}}} {}'.format(_label(route), histogram[-1]),
+                'gnathub_http_request_duration_seconds_count'
+                '{{route={}}} {}'.format(_label(route), histogram[-2])])
+
+        lines.extend([
+            '# HELP gnathub_http_response_bytes_total'
+            ' Bytes of response bodies sent, by route.',
+            '# TYPE gnathub_http_response_bytes_total counter'])
+        for route, size in sorted(sizes.items()):
+            lines.append('gnathub_http_response_bytes_total{{route={}}} {}'
+                         .format(_label(route), size))
+
+        lines.extend([
+            '# HELP gnathub_bridge_runs_total'
+            ' Runs of codepeer_bridge, by operation.',
+            '# TYPE gnathub_bridge_runs_total counter'])
+        for operation, (count, _) in sorted(bridge.items()):
+            lines.append('gnathub_bridge_runs_total{{operation={}}} {}'
+                         .format(_label(operation), count))
+        lines.extend([
+            '# HELP gnathub_bridge_seconds_total'
+            ' Wall time spent in codepeer_bridge, by operation.',
+            '# TYPE gnathub_bridge_seconds_total counter'])
+        for operation, (_, elapsed) in sorted(bridge.items()):
+            lines.append('gnathub_bridge_seconds_total{{operation={}}} {}'
+                         .format(_label(operation), elapsed))
+        return '\n'.join(lines) + '\n'
+
+
 app = Flask(__name__, static_url_path='', static_folder=STATIC_FOLDER)
 
+# Static files are revalidated on each use (Flask serves them with ETag and
+# Last-Modified), except the hashed bundles: see _cache_static.
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
 
+# The files served from the report data directory, indexed by name
+DATA_FILES = FileIndex(os.path.join(os.getcwd(), SERVER_DIR_PATH))
+
+# The contents computed from files (message index, CodePeer version), rather
+# than read on each request
+RESPONSES = FileCache()
+
+# The digest of the data files, used as ETag
+DIGESTS = FileCache()
+
+
+def _read_data(path):
+    with open(path, 'r') as myFile:
+        return myFile.read()
+
+
+def _file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as myFile:
+        for chunk in iter(lambda: myFile.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _gzip_copy(path):
+    """Return the path to the up-to-date gzip-compressed copy of a file.
+
+    The html-report plug-in writes such copies next to the JSON files when
+    the Compress_JSON project attribute is set, with the same modification
+    time as the original file.
+
+    :param str path: the path to the file
+    :rtype: str | None
+    """
+    try:
+        if os.stat(path + '.gz').st_mtime == os.stat(path).st_mtime:
+            return path + '.gz'
+    except OSError:
+        pass
+    return None
+
+
+def _send_data(path, load=None):
+    """Return a conditional response serving a data file.
+
+    The response carries the digest of the file as ETag and its modification
+    time as Last-Modified, and must be revalidated by clients before reuse:
+    if the client already has this version of the file, an empty
+    304 Not Modified response is returned without loading the file.
+
+    Files served as-is are sent gzip-compressed to the clients accepting it,
+    if a compressed copy is available: see :func:`_gzip_copy`.
+
+    :param str path: the path to the file
+    :param load: the function computing the response body from the path, or
+        None to send the content of the file
+    :type load: (str) -> str | None
+    """
+    gzip_path = None
+    if load is None:
+        load = _read_data
+        if request.accept_encodings['gzip']:
+            gzip_path = _gzip_copy(path)
+
+    resp = make_response('')
+    etag = DIGESTS.get(path, _file_digest)
+    resp.set_etag(etag + '-gzip' if gzip_path else etag)
+    resp.last_modified = datetime.utcfromtimestamp(
+        int(os.stat(path).st_mtime))
+    resp.cache_control.no_cache = True
+    resp.vary.add('Accept-Encoding')
+    resp = resp.make_conditional(request)
+    if resp.status_code == 304:
+        return resp
+
+    if gzip_path:
+        # Stream the compressed copy, rather than reading it at once
+        sent = send_file(gzip_path, mimetype=resp.mimetype, conditional=False)
+        for header in ('ETag', 'Last-Modified', 'Cache-Control', 'Vary'):
+            sent.headers[header] = resp.headers[header]
+        sent.content_encoding = 'gzip'
+        return sent
+
+    resp.set_data(load(path))
+    return resp
+
+
+# The metrics of the server, and the latency above which requests are logged
+METRICS = Metrics()
+SLOW_REQUEST = _project_int('Server_Slow_Request', 0) / 1000.0
+
+
+@app.before_request
+def _start_request():
+    g.start = time.time()
+    METRICS.start_request()
+
+
+@app.after_request
+def _measure_response(resp):
+    g.status = resp.status_code
+    g.size = resp.content_length or 0
+    return resp
+
+
+@app.teardown_request
+def _end_request(exc):
+    elapsed = time.time() - g.start
+    route = request.url_rule.rule if request.url_rule else '<unknown>'
+    METRICS.end_request(route, request.method, g.get('status', 500),
+                        g.get('size', 0), elapsed)
+    if SLOW_REQUEST and elapsed >= SLOW_REQUEST:
+        app.logger.warning("slow request: %s %s (%.3fs)",
+                           request.method, request.full_path, elapsed)
+
+
+@app.route('/metrics', methods=['GET'])
+def _get_metrics():
+    resp = make_response(METRICS.to_text())
+    resp.mimetype = 'text/plain'
+    resp.headers['Content-Type'] = 'text/plain; version=0.0.4'
+    resp.cache_control.no_cache = True
+    return resp
+
+
+@app.after_request
+def _cache_static(resp):
+    if (request.endpoint == 'static' and resp.status_code in (200, 304)
+            and HASHED_ASSET.search(request.path)):
+        resp.headers['Cache-Control'] = \
+            'public, max-age={}, immutable'.format(ONE_YEAR)
+    return resp
+
 
 @app.route('/')
 def root():
@@ -97,68 +733,38 @@ def root():
 
 @app.route('/json/<filename>', methods=['GET'])
 def get_json(filename):
-    serverpath = os.path.join(os.getcwd(), SERVER_DIR_PATH)
-    filepath = ''
-
-    # Find the path to the asked file
-    for root, dirs, files in os.walk(serverpath):
-        if filename in files:
-            filepath = os.path.join(root, filename)
-
-    if os.path.isfile(filepath):
-        with open(filepath, 'r') as myFile:
-            data = myFile.read()
-            if filename == 'message.json':
-                # Convert messages list to a dict
-                # for performance  sake
-                data = json.loads(data)
-                resp = {}
-                if 'sources' in data:
-                    for s in data.get('sources'):
-                        if s['filename'] not in resp:
-                            resp[s['filename']] = []
-                        resp[s['filename']].append(s)
-                    data['sourcekeys'] = resp
-                data = json.dumps(data)
-            return data
+    filepath = DATA_FILES.find(filename)
+
+    if filepath and os.path.isfile(filepath):
+        if (filename == 'message.json' and
+                RESPONSES.get(filepath, _load_message_index) is not None):
+            return _send_data(
+                filepath,
+                lambda path: RESPONSES.get(path, _load_message_index))
+        return _send_data(filepath)
     else:
-        resp = make_response(404)
+        resp = make_response("Not Found", 404)
         return resp
 
 
 @app.route('/source/<filename>', methods=['GET'])
 def get_source(filename):
-    serverpath = os.path.join(os.getcwd(), SERVER_DIR_PATH)
-    filepath = ''
-    # Find the path to the asked file
-    for root, dirs, files in os.walk(serverpath):
-        if filename in files:
-            filepath = os.path.join(root, filename)
-    if os.path.isfile(filepath):
-        with open(filepath, 'r') as myFile:
-            data = myFile.read()
-            return data
+    filepath = DATA_FILES.find(filename)
+    if filepath and os.path.isfile(filepath):
+        return _send_data(filepath)
     else:
-        resp = make_response(404)
+        resp = make_response("Not Found", 404)
         return resp
 
 
 @app.route('/get-review/<filename>', methods=['GET'])
 def _get_review(filename):
-    _export_codeper_bridge(filename)
-
-    serverpath = os.path.join(os.getcwd(), SERVER_DIR_PATH)
-    filepath = ''
+    REVIEWS.export(filename)
 
-    # Find the path to the asked file
-    for root, dirs, files in os.walk(serverpath):
-        if filename in files:
-            filepath = os.path.join(root, filename)
+    filepath = DATA_FILES.find(filename)
 
-    if os.path.isfile(filepath):
-        with open(filepath, 'r') as myFile:
-            data = myFile.read()
-            return data
+    if filepath and os.path.isfile(filepath):
+        return _send_data(filepath)
     else:
         resp = make_response("Not Found", 404)
         return resp
@@ -166,34 +772,261 @@ def _get_review(filename):
 
 @app.route('/get-race-condition', methods=['GET'])
 def _get_race_condition():
-    serverpath = os.path.join(os.getcwd(), SERVER_DIR_PATH)
-    filename = 'race_conditions.xml'
-    filepath = ''
-
-    # Find the path to the asked file
-    for root, dirs, files in os.walk(serverpath):
-        if filename in files:
-            filepath = os.path.join(root, filename)
-
-    if os.path.isfile(filepath):
-        with open(filepath, 'r') as myFile:
-            data = myFile.read()
-            return data
+    filepath = DATA_FILES.find('race_conditions.xml')
+
+    if filepath and os.path.isfile(filepath):
+        return _send_data(filepath)
     else:
         return make_response("Not Found", 404)
 
 
+def _encode_message(filename, message, rule, tool):
+    """JSON-encode a message as in the message index of the HTML report.
+
+    :param str filename: the name of the resource of the message
+    :param GNAThub.MessageRecord message: the message to encode
+    :param GNAThub.RuleRecord rule: the rule associated with the message
+    :param GNAThub.ToolRecord tool: the tool associated with the rule
+    :rtype: dict[str, *]
+    """
+    return {
+        'id': message.id,
+        'filename': os.path.basename(filename),
+        'line': message.line,
+        'col_begin': message.col_begin,
+        'col_end': message.col_end,
+        'rule': {'id': rule.id, 'name': rule.name, 'tool_id': tool.id},
+        'properties': [
+            {'id': prop.id, 'name': prop.name, 'tool_id': tool.id}
+            for prop in message.get_properties()],
+        'ranking': {
+            'id': message.ranking,
+            'name': RANKINGS[message.ranking],
+            'tool_id': tool.id},
+        'name': message.data,
+        'tool_msg_id': message.tool_msg_id,
+        'tool': tool.name
+    }
+
+
+def _parse_ranking(value):
+    if value.isdigit() and int(value) < len(RANKINGS):
+        return int(value)
+    names = [name.lower() for name in RANKINGS]
+    if value.lower() not in names:
+        raise ValueError('invalid ranking: {}'.format(value))
+    return names.index(value.lower())
+
+
+@app.route('/api/messages', methods=['GET'])
+def _get_messages():
+    """List the messages of the report matching the query filters.
+
+    The ``tool``, ``rule``, ``ranking``, ``property`` and ``file`` parameters
+    can be repeated to accept several values. Rankings are given by name or
+    value; annotations are only listed if explicitly requested, as in the
+    message index. ``offset`` and ``limit`` select the page to return.
+    """
+    def values(name):
+        return request.args.getlist(name) or None
+
+    try:
+        rankings = [_parse_ranking(value) for value in values('ranking')
+                    or RANKINGS[1:]]
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+        if offset < 0 or not 0 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError('invalid page: offset={}, limit={}'.format(
+                offset, limit))
+    except ValueError as why:
+        return make_response(str(why), 400)
+
+    # Coverage and metrics are not messages of the report
+    total, messages = GNAThub.query_messages(
+        tools=values('tool'), rules=values('rule'), rankings=rankings,
+        properties=values('property'), files=values('file'),
+        exclude_rules=['coverage'], located=True,
+        offset=offset, limit=limit)
+
+    resp = make_response(json.dumps({
+        'total': total,
+        'offset': offset,
+        'limit': limit,
+        'messages': [_encode_message(*message) for message in messages]
+    }))
+    resp.mimetype = 'application/json'
+    resp.cache_control.no_cache = True
+    return resp
+
+
+class FileLock(object):
+    """A reentrant lock shared by the threads and the processes of the server.
+
+    Processes are synchronized through an advisory lock on a file, where
+    available.
+    """
+
+    def __init__(self, path):
+        """
+        :param str path: the path to the lock file
+        """
+        self.path = path
+        self._reset()
+
+        # A thread of the parent may hold the lock when a process is forked
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        if getattr(self, 'fd', None) is not None:
+            os.close(self.fd)
+        self.lock = threading.RLock()
+        self.depth = 0
+        self.fd = None
+
+    def __enter__(self):
+        self.lock.acquire()
+        self.depth += 1
+        if self.depth == 1 and fcntl is not None:
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.depth -= 1
+        if self.depth == 0 and self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        self.lock.release()
+
+
+# Serialize the codepeer_bridge runs on the CodePeer database
+BRIDGE_LOCK = FileLock(os.path.join(GNAThub.root(), 'codepeer_bridge.lock'))
+
+
+def _review_path(filename):
+    return os.path.join(
+        GNAThub.Project.object_dir(), 'gnathub', 'html-report', 'data',
+        filename)
+
+
 def _export_codeper_bridge(filename):
     app.logger.info("Export info from codepeer_bridge")
     name = 'codepeer_bridge'
     cmd = ['codepeer_bridge',
            '--output-dir=' + OUTPUT_DIR,
            '--db-dir=' + DB_DIR,
-           '--export-reviews=' + os.path.join(
-               GNAThub.Project.object_dir(),
-               'gnathub', 'html-report',
-               'data', filename)]
-    GNAThub.Run(name, cmd, out=SERVER_LOG, append_out=True)
+           '--export-reviews=' + _review_path(filename)]
+    with BRIDGE_LOCK:
+        start = time.time()
+        GNAThub.Run(name, cmd, out=SERVER_LOG, append_out=True)
+        METRICS.record_bridge('export', time.time() - start)
+
+
+def _db_signature():
+    """Return the modification times of the CodePeer database files.
+
+    They change with each new analysis and each review import.
+
+    :rtype: tuple[(str, float)]
+    """
+    try:
+        entries = sorted(os.listdir(DB_DIR))
+    except OSError:
+        return ()
+    signature = []
+    for entry in entries:
+        try:
+            signature.append(
+                (entry, os.stat(os.path.join(DB_DIR, entry)).st_mtime))
+        except OSError:
+            pass
+    return tuple(signature)
+
+
+class ReviewExporter(object):
+    """Export the CodePeer reviews from a background worker.
+
+    Exported files are cached: a review file is only exported again once the
+    CodePeer database changed or reviews were imported. The state of each
+    export is recorded next to the exported file, so that it is shared by
+    all the server processes. Concurrent requests for the same file wait for
+    the same export.
+    """
+
+    def __init__(self):
+        self.start_lock = threading.Lock()
+        self.pid = None
+
+    def _start(self):
+        """Start the worker of this server process."""
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+
+        # The name of each file being exported => event set once exported
+        self.pending = {}
+
+        self.queue = queue.Queue()
+        worker = threading.Thread(target=self._run, name='review-exporter')
+        worker.daemon = True
+        worker.start()
+
+    @staticmethod
+    def _state():
+        return json.dumps([JOURNAL.position(), _db_signature()])
+
+    @staticmethod
+    def _up_to_date(filename):
+        path = _review_path(filename)
+        try:
+            with open(path + '.state', 'r') as myFile:
+                state = myFile.read()
+        except (IOError, OSError):
+            return False
+        return os.path.isfile(path) and state == ReviewExporter._state()
+
+    def export(self, filename):
+        """Export the reviews to a file of the report data, if needed.
+
+        Block until the file is up to date.
+
+        :param str filename: the name of the file
+        """
+        # Export the reviews submitted so far
+        JOURNAL.wait_imported()
+
+        # Worker threads do not survive the fork of server processes
+        with self.start_lock:
+            if self.pid != os.getpid():
+                self._start()
+
+        with self.lock:
+            if self._up_to_date(filename):
+                app.logger.debug("%s: reviews up to date", filename)
+                return
+            done = self.pending.get(filename)
+            if done is None:
+                done = self.pending[filename] = threading.Event()
+                self.queue.put(filename)
+        done.wait()
+
+    def _run(self):
+        while True:
+            filename = self.queue.get()
+            try:
+                with BRIDGE_LOCK:
+                    # Another server process may have exported it meanwhile
+                    if not self._up_to_date(filename):
+                        _export_codeper_bridge(filename)
+
+                        # Record the state of the database after the
+                        # export: the export itself may touch it.
+                        _atomic_write(
+                            _review_path(filename) + '.state', self._state())
+            except Exception:
+                app.logger.exception("%s: failed to export reviews", filename)
+            with self.lock:
+                self.pending.pop(filename).set()
 
 
 @app.route('/online-server', methods=['GET'])
@@ -212,18 +1045,65 @@ def getCodepeerVersion(data):
     return tmp
 
 
+class CodePeerProbe(object):
+    """The version of the codepeer executable found on PATH.
+
+    The executable is only run again when the one found on PATH changes, ie.
+    when its path or its modification time changes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.executable = None
+        self.version = ""
+        self.refresh()
+
+    @staticmethod
+    def _find():
+        path = shutil.which('codepeer')
+        if path is None:
+            return None
+        try:
+            return path, os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def refresh(self):
+        """Probe the version of codepeer if the executable changed.
+
+        :return: the version of codepeer, or "" if not found
+        :rtype: str
+        """
+        executable = self._find()
+        with self.lock:
+            if executable != self.executable:
+                self.executable = executable
+                self.version = ""
+                if executable is not None:
+                    try:
+                        output = subprocess.check_output(
+                            [executable[0], '-v'])
+                        self.version = getCodepeerVersion(str(output))
+                    except (OSError, subprocess.CalledProcessError) as why:
+                        app.logger.error("codepeer -v failed: %s", why)
+                app.logger.info("Codepeer version: %s", self.version)
+            return self.version
+
+
+def _read_version(path):
+    with open(path, 'r') as myFile:
+        return myFile.read()
+
+
 @app.route('/codepeer-passed', methods=['GET'])
 def _get_codepeer():
-    cmd = 'codepeer' + ' -v'
-    output = subprocess.check_output(cmd, shell=True)
-    actual_version = getCodepeerVersion(str(output))
+    actual_version = CODEPEER.refresh()
     old_version = ""
 
     version_path = os.path.join(CODEPEER_OBJ_DIR, 'version.txt')
 
     if os.path.isfile(version_path):
-        with open(version_path, 'r') as myFile:
-            old_version = myFile.read()
+        old_version = RESPONSES.get(version_path, _read_version)
     else:
         app.logger.error("File version.txt not found.")
 
@@ -241,21 +1121,269 @@ def _get_codepeer():
         return resp
 
 
+class ReviewJournal(object):
+    """Durable queue of the reviews submitted to the server.
+
+    Each submission is appended to a journal, and acknowledged once written
+    to disk. A single worker, started once the server processes are forked,
+    imports them into the CodePeer database in batches: the submissions
+    received within REVIEW_BATCH_WINDOW seconds are merged and imported with
+    one codepeer_bridge call.
+
+    The progress of the import is recorded next to the journal, so that the
+    submissions not imported yet are imported when the server restarts, and
+    so that all the server processes can wait for their submissions to be
+    imported. Submissions are only marked as imported once codepeer_bridge
+    succeeded: failed imports are retried, with an increasing delay.
+
+    Records are made of the size of the submission, on its own line, followed
+    by the submission and a newline. The journal is emptied once all its
+    submissions are imported: positions in the journal are counted from its
+    creation, the position of its first record being its ``base``.
+    """
+
+    def __init__(self, path):
+        """
+        :param str path: the path to the journal
+        """
+        self.path = path
+        self.state_path = path + '.imported'
+        self.lock = FileLock(path + '.lock')
+        self.cond = threading.Condition()
+
+        with self.lock:
+            _, imported, _ = self._state()
+            size = self._size()
+
+            # Drop the last record if it was not completely written
+            pending, end = self._read(imported, size)
+            if end < size:
+                app.logger.warning("%s: truncated record dropped", path)
+                with open(path, 'r+b') as journal:
+                    journal.truncate(end)
+            if pending:
+                app.logger.info("%s: resume review import", path)
+
+    def start(self):
+        """Import the submissions from a background thread.
+
+        Only one server process must import the submissions.
+        """
+        worker = threading.Thread(target=self.run, name='review-importer')
+        worker.daemon = True
+        worker.start()
+
+    def _size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def _state(self):
+        """Return the base of the journal and the import offset.
+
+        :return: the base, the offset of the first submission not imported
+            yet, and the number of failed imports so far
+        :rtype: (int, int, int)
+        """
+        try:
+            with open(self.state_path, 'r') as myFile:
+                values = [int(v) for v in myFile.read().split()]
+            base, imported, failures = (values + [0])[:3]
+        except (IOError, OSError, ValueError):
+            base, imported, failures = 0, 0, 0
+        return base, min(imported, self._size()), failures
+
+    def position(self):
+        """Return the position past the last imported submission.
+
+        :rtype: int
+        """
+        base, imported, _ = self._state()
+        return base + imported
+
+    def append(self, data):
+        """Add a submission to the journal.
+
+        :param bytes data: the reviews, as an audit trail XML document
+        """
+        record = str(len(data)).encode('ascii') + b'\n' + data + b'\n'
+        with self.lock:
+            fd = os.open(
+                self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, record)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        with self.cond:
+            self.cond.notify_all()
+
+    def wait_imported(self):
+        """Block until all the submissions received so far are imported.
+
+        Also return if an import fails meanwhile: the submissions will be
+        imported by a later attempt.
+        """
+        with self.lock:
+            base, _, failures = self._state()
+            end = base + self._size()
+        while True:
+            base, imported, failed = self._state()
+            if base + imported >= end:
+                return
+            if failed > failures:
+                app.logger.warning("reviews not imported yet")
+                return
+            with self.cond:
+                self.cond.wait(0.1)
+
+    def _read(self, start, end):
+        """Read the submissions recorded between two offsets.
+
+        :param int start: the offset of the first record
+        :param int end: the offset past the last record
+        :return: the submissions with the offset past each of them, and the
+            offset past the last complete one
+        :rtype: (list[(bytes, int)], int)
+        """
+        submissions = []
+        if start >= end:
+            return submissions, start
+        with open(self.path, 'rb') as journal:
+            journal.seek(start)
+            while journal.tell() < end:
+                header = journal.readline()
+                try:
+                    size = int(header)
+                except ValueError:
+                    break
+                data = journal.read(size + 1)
+                if len(data) != size + 1:
+                    break
+                start = journal.tell()
+                submissions.append((data[:-1], start))
+        return submissions, start
+
+    def run(self):
+        """Import the submissions of the journal, forever."""
+        delay = 0
+        while True:
+            # Submissions of other server processes are not notified
+            with self.cond:
+                self.cond.wait(REVIEW_BATCH_WINDOW)
+            with self.lock:
+                _, imported, _ = self._state()
+                if imported >= self._size():
+                    continue
+
+            # Wait for other submissions to import them at once
+            time.sleep(REVIEW_BATCH_WINDOW)
+            with self.lock:
+                end = self._size()
+            failed = False
+            submissions, _ = self._read(imported, end)
+            for data, offset in _merge_reviews(submissions):
+                try:
+                    _import_reviews(data)
+                except Exception:
+                    app.logger.exception("failed to import reviews")
+                    failed = True
+                    break
+                imported = offset
+
+            with self.lock:
+                base, _, failures = self._state()
+                if failed:
+                    failures += 1
+                if imported == self._size():
+                    # Everything is imported: start a new journal
+                    with open(self.path, 'r+b') as journal:
+                        journal.truncate(0)
+                    base, imported = base + imported, 0
+                _atomic_write(self.state_path, '{} {} {}'.format(
+                    base, imported, failures))
+            with self.cond:
+                self.cond.notify_all()
+
+            if failed:
+                delay = min(max(2 * delay, REVIEW_RETRY_MIN), REVIEW_RETRY_MAX)
+                app.logger.info("retry review import in %gs", delay)
+                time.sleep(delay)
+            else:
+                delay = 0
+
+
+def _atomic_write(path, data):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, 'w') as myFile:
+        myFile.write(data)
+    os.replace(tmp, path)
+
+
+def _merge_reviews(submissions):
+    """Merge review submissions into as few audit trails as possible.
+
+    Consecutive audit trails are merged, so that the submissions are still
+    imported in order. Submissions which are not well-formed audit trails
+    are kept apart, so that codepeer_bridge reports them on their own.
+
+    :param submissions: the audit trail XML documents, with the offset past
+        each of them in the journal
+    :type submissions: list[(bytes, int)]
+    :return: the documents to import, with the offset past the last
+        submission merged in each of them
+    :rtype: list[(bytes, int)]
+    """
+    batches = []
+    for data, offset in submissions:
+        try:
+            root = ElementTree.fromstring(data)
+        except ElementTree.ParseError:
+            root = None
+        if root is None or root.tag != 'audit_trail':
+            batches.append([None, data, offset])
+        elif batches and batches[-1][0] is not None:
+            batches[-1][0].extend(list(root))
+            batches[-1][2] = offset
+        else:
+            batches.append([root, data, offset])
+    return [
+        (data if trail is None
+         else ElementTree.tostring(trail, encoding='utf-8'), offset)
+        for trail, data, offset in batches]
+
+
+def _import_reviews(data):
+    """Import reviews into the CodePeer database.
+
+    :param bytes data: the audit trail XML document
+    :raise GNAThub.Error: if codepeer_bridge failed to import them
+    """
+    fd, temp_filename = tempfile.mkstemp(
+        suffix='.xml', prefix='user_review_', dir=GNAThub.root())
+    try:
+        with os.fdopen(fd, 'wb') as tempFile:
+            tempFile.write(data)
+        _import_codepeer_bridge(temp_filename)
+    finally:
+        os.remove(temp_filename)
+
+
 @app.route('/post-review/', methods=['POST'])
 def _post_review():
-    temp_filename = 'user_review_temp.xml'
     post_data = request.data
     app.logger.info(post_data)
 
-    app.logger.info("Create user_review_temp.xml")
-    tempFile = open(temp_filename, "wb")
-    tempFile.write(post_data)
-    tempFile.close()
-
-    _import_codepeer_bridge(temp_filename)
+    # Submissions are kept in the journal until imported: do not accept the
+    # ones codepeer_bridge would never import.
+    try:
+        ElementTree.fromstring(post_data)
+    except ElementTree.ParseError as why:
+        return make_response("Invalid review: {}".format(why), 400)
 
-    app.logger.info("Remove user_review_temp.xml")
-    os.remove(temp_filename)
+    # The reviews are imported in the background
+    JOURNAL.append(post_data)
 
     resp = make_response("OK", 200)
     return resp
@@ -268,7 +1396,13 @@ def _import_codepeer_bridge(filename):
            '--output-dir=' + OUTPUT_DIR,
            '--db-dir=' + DB_DIR,
            '--import-reviews=' + filename]
-    GNAThub.Run(name, cmd, out=SERVER_LOG, append_out=True)
+    with BRIDGE_LOCK:
+        start = time.time()
+        run = GNAThub.Run(name, cmd, out=SERVER_LOG, append_out=True)
+        METRICS.record_bridge('import', time.time() - start)
+    if run.status != 0:
+        raise GNAThub.Error('codepeer_bridge failed to import {} (exit {})'
+                            .format(filename, run.status))
 
 
 @app.route('/<path:other>')
@@ -278,14 +1412,175 @@ def fallback(other):
     return make_response("Wrong request", 404)
 
 
+# The CodePeer reviews exporter and importer
+REVIEWS = ReviewExporter()
+JOURNAL = ReviewJournal(REVIEW_JOURNAL)
+
+# The version of CodePeer, probed at startup
+CODEPEER = CodePeerProbe()
+
+
+class _WorkerRequestHandler(WSGIRequestHandler):
+    """Log requests to the server log rather than to stderr."""
+
+    def log_message(self, format, *args):
+        app.logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class WorkerServer(WSGIServer):
+    """The WSGI server of a pre-forked worker process.
+
+    Workers serve one request at a time, accepted from the listening socket
+    they share. A worker failing to serve a request within the request
+    timeout exits, and is replaced by the main server process.
+    """
+
+    def __init__(self, sock, request_timeout):
+        """
+        :param socket.socket sock: the listening socket
+        :param int request_timeout: the request timeout, in seconds
+        """
+        WSGIServer.__init__(
+            self, sock.getsockname(), _WorkerRequestHandler,
+            bind_and_activate=False)
+        self.socket.close()
+        self.socket = sock
+        self.server_name = socket.getfqdn()
+        self.server_port = sock.getsockname()[1]
+        self.setup_environ()
+        self.set_app(app)
+        self.request_timeout = request_timeout
+
+    def get_request(self):
+        # Raises BlockingIOError if another worker accepted the connection
+        conn, addr = self.socket.accept()
+        conn.settimeout(self.request_timeout)
+        return conn, addr
+
+    def process_request(self, request, client_address):
+        signal.alarm(self.request_timeout)
+        try:
+            WSGIServer.process_request(self, request, client_address)
+        finally:
+            signal.alarm(0)
+
+
+def _serve_worker(sock, request_timeout):
+    """Serve requests in a pre-forked worker process.
+
+    :param socket.socket sock: the listening socket
+    :param int request_timeout: the request timeout, in seconds
+    """
+    def timeout(signum, frame):
+        app.logger.error("worker %d: request timeout", os.getpid())
+        os._exit(1)
+
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGALRM, timeout)
+    METRICS.share(METRICS_DIR)
+    WorkerServer(sock, request_timeout).serve_forever()
+
+
+def _serve_importer():
+    """Import the review submissions in a dedicated process."""
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    METRICS.share(METRICS_DIR)
+    JOURNAL.run()
+
+
+def _serve_prefork(port, workers, request_timeout):
+    """Serve the application from a pool of pre-forked worker processes.
+
+    The main process creates the listening socket shared by the workers, and
+    replaces the workers that exit. It runs no thread, so that no lock can be
+    held when forking: the background tasks that must not be duplicated run
+    in a dedicated process (see :class:`ReviewJournal`).
+
+    :param int port: the port to listen to
+    :param int workers: the number of worker processes
+    :param int request_timeout: the request timeout, in seconds
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(('0.0.0.0', port))
+    sock.listen(socket.SOMAXCONN)
+    sock.setblocking(False)
+
+    # Forget the metrics of the workers of a previous run
+    if os.path.isdir(METRICS_DIR):
+        shutil.rmtree(METRICS_DIR)
+    os.makedirs(METRICS_DIR)
+    METRICS.share(METRICS_DIR)
+
+    # The PID of each child process => its start time, and its function
+    children = {}
+    stopping = []
+
+    def spawn(serve):
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                serve()
+            except BaseException:
+                app.logger.exception("worker %d failed", os.getpid())
+                status = 1
+            os._exit(status)
+        children[pid] = (time.time(), serve)
+
+    def serve_worker():
+        _serve_worker(sock, request_timeout)
+
+    def stop(signum, frame):
+        stopping.append(signum)
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    spawn(_serve_importer)
+    for _ in range(workers):
+        spawn(serve_worker)
+    app.logger.info("%d workers serving on port %d", workers, port)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        child = children.pop(pid, None)
+        if child is None or stopping:
+            continue
+        started, serve = child
+        app.logger.warning("worker %d exited (wait status %d)", pid, status)
+        if time.time() - started < 1:
+            # Do not respawn workers failing at startup in a tight loop
+            time.sleep(1)
+        spawn(serve)
+
+
 if __name__ == '__main__':
     flask_port = GNAThub.port() if GNAThub.port() else DEFAULT_PORT
+    workers = _project_int('Server_Workers', 0)
 
-    if flask_port > 1024:
+    if flask_port > 1024 and workers > 0 and hasattr(os, 'fork'):
+        print("Launching {} server workers on port {}".format(
+            workers, flask_port))
+        print("Logs redirected to {}".format(SERVER_LOG))
+        _serve_prefork(
+            flask_port, workers,
+            _project_int('Server_Timeout', DEFAULT_REQUEST_TIMEOUT))
+    elif flask_port > 1024:
         print("Launching flask server on port {}".format(flask_port))
         print("Logs redirected to {}".format(SERVER_LOG))
         # TODO : Error occur when lauching with debug=True
         # app.run(port=flask_port, debug=True)
+        JOURNAL.start()
         app.run(host='0.0.0.0', port=flask_port, threaded=True)
     else:
         app.logger.error("Bad port used. Please relauch with port above 1024.")
@@ -61,6 +61,9 @@ package body GNAThub.Configuration is
    Hide_Exempted_Arg    : aliased Boolean;
    Runners_Only_Arg     : aliased Boolean;
    Reporters_Only_Arg   : aliased Boolean;
+   Pipeline_Arg         : aliased Boolean;
+   Profile_Arg          : aliased Boolean;
+   Skip_Unchanged_Arg   : aliased Boolean;
    Display_Progress_Arg : aliased Boolean;
 
    --  Switch -U switch implementation
@@ -210,6 +213,24 @@ package body GNAThub.Configuration is
          Long_Switch => "--reporters-only",
          Help        => "Execute only plugins implementing GNAThub.Reporter");
 
+      Define_Switch
+        (Config      => Config,
+         Output      => Pipeline_Arg'Access,
+         Long_Switch => "--pipeline",
+         Help        => "Collect results while the next tool is executed");
+
+      Define_Switch
+        (Config      => Config,
+         Output      => Profile_Arg'Access,
+         Long_Switch => "--profile",
+         Help        => "Save a Python profile of each plugin execution");
+
+      Define_Switch
+        (Config      => Config,
+         Output      => Skip_Unchanged_Arg'Access,
+         Long_Switch => "--skip-unchanged",
+         Help        => "Do not run again tools whose inputs are unchanged");
+
       Define_Switch
         (Config      => Config,
          Output      => Server_Arg'Access,
@@ -838,4 +859,31 @@ package body GNAThub.Configuration is
       return Reporters_Only_Arg;
    end Reporters_Only;
 
+   --------------
+   -- Pipeline --
+   --------------
+
+   function Pipeline return Boolean is
+   begin
+      return Pipeline_Arg;
+   end Pipeline;
+
+   -------------
+   -- Profile --
+   -------------
+
+   function Profile return Boolean is
+   begin
+      return Profile_Arg;
+   end Profile;
+
+   --------------------
+   -- Skip_Unchanged --
+   --------------------
+
+   function Skip_Unchanged return Boolean is
+   begin
+      return Skip_Unchanged_Arg;
+   end Skip_Unchanged;
+
 end GNAThub.Configuration;
@@ -314,6 +314,14 @@ package body GNAThub.Project is
 
       Internal_Register ("Plugins", Is_List => True);
       Internal_Register ("Plugins_Off", Is_List => True);
+
+      Internal_Register ("Compact_JSON");
+      Internal_Register ("Omit_Raw_Content");
+      Internal_Register ("Compress_JSON");
+      Internal_Register ("Spill_To_Disk");
+      Internal_Register ("Server_Workers");
+      Internal_Register ("Server_Timeout");
+      Internal_Register ("Server_Slow_Request");
    end Register_Custom_Attributes;
 
    ----------------
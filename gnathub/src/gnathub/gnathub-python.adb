@@ -87,6 +87,9 @@ package body GNAThub.Python is
    Engine_Repository_Function : aliased constant String := "engine_repository";
    Runners_Only_Function      : aliased constant String := "runners_only";
    Reporters_Only_Function    : aliased constant String := "reporters_only";
+   Pipeline_Function          : aliased constant String := "pipeline";
+   Profile_Function           : aliased constant String := "profile";
+   Skip_Unchanged_Function    : aliased constant String := "skip_unchanged";
    Tool_Args_Function         : constant String         := "tool_args";
    Server_Port_Function       : aliased constant String := "port";
 
@@ -101,7 +104,7 @@ package body GNAThub.Python is
      "dry_run_without_project";
 
    No_Args_Root_Module_Functions :
-     constant array (1 .. 22) of access constant String :=
+     constant array (1 .. 25) of access constant String :=
        (Root_Function'Access,
         Logs_Function'Access,
         HTML_Data_Function'Access,
@@ -120,6 +123,9 @@ package body GNAThub.Python is
         Engine_Repository_Function'Access,
         Runners_Only_Function'Access,
         Reporters_Only_Function'Access,
+        Pipeline_Function'Access,
+        Profile_Function'Access,
+        Skip_Unchanged_Function'Access,
         Server_Port_Function'Access,
         Object_Codepeer_Dir_Function'Access,
         Codepeer_Output_Dir_Function'Access,
@@ -825,6 +831,15 @@ package body GNAThub.Python is
       elsif Command = Reporters_Only_Function then
          Set_Return_Value (Data, GNAThub.Configuration.Reporters_Only);
 
+      elsif Command = Pipeline_Function then
+         Set_Return_Value (Data, GNAThub.Configuration.Pipeline);
+
+      elsif Command = Profile_Function then
+         Set_Return_Value (Data, GNAThub.Configuration.Profile);
+
+      elsif Command = Skip_Unchanged_Function then
+         Set_Return_Value (Data, GNAThub.Configuration.Skip_Unchanged);
+
       else
          raise Python_Error with "Unknown method GNAThub." & Command;
       end if;
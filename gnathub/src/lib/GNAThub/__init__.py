@@ -113,6 +113,40 @@ def incremental():
     return NotImplemented   # Implemented in Ada
 
 
+def pipeline():
+    """Whether the pipeline switch was passed to the GNAThub driver or not.
+
+    This is the equivalent to using :command:`--pipeline` on the command-line.
+
+    :return: whether the pipeline switch is passed or not
+    :rtype: bool
+    """
+    return NotImplemented   # Implemented in Ada
+
+
+def profile():
+    """Whether the profile switch was passed to the GNAThub driver or not.
+
+    This is the equivalent to using :command:`--profile` on the command-line.
+
+    :return: whether the profile switch is passed or not
+    :rtype: bool
+    """
+    return NotImplemented   # Implemented in Ada
+
+
+def skip_unchanged():
+    """Whether the skip-unchanged switch was passed to the driver or not.
+
+    This is the equivalent to using :command:`--skip-unchanged` on the
+    command-line.
+
+    :return: whether the skip-unchanged switch is passed or not
+    :rtype: bool
+    """
+    return NotImplemented   # Implemented in Ada
+
+
 # Keeping this for later implementation of -U main switch
 # def u_main():
 #     """Return the name of the main file provided with the switch.
@@ -803,8 +837,12 @@ except ImportError:
 # Now that all Ada extensions have been planted into this module, we can
 # define pure-Python extensions.
 
+import collections
 import os
 import platform
+import sqlite3
+import tempfile
+import threading
 
 from abc import ABCMeta, abstractmethod
 from subprocess import Popen, STDOUT
@@ -882,6 +920,445 @@ def _console_ko(message, columns=79):
     Console._status(message, 'FAILED', columns)
 
 
+class ToolRecord(collections.namedtuple('ToolRecord', ('id', 'name'))):
+
+    """A read-only :class:`Tool`, see :meth:`Resource.list_all_messages`."""
+
+    __slots__ = ()
+
+
+class RuleRecord(collections.namedtuple(
+        'RuleRecord', ('id', 'name', 'identifier', 'kind', 'tool_id'))):
+
+    """A read-only :class:`Rule`, see :meth:`Resource.list_all_messages`."""
+
+    __slots__ = ()
+
+
+class PropertyRecord(collections.namedtuple(
+        'PropertyRecord', ('id', 'identifier', 'name'))):
+
+    """A read-only :class:`Property`, see :meth:`Resource.list_all_messages`.
+    """
+
+    __slots__ = ()
+
+
+class MessageRecord(collections.namedtuple(
+        'MessageRecord', ('id', 'rule_id', 'data', 'ranking', 'tool_msg_id',
+                          'line', 'col_begin', 'col_end', 'properties'))):
+
+    """A read-only :class:`Message`, see :meth:`Resource.list_all_messages`.
+
+    Unlike :class:`Message`, the properties of the message are loaded along
+    with the message itself.
+    """
+
+    __slots__ = ()
+
+    def get_properties(self):
+        """Return the properties of this message.
+
+        :rtype: list[GNAThub.PropertyRecord]
+        """
+        return self.properties
+
+
+def _read_tools_and_rules(connection, schema=''):
+    """Read all tools and rules from the database.
+
+    :param sqlite3.Connection connection: the connection to the database
+    :param str schema: the schema of the GNAThub database in ``connection``
+    :return: the tools and the rules, indexed by their ID
+    :rtype: (dict[int, ToolRecord], dict[int, RuleRecord])
+    """
+    tools = {
+        row[0]: ToolRecord(*row) for row in connection.execute(
+            'SELECT id, name FROM {}tools'.format(schema))}
+    rules = {
+        row[0]: RuleRecord(*row) for row in connection.execute(
+            'SELECT id, name, identifier, kind, tool_id FROM {}rules'.format(
+                schema))}
+    return tools, rules
+
+
+def _message_record(row, properties):
+    """Create a message record from a database row.
+
+    :param tuple row: the ``id``, ``rule_id``, ``data``, ``ranking`` and
+        ``tool_msg_id`` of the message, followed by the ``line``,
+        ``col_begin`` and ``col_end`` of its location
+    :param list[PropertyRecord] properties: the properties of the message
+    :rtype: MessageRecord
+    """
+    message_id, rule_id, data, ranking, tool_msg_id = row[:5]
+    line, col_begin, col_end = row[5:]
+    return MessageRecord(
+        message_id, rule_id, '' if data is None else data,
+        RANKING_UNSPECIFIED if ranking is None else ranking,
+        tool_msg_id or 0, line or 0, col_begin or 0, col_end or 0,
+        properties)
+
+
+@_extend(Resource, 'list_all_messages')
+def _resource_list_all_messages():
+    """List all messages associated with a resource, grouped by resource.
+
+    This is the bulk equivalent of calling :meth:`Resource.list_messages` on
+    every resource, then :meth:`Message.get_properties` on every message: the
+    messages, their location, rule, tool and properties are all read from the
+    database in a single pass.
+
+    Messages are listed in the order they were added to each resource. See
+    :class:`MessageReader` to read the messages of one resource at a time.
+
+    :return: for each resource name, the list of ``(message, rule, tool)``
+        associated with that resource
+    :rtype: dict[str, list[(GNAThub.MessageRecord, GNAThub.RuleRecord,
+        GNAThub.ToolRecord)]]
+    """
+    connection = sqlite3.connect(database())
+    try:
+        tools, rules = _read_tools_and_rules(connection)
+
+        properties = collections.defaultdict(list)
+        for row in connection.execute(
+                'SELECT mp.message_id, p.id, p.identifier, p.name'
+                ' FROM messages_properties mp, properties p'
+                ' WHERE p.id = mp.property_id ORDER BY mp.id'):
+            properties[row[0]].append(PropertyRecord(*row[1:]))
+
+        messages = collections.defaultdict(list)
+        for row in connection.execute(
+                'SELECT r.name, m.id, m.rule_id, m.data, m.ranking,'
+                '       m.tool_msg_id, rm.line, rm.col_begin, rm.col_end'
+                ' FROM resources_messages rm, messages m, resources r'
+                ' WHERE m.id = rm.message_id AND r.id = rm.resource_id'
+                ' ORDER BY rm.id'):
+            message = _message_record(row[1:], properties.get(row[1], []))
+            rule = rules[message.rule_id]
+            messages[row[0]].append((message, rule, tools[rule.tool_id]))
+        return messages
+
+    finally:
+        connection.close()
+
+
+class MessageReader(object):
+
+    """Read the messages associated with resources, one resource at a time.
+
+    This is the bounded-memory alternative to
+    :meth:`Resource.list_all_messages`: messages and their properties are
+    first copied into a temporary database, indexed by resource, from which
+    the messages of each resource are then read on demand. Only tools and
+    rules are kept in memory.
+
+    Use as a context manager, or call :meth:`close` to remove the temporary
+    database::
+
+        with GNAThub.MessageReader() as reader:
+            for message, rule, tool in reader.messages(path):
+                ...
+    """
+
+    def __init__(self, directory=None):
+        """
+        :param directory: the directory where to create the temporary
+            database; defaults to :func:`GNAThub.root`
+        :type directory: str or None
+        """
+        fd, self.path = tempfile.mkstemp(
+            suffix='.db', dir=root() if directory is None else directory)
+        os.close(fd)
+        self.connection = sqlite3.connect(self.path)
+        try:
+            self.connection.execute(
+                'ATTACH DATABASE ? AS gnathub', (database(),))
+            self.tools, self.rules = _read_tools_and_rules(
+                self.connection, 'gnathub.')
+            self.connection.executescript("""
+                CREATE TABLE messages AS
+                  SELECT r.name AS resource, rm.id AS seq, m.id, m.rule_id,
+                         m.data, m.ranking, m.tool_msg_id,
+                         rm.line, rm.col_begin, rm.col_end
+                  FROM gnathub.resources_messages rm, gnathub.messages m,
+                       gnathub.resources r
+                  WHERE m.id = rm.message_id AND r.id = rm.resource_id;
+                CREATE INDEX messages_resource ON messages (resource, seq);
+                CREATE TABLE properties AS
+                  SELECT mp.id AS seq, mp.message_id, p.id, p.identifier,
+                         p.name
+                  FROM gnathub.messages_properties mp, gnathub.properties p
+                  WHERE p.id = mp.property_id;
+                CREATE INDEX properties_message
+                  ON properties (message_id, seq);
+            """)
+            self.connection.execute('DETACH DATABASE gnathub')
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def messages(self, name):
+        """List the messages associated with a resource.
+
+        :param str name: the name of the resource
+        :return: the list of ``(message, rule, tool)`` associated with that
+            resource, in the order they were added to the resource
+        :rtype: list[(GNAThub.MessageRecord, GNAThub.RuleRecord,
+            GNAThub.ToolRecord)]
+        """
+        properties = collections.defaultdict(list)
+        for row in self.connection.execute(
+                'SELECT message_id, id, identifier, name FROM properties'
+                ' WHERE message_id IN'
+                '  (SELECT id FROM messages WHERE resource = ?)'
+                ' ORDER BY seq', (name,)):
+            properties[row[0]].append(PropertyRecord(*row[1:]))
+
+        messages = []
+        for row in self.connection.execute(
+                'SELECT id, rule_id, data, ranking, tool_msg_id,'
+                '       line, col_begin, col_end'
+                ' FROM messages WHERE resource = ? ORDER BY seq', (name,)):
+            message = _message_record(row, properties.get(row[0], []))
+            rule = self.rules[message.rule_id]
+            messages.append((message, rule, self.tools[rule.tool_id]))
+        return messages
+
+    def close(self):
+        """Remove the temporary database."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+            os.remove(self.path)
+
+
+# The indexes used by query_messages. They are created on the first query
+# rather than by the driver, so that existing databases benefit from them.
+_QUERY_INDEXES = (
+    ('gnathub_rm_resource', 'resources_messages (resource_id, line)'),
+    ('gnathub_rm_message', 'resources_messages (message_id)'),
+    ('gnathub_messages_rule', 'messages (rule_id)'),
+    ('gnathub_rules_tool', 'rules (tool_id)'),
+    ('gnathub_rules_name', 'rules (name)'),
+    ('gnathub_resources_name', 'resources (name)'),
+    ('gnathub_mp_message', 'messages_properties (message_id)'),
+    ('gnathub_mp_property', 'messages_properties (property_id)'),
+)
+
+
+class _QueryState(object):
+
+    """The per-database state of :func:`query_messages`.
+
+    Records the databases whose indexes were created, and caches the number
+    of messages matching each set of filters until the database changes.
+    """
+
+    MAX_COUNTS = 64
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.versions = {}
+        self.counts = collections.OrderedDict()
+
+    @staticmethod
+    def _version(path):
+        stat = os.stat(path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def prepare(self, connection, path):
+        """Create the indexes of the database if it changed since last seen.
+
+        :param sqlite3.Connection connection: the connection to the database
+        :param str path: the path to the database
+        :return: the version of the database
+        :rtype: tuple
+        """
+        version = self._version(path)
+        with self.lock:
+            if self.versions.get(path) == version:
+                return version
+
+        try:
+            for name, columns in _QUERY_INDEXES:
+                connection.execute(
+                    'CREATE INDEX IF NOT EXISTS {} ON {}'.format(
+                        name, columns))
+            connection.commit()
+        except sqlite3.OperationalError:
+            # The database may be read-only: query it as is
+            logging.getLogger(__name__).debug(
+                'cannot index %s', path, exc_info=True)
+
+        version = self._version(path)
+        with self.lock:
+            self.versions[path] = version
+        return version
+
+    def count(self, connection, key, query, params):
+        """Return the number of rows of ``query``, cached under ``key``.
+
+        :param sqlite3.Connection connection: the connection to the database
+        :param tuple key: the database, its version and the filters
+        :param str query: the ``SELECT COUNT(*)`` query
+        :param list params: the parameters of the query
+        :rtype: int
+        """
+        with self.lock:
+            if key in self.counts:
+                self.counts.move_to_end(key)
+                return self.counts[key]
+
+        total, = connection.execute(query, params).fetchone()
+        with self.lock:
+            self.counts[key] = total
+            while len(self.counts) > self.MAX_COUNTS:
+                self.counts.popitem(last=False)
+        return total
+
+
+_QUERY_STATE = _QueryState()
+
+
+def query_messages(tools=None, rules=None, rankings=None, properties=None,
+                   files=None, exclude_rules=None, located=False, offset=0,
+                   limit=None):
+    """List the messages matching a set of filters, one page at a time.
+
+    Each filter is the list of accepted values, or ``None`` to accept any
+    value. A message is listed if it matches all the filters. The filtering
+    and the pagination are performed by the database, through indexes created
+    on the first query: only the requested page is read. The total number of
+    matching messages is only counted once per set of filters, until the
+    database changes.
+
+    :param tools: the names of the tools
+    :type tools: list[str] | None
+    :param rules: the names of the rules
+    :type rules: list[str] | None
+    :param rankings: the rankings, see ``RANKING_*``
+    :type rankings: list[int] | None
+    :param properties: the names of the properties; messages having any of
+        these properties are listed
+    :type properties: list[str] | None
+    :param files: the names of the resources, either their full path or their
+        base name
+    :type files: list[str] | None
+    :param exclude_rules: the identifiers of the rules whose messages are not
+        listed
+    :type exclude_rules: list[str] | None
+    :param bool located: whether to only list messages attached to a line
+    :param int offset: the number of matching messages to skip
+    :param limit: the maximum number of messages to list, or ``None``
+    :type limit: int | None
+    :return: the total number of matching messages, and the requested page of
+        ``(resource name, message, rule, tool)``, in the order messages were
+        added to resources
+    :rtype: (int, list[(str, GNAThub.MessageRecord, GNAThub.RuleRecord,
+        GNAThub.ToolRecord)])
+    """
+    path = database()
+    connection = sqlite3.connect(path)
+    try:
+        version = _QUERY_STATE.prepare(connection, path)
+        tool_records, rule_records = _read_tools_and_rules(connection)
+        where = ['m.id = rm.message_id', 'ru.id = m.rule_id',
+                 't.id = ru.tool_id', 'r.id = rm.resource_id']
+        params = []
+
+        def accept(column, values):
+            where.append('{} IN ({})'.format(
+                column, ', '.join('?' * len(values))))
+            params.extend(values)
+
+        # Tool and rule names are case-insensitive columns of the database.
+        # The filters are matched by the database rather than expanded into
+        # the list of the matching rules, which may exceed the limit on the
+        # number of SQL parameters.
+        if tools is not None:
+            accept('t.name', list(tools))
+
+        if rules is not None:
+            accept('ru.name', list(rules))
+
+        for identifier in exclude_rules or ():
+            where.append('ru.identifier IS NOT ?')
+            params.append(identifier)
+
+        if rankings is not None:
+            accept('m.ranking', list(rankings))
+
+        if properties is not None:
+            where.append(
+                'm.id IN (SELECT mp.message_id'
+                '  FROM messages_properties mp, properties p'
+                '  WHERE p.id = mp.property_id AND p.name IN ({}))'.format(
+                    ', '.join('?' * len(properties))))
+            params.extend(properties)
+
+        if files is not None:
+            # Select the matching resources first: base names are matched
+            # against the end of the stored names.
+            matches = ['name IN ({})'.format(', '.join('?' * len(files)))]
+            params.extend(files)
+            seps = [os.sep] + ([os.altsep] if os.altsep else [])
+            for name in files:
+                for sep in seps:
+                    matches.append('substr(name, ?) = ?')
+                    params.extend([-len(sep + name), sep + name])
+            where.append(
+                'rm.resource_id IN (SELECT id FROM resources WHERE {})'.format(
+                    ' OR '.join(matches)))
+
+        if located:
+            where.append('rm.line > 0')
+
+        tables = (' FROM resources_messages rm, messages m, rules ru,'
+                  ' tools t, resources r WHERE ' + ' AND '.join(where))
+        total = _QUERY_STATE.count(
+            connection, (path, version, tables, tuple(params)),
+            'SELECT COUNT(*)' + tables, params)
+
+        rows = connection.execute(
+            'SELECT r.name, m.id, m.rule_id, m.data, m.ranking,'
+            '       m.tool_msg_id, rm.line, rm.col_begin, rm.col_end' +
+            tables + ' ORDER BY rm.id LIMIT ? OFFSET ?',
+            params + [-1 if limit is None else limit, offset]).fetchall()
+
+        # Read the properties of the listed messages only, in chunks to stay
+        # below the limit on the number of SQL parameters.
+        properties = collections.defaultdict(list)
+        ids = sorted({row[1] for row in rows})
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            for row in connection.execute(
+                    'SELECT mp.message_id, p.id, p.identifier, p.name'
+                    ' FROM messages_properties mp, properties p'
+                    ' WHERE p.id = mp.property_id'
+                    ' AND mp.message_id IN ({}) ORDER BY mp.id'.format(
+                        ', '.join('?' * len(chunk))), chunk):
+                properties[row[0]].append(PropertyRecord(*row[1:]))
+
+        messages = []
+        for row in rows:
+            message = _message_record(row[1:], properties.get(row[1], []))
+            rule = rule_records[message.rule_id]
+            messages.append(
+                (row[0], message, rule, tool_records[rule.tool_id]))
+        return total, messages
+
+    finally:
+        connection.close()
+
+
 class Plugin(object, metaclass=ABCMeta):
 
     """GNAThub plugin interface.
@@ -1049,6 +1526,9 @@ class Run(object):
 
     """Class to handle processes."""
 
+    # The processes waited for, per thread (see :meth:`Run.record_processes`)
+    _processes = threading.local()
+
     def __init__(self, name, argv, env=None, workdir=None, out=None,
                  capture_stderr=True, append_out=False):
         """Spawn the process.
@@ -1071,6 +1551,7 @@ class Run(object):
         self.argv = self.expand_argv(name, argv)
         self.status = 127
         self.pid = -1
+        self.rusage = None
         self.out = out
         self.append_out = append_out
         self.log = logging.getLogger(self.__class__.__name__)
@@ -1110,10 +1591,40 @@ class Run(object):
             raise
 
     def wait(self):
-        """Wait until process ends and returns its status."""
+        """Wait until process ends and returns its status.
+
+        On platforms that support it, the resource usage of the process is
+        saved in the ``rusage`` attribute.
+        """
+        if self.inferior.returncode is None:
+            if hasattr(os, 'wait4'):
+                _, status, self.rusage = os.wait4(self.inferior.pid, 0)
+                self.inferior.returncode = (
+                    -os.WTERMSIG(status) if os.WIFSIGNALED(status)
+                    else os.WEXITSTATUS(status))
+            else:
+                self.inferior.wait()
+
+            records = getattr(Run._processes, 'records', None)
+            if records is not None:
+                records.append(self)
+
         self.status = self.inferior.wait()
         return self.status
 
+    @staticmethod
+    def record_processes():
+        """Record the processes spawned by the calling thread.
+
+        Any process spawned afterwards by the calling thread is appended to
+        the returned list once it has exited, with its resource usage in its
+        ``rusage`` attribute. A new call replaces the list.
+
+        :rtype: list[Run]
+        """
+        Run._processes.records = []
+        return Run._processes.records
+
     @staticmethod
     def expand_argv(name, argv):
         """TODO(delay)
@@ -18,11 +18,20 @@ spawning the main event loop.
 # COPYING3.  If not, go to http://www.gnu.org/licenses for a complete copy
 # of the license.
 
+import cProfile
+import collections
+import contextlib
+import hashlib
 import inspect
 import json
 import logging
+import multiprocessing
 import os
+import queue
+import shutil
+import sqlite3
 import sys
+import threading
 import time
 
 import GNAThub
@@ -65,6 +74,440 @@ class GNAThubLoggingHandler(logging.Handler):
             return
 
 
+# A plugin declared by a script: the name of its class and its name
+PluginEntry = collections.namedtuple(
+    'PluginEntry', ('script', 'class_name', 'name'))
+
+
+class PluginManifest(object):
+
+    """Record the plugins declared by each script.
+
+    This allows the plugins to be discovered and filtered without loading the
+    scripts (and the modules they import). The entry of a script is valid as
+    long as its modification time and size are unchanged.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path):
+        """Load the manifest, if any.
+
+        :param str | None path: the path to the manifest file, or ``None`` to
+            not persist the manifest
+        """
+        self.path = path
+        self.entries = {}
+        self.modified = False
+
+        if path is None or not os.path.isfile(path):
+            return
+
+        try:
+            with open(path, 'r') as fd:
+                content = json.load(fd)
+        except (IOError, ValueError):
+            LOG.exception('ignore invalid manifest: %s', path)
+            return
+
+        if content.get('version') == self.VERSION:
+            self.entries = content.get('scripts', {})
+
+    @staticmethod
+    def stamp(script):
+        """Return the stamp of a script: its modification time and size.
+
+        :param str script: the path to the script
+        :rtype: list[int]
+        """
+        info = os.stat(script)
+        return [info.st_mtime_ns, info.st_size]
+
+    def get(self, script):
+        """Return the plugins declared by a script, if known.
+
+        :param str script: the path to the script
+        :return: the list of plugin entries, or ``None`` if the script changed
+            since it was recorded, or was never recorded
+        :rtype: list[PluginEntry] | None
+        """
+        entry = self.entries.get(script)
+        if entry is None or entry['stamp'] != self.stamp(script):
+            return None
+        return [PluginEntry(script, class_name, name)
+                for class_name, name in entry['plugins']]
+
+    def set(self, script, plugins):
+        """Record the plugins declared by a script.
+
+        :param str script: the path to the script
+        :param list[PluginEntry] plugins: the plugins declared by the script
+        """
+        self.entries[script] = {
+            'stamp': self.stamp(script),
+            'plugins': [[p.class_name, p.name] for p in plugins]
+        }
+        self.modified = True
+
+    def save(self):
+        """Save the manifest if it was modified."""
+        if self.path is None or not self.modified:
+            return
+
+        if not os.path.isdir(os.path.dirname(self.path)):
+            return
+
+        try:
+            with open(self.path, 'w') as fd:
+                json.dump({'version': self.VERSION, 'scripts': self.entries},
+                          fd)
+        except IOError:
+            LOG.exception('could not write manifest %s', self.path)
+        else:
+            self.modified = False
+
+
+class PluginStats(object):
+
+    """Record the resources used by the execution of a plugin.
+
+    This records the wall-clock and CPU time of each phase of the plugin, the
+    resource usage of the processes it spawns with :class:`GNAThub.Run`, and
+    an estimate of the number of rows it inserts in the database (see
+    :meth:`PluginRunner.inserted_rows`).
+    """
+
+    def __init__(self):
+        """Start recording, for the calling thread."""
+        self.phases = collections.OrderedDict()
+        self.processes = GNAThub.Run.record_processes()
+        self.rows = 0
+        self.decision = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Record the time spent in a phase of the plugin.
+
+        The CPU time is the time used by the calling thread, ie. by the Python
+        code of the plugin.
+
+        :param str name: the name of the phase
+        """
+        start, cpu = time.time(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.phases[name] = {
+                'start': start,
+                'time': time.time() - start,
+                'cpu': time.thread_time() - cpu
+            }
+
+    def to_json(self):
+        """Return the JSON-compatible representation of the statistics.
+
+        The peak resident set size of the processes is in kilobytes.
+
+        :rtype: dict[str, *]
+        """
+        usage = [p.rusage for p in self.processes if p.rusage is not None]
+        max_rss = max([u.ru_maxrss for u in usage] or [0])
+        if sys.platform == 'darwin':
+            # In bytes instead of kilobytes
+            max_rss //= 1024
+
+        stats = {
+            'phases': self.phases,
+            'processes': {
+                'count': len(self.processes),
+                'cpu': sum(u.ru_utime + u.ru_stime for u in usage),
+                'max_rss': max_rss
+            },
+            'rows_estimate': self.rows
+        }
+        if self.decision is not None:
+            stats['fingerprint'] = {
+                'decision': self.decision.action,
+                'reason': self.decision.reason
+            }
+        return stats
+
+
+# Whether to execute the run and report phases of a plugin, and why, given
+# the fingerprint of its inputs.
+FingerprintDecision = collections.namedtuple(
+    'FingerprintDecision',
+    ('skip_run', 'skip_report', 'action', 'reason', 'inputs'))
+
+
+class InputFingerprints(object):
+
+    """Skip the execution of plugins whose inputs are unchanged.
+
+    The inputs of a plugin are the sources and project file of the project,
+    the scenario switches, the target and runtime, the arguments passed with
+    :command:`--targs` to the plugin and to its tools, the script declaring
+    the plugin, and the executables of its tools: their path, size and
+    modification time stand for their version. The tools of a plugin are the
+    processes it spawned with :class:`GNAThub.Run` during its previous
+    execution: a plugin which spawned none is always executed, as changes to
+    its tools could not be detected.
+
+    The digest of the inputs of the last successful execution of each plugin
+    is saved in the GNAThub directory. The ``run`` phase of a plugin is
+    skipped if its inputs are unchanged since. Its ``report`` phase is also
+    skipped if the database was kept (:command:`--incremental`) and already
+    holds the results of that execution.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path):
+        """Load the digests saved by the previous executions, if any.
+
+        :param str path: the path to the file of digests
+        """
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.project_digest = None
+
+        if not os.path.isfile(path):
+            return
+
+        try:
+            with open(path, 'r') as fd:
+                content = json.load(fd)
+        except (IOError, ValueError):
+            LOG.exception('ignore invalid fingerprints: %s', path)
+            return
+
+        if content.get('version') == self.VERSION:
+            self.entries = content.get('plugins', {})
+
+    @staticmethod
+    def stamp(path):
+        """Return the stamp of a file: its path, modification time and size.
+
+        :param str | None path: the path to the file
+        :rtype: str
+        """
+        try:
+            info = os.stat(path)
+        except (OSError, TypeError):
+            return '{}:missing\n'.format(path)
+        return '{}:{}:{}\n'.format(path, info.st_mtime_ns, info.st_size)
+
+    @staticmethod
+    def digest(*values):
+        """Return the digest of the given values.
+
+        :param list[str] values: the values to digest
+        :rtype: str
+        """
+        sha = hashlib.sha1()
+        for value in values:
+            sha.update(value.encode('utf-8', 'replace'))
+            sha.update(b'\0')
+        return sha.hexdigest()
+
+    def project(self):
+        """Return the digest of the project and its sources.
+
+        It is computed once, when the first plugin is executed.
+
+        :rtype: str
+        """
+        with self.lock:
+            if self.project_digest is None:
+                files = [GNAThub.Project.path()]
+                for _, sources in sorted(
+                        GNAThub.Project.source_files().items()):
+                    files.extend(sorted(sources))
+                self.project_digest = self.digest(
+                    GNAThub.Project.target() or '',
+                    GNAThub.Project.runtime() or '',
+                    *[self.stamp(path) for path in files])
+            return self.project_digest
+
+    def inputs(self, plugin, script, tools):
+        """Return the digests of the inputs of a plugin.
+
+        :param GNAThub.Plugin plugin: the plugin
+        :param str | None script: the script declaring the plugin
+        :param list[str] tools: the tools of the plugin
+        :return: the digest of each kind of input
+        :rtype: dict[str, str]
+        """
+        inputs = {
+            'sources': self.project(),
+            'scenario': self.digest(*GNAThub.Project.scenario_switches()),
+            'plugin': self.digest(self.stamp(script))
+        }
+        inputs.update(self.tools(plugin, tools))
+        return inputs
+
+    def tools(self, plugin, tools):
+        """Return the digests of the inputs of a plugin that are its tools.
+
+        :param GNAThub.Plugin plugin: the plugin
+        :param list[str] tools: the tools of the plugin
+        :return: the digest of the arguments passed to the plugin and its
+            tools, and the digest of their executables
+        :rtype: dict[str, str]
+        """
+        names = [plugin.name] + [
+            os.path.splitext(os.path.basename(tool))[0] for tool in tools]
+        return {
+            'tool arguments': self.digest(*[
+                arg for name in names for arg in
+                [name] + list(GNAThub.tool_args(name))]),
+            'tools': self.digest(*[
+                self.stamp(shutil.which(tool) or tool) for tool in tools])
+        }
+
+    @staticmethod
+    def database_id():
+        """Return the identity of the database file.
+
+        :rtype: int | None
+        """
+        try:
+            return os.stat(GNAThub.database()).st_ino
+        except OSError:
+            return None
+
+    def check(self, plugin, script):
+        """Decide whether to execute a plugin given its inputs.
+
+        :param GNAThub.Plugin plugin: the plugin
+        :param str | None script: the script declaring the plugin
+        :rtype: FingerprintDecision
+        """
+        with self.lock:
+            entry = self.entries.get(plugin.name)
+
+        if entry is None:
+            decision = FingerprintDecision(
+                False, False, 'execute', 'no previous successful execution',
+                self.inputs(plugin, script, []))
+
+        else:
+            inputs = self.inputs(plugin, script, entry['tools'])
+            changed = sorted(
+                k for k, v in inputs.items() if entry['inputs'].get(k) != v)
+
+            if not entry['tools']:
+                decision = FingerprintDecision(
+                    False, False, 'execute', 'no tool recorded', inputs)
+            elif changed:
+                decision = FingerprintDecision(
+                    False, False, 'execute',
+                    'changed: {}'.format(', '.join(changed)), inputs)
+            elif (GNAThub.incremental() and entry['reported'] and
+                    entry['database'] == self.database_id()):
+                decision = FingerprintDecision(
+                    True, True, 'skip run and report',
+                    'inputs unchanged, results already in the database',
+                    inputs)
+            else:
+                decision = FingerprintDecision(
+                    True, False, 'skip run', 'inputs unchanged', inputs)
+
+        # Until the plugin completes successfully (see update), the outputs
+        # of the previous execution and the database cannot be relied upon.
+        with self.lock:
+            if not decision.skip_run:
+                self.entries.pop(plugin.name, None)
+            elif not decision.skip_report:
+                self.entries[plugin.name]['reported'] = False
+
+        return decision
+
+    def update(self, plugin, decision, processes, reported):
+        """Record the outcome of the execution of a plugin.
+
+        :param GNAThub.Plugin plugin: the plugin
+        :param FingerprintDecision decision: the decision made for the plugin
+        :param list[GNAThub.Run] processes: the processes it spawned
+        :param boolean reported: whether the database holds its results
+        """
+        if plugin.exec_status != GNAThub.EXEC_SUCCESS:
+            # Execute it again next time
+            with self.lock:
+                self.entries.pop(plugin.name, None)
+            return
+
+        if decision.skip_run:
+            with self.lock:
+                tools = self.entries[plugin.name]['tools']
+            inputs = decision.inputs
+        else:
+            tools = sorted(set(p.argv[0] for p in processes))
+            inputs = dict(decision.inputs)
+            inputs.update(self.tools(plugin, tools))
+
+        with self.lock:
+            self.entries[plugin.name] = {
+                'inputs': inputs,
+                'tools': tools,
+                'reported': reported,
+                'database': self.database_id()
+            }
+
+    def save(self):
+        """Save the digests."""
+        try:
+            with open(self.path, 'w') as fd:
+                json.dump({'version': self.VERSION, 'plugins': self.entries},
+                          fd)
+        except IOError:
+            LOG.exception('could not write fingerprints %s', self.path)
+
+
+class JobBudget(object):
+
+    """Share the ``-j`` budget among the plugins executed concurrently.
+
+    While in use, :func:`GNAThub.jobs` returns the share of each plugin to the
+    threads executing the plugins (see :meth:`assign`), so that the tools
+    spawned concurrently do not each use as many processes as allowed for the
+    entire run. It still returns the whole budget to the other threads.
+    """
+
+    def __init__(self, jobs, concurrency):
+        """Initialize the budget.
+
+        :param int jobs: the number of processes allowed for the entire run
+        :param int concurrency: the number of plugins executed concurrently
+        """
+        self.share = max(1, jobs // concurrency)
+        self.local = threading.local()
+        self.jobs = None
+
+    def __enter__(self):
+        self.jobs = jobs = GNAThub.jobs
+        local = self.local
+
+        def shared_jobs():
+            return getattr(local, 'share', None) or jobs()
+
+        GNAThub.jobs = shared_jobs
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        GNAThub.jobs, self.jobs = self.jobs, None
+
+    @contextlib.contextmanager
+    def assign(self):
+        """Give the calling thread a share of the budget."""
+        self.local.share = self.share
+        try:
+            yield
+        finally:
+            del self.local.share
+
+
 class PluginRunner(object):
     """Class that loads python plugins.
 
@@ -74,16 +517,47 @@ class PluginRunner(object):
       * core plugin
       * user plugin
       * sonar plugin (if active)
+
+    With :command:`-j` greater than 1, the plugins that are not in
+    ``POST_PHASE_PLUGINS`` are executed concurrently, in as many threads as
+    allowed by the ``-j`` budget. Only their ``setup`` and ``run`` phases (ie.
+    the external tool) overlap: their other phases, which may update the
+    database, are serialized. With :command:`--pipeline`, one more thread
+    collects the results of a plugin while the tool of the next one executes,
+    even with :command:`-j1`.
+    The plugins in ``POST_PHASE_PLUGINS`` are executed last, one after the
+    other, once all others completed.
     """
 
     PLUGIN_EXT = '.py'
     POST_PHASE_PLUGINS = ('sonar-scanner', 'html-report')
+    MANIFEST = 'plugins.manifest'
+    FINGERPRINTS = 'fingerprints.json'
+
+    # The name of the plugins loaded, indexed by their type object
+    names = {}
+
+    # The plugins declared by the scripts loaded, indexed by script
+    loaded = {}
+
+    # The scripts that failed to load
+    broken = set()
+
+    # The script declaring each plugin loaded, indexed by its type object
+    scripts = {}
 
     def __init__(self):
         """Gather the list of plugins."""
         # The list of plugins to be sequentially executed
         self.plugins = PluginRunner.auto_discover_plugins()
 
+        # The fingerprints of the plugins inputs, with --skip-unchanged
+        self.fingerprints = None
+        if (GNAThub.skip_unchanged() and
+                not GNAThub.dry_run_without_project()):
+            self.fingerprints = InputFingerprints(
+                os.path.join(GNAThub.root(), self.FINGERPRINTS))
+
     @staticmethod
     def info(message, *args):
         """Display an informative message, prefixed with the plug-in name.
@@ -138,8 +612,27 @@ class PluginRunner(object):
             #  sorting is necessary at that point
             return plugins
         else:
-            return sorted(plugins,
-                          key=lambda p:  p().name in cls.POST_PHASE_PLUGINS)
+            return sorted(plugins, key=cls.is_post_phase)
+
+    @classmethod
+    def plugin_name(cls, clazz):
+        """Return the name of a plugin, instantiating it only once.
+
+        :param type clazz: the plugin type object
+        :rtype: str
+        """
+        if clazz not in cls.names:
+            cls.names[clazz] = clazz().name
+        return cls.names[clazz]
+
+    @classmethod
+    def is_post_phase(cls, clazz):
+        """Whether the plugin must be executed once all others completed.
+
+        :param type clazz: the plugin type object
+        :rtype: boolean
+        """
+        return cls.plugin_name(clazz) in cls.POST_PHASE_PLUGINS
 
     @classmethod
     def walk_repository(cls, repository):
@@ -181,18 +674,62 @@ class PluginRunner(object):
         except Exception as why:
             LOG.exception('failed to load script: %s', script)
             cls.warn('%s: failed to load: %s', script, str(why))
+            cls.broken.add(script)
 
         for obj in list(namespace.values()):
             if inspect.isclass(obj) and obj.__base__ is GNAThub.Plugin:
                 yield obj
 
+    @classmethod
+    def load(cls, script):
+        """Load a script, once, and return the plugins it declares.
+
+        :param str script: path to the Python script to load
+        :return: the plugin type objects, indexed by class name
+        :rtype: dict[str, type]
+        """
+        if script not in cls.loaded:
+            cls.loaded[script] = {c.__name__: c for c in cls.inspect(script)}
+        return cls.loaded[script]
+
+    @classmethod
+    def declared_plugins(cls, script, manifest):
+        """Return the plugins declared by a script.
+
+        The script is loaded only if its entry in the manifest is not up to
+        date.
+
+        :param str script: path to the Python script
+        :param PluginManifest manifest: the plugin discovery manifest
+        :rtype: list[PluginEntry]
+        """
+        plugins = manifest.get(script)
+
+        if plugins is None:
+            try:
+                plugins = [
+                    PluginEntry(script, class_name, cls.plugin_name(clazz))
+                    for class_name, clazz in cls.load(script).items()]
+            except Exception as why:
+                LOG.exception('failed to inspect script: %s', script)
+                cls.warn('%s: failed to load: %s', script, str(why))
+                return []
+
+            # Load the script again next time to report the error, if any
+            if script not in cls.broken:
+                manifest.set(script, plugins)
+
+        return plugins
+
     @classmethod
     def auto_discover_plugins(cls):
         """Retrieve all plugins for GNAThub.
 
         This routine first lists all available scripts for this run of GNAThub.
-        It then tries to load each one of them and collect any Plugin declared
-        in those scripts.
+        It then collects any Plugin declared in those scripts, as recorded in
+        the plugin discovery manifest, or by loading the scripts that changed
+        since the previous run. Only the scripts that declare the plugins to
+        execute are loaded.
 
         This list of plugins is then filtered given the parameters of the run,
         ie.:
@@ -250,35 +787,46 @@ class PluginRunner(object):
                 LOG.info('use all discoverable plugins')
                 explicit = None
 
-        # Generate the final list of plugin classes. Inspect Python scripts to
-        # extract class definition and filter out those that will not be used.
+        # Generate the final list of plugins. Use the manifest (or inspect
+        # Python scripts) to extract plugin declarations and filter out those
+        # that will not be used.
 
         LOG.info('located %d scripts', len(scripts))
-        plugins = sum([list(cls.inspect(s)) for s in scripts], [])
+        if GNAThub.dry_run_without_project():
+            # There is no object directory to save the manifest to
+            manifest = PluginManifest(None)
+        else:
+            manifest = PluginManifest(
+                os.path.join(GNAThub.root(), cls.MANIFEST))
+        plugins = sum(
+            [cls.declared_plugins(s, manifest) for s in scripts], [])
+
+        if not GNAThub.dry_run():
+            manifest.save()
 
-        def is_plugin(clazz, name):
+        def is_plugin(entry, name):
             """Check whether this plugin name is ``name``.
 
-            :param type clazz: the plugin type object
+            :param PluginEntry entry: the plugin declaration
             :param str name: the expected name
             :return: ``True`` if this plugin name is ``name``
             :rtype: boolean
             """
             return (
-                clazz.__name__.lower() == name.lower() or
-                clazz().name.lower() == name.lower()
+                entry.class_name.lower() == name.lower() or
+                entry.name.lower() == name.lower()
             )
 
-        def contains_plugin_name(clazz, names):
+        def contains_plugin_name(entry, names):
             """Check whether the plugin name is in ``names``.
 
-            :param type clazz: the plugin type object
+            :param PluginEntry entry: the plugin declaration
             :param collections.Iterable[str] names: the list of name
             :return: ``True`` if the plugin name is in ``names``
             :rtype: boolean
             """
             for name in names:
-                if is_plugin(clazz, name):
+                if is_plugin(entry, name):
                     return True
 
             return False
@@ -295,19 +843,42 @@ class PluginRunner(object):
         # Return all autodiscovered plugins if is --dry_run mode without
         # project file as command line parameter
         if GNAThub.dry_run_without_project():
-            return cls.schedule(plugins)
+            return cls.schedule(cls.load_plugins(plugins))
 
         # Remove explicitly disabled plugins
         for name in GNAThub.Project.property_as_list('Plugins_Off'):
-            for clazz in plugins:
-                if is_plugin(clazz, name):
+            for entry in plugins:
+                if is_plugin(entry, name):
                     LOG.info('disable %s [Plugin_Off]', name)
-                    plugins.remove(clazz)
+                    plugins.remove(entry)
                     break
 
             LOG.warn('%s explicitly disabled but not loaded', name)
 
-        return cls.schedule(plugins)
+        return cls.schedule(cls.load_plugins(plugins))
+
+    @classmethod
+    def load_plugins(cls, plugins):
+        """Load the scripts declaring the given plugins.
+
+        :param list[PluginEntry] plugins: the plugin declarations
+        :return: the plugin type objects
+        :rtype: list[type]
+        """
+        classes = []
+
+        for entry in plugins:
+            clazz = cls.load(entry.script).get(entry.class_name)
+            if clazz is None:
+                cls.warn('%s: plugin %s not found', entry.script,
+                         entry.class_name)
+                continue
+
+            cls.names[clazz] = entry.name
+            cls.scripts[clazz] = entry.script
+            classes.append(clazz)
+
+        return classes
 
     @staticmethod
     def execute_runners():
@@ -358,17 +929,56 @@ class PluginRunner(object):
         return ((cls.execute_runners() and cls.is_runner(plugin)) or
                 (cls.execute_reporters() and cls.is_reporter(plugin)))
 
+    @staticmethod
+    def inserted_rows():
+        """Return the sum of the last IDs allocated in the database tables.
+
+        All tables of the database have an auto-incremented primary key, the
+        last value of which is recorded by SQLite. The rows are inserted by
+        the connection of the GNAThub driver, whose count of changes is not
+        available here: the difference of this sum before and after a phase
+        estimates the number of rows inserted meanwhile. The estimate is off
+        when IDs are set explicitly.
+
+        :rtype: int
+        """
+        connection = sqlite3.connect(GNAThub.database())
+        try:
+            count, = connection.execute(
+                'SELECT SUM(seq) FROM sqlite_sequence').fetchone()
+        except sqlite3.Error:
+            # The table is created on the first insertion
+            count = 0
+        finally:
+            connection.close()
+        return count or 0
+
     @classmethod
-    def execute(cls, plugin):
+    def execute(cls, plugin, writer=None, runners=None, stats=None,
+                fingerprints=None):
         """Execute the plugin.
 
         Call methods setup, execute and teardown for a plugin instance.
+        If ``fingerprints`` is given, the ``run`` and ``report`` phases are
+        skipped when the inputs of the plugin are unchanged (see
+        :class:`InputFingerprints`).
 
         :param GNAThub.Plugin plugin: instance of the plugin to execute
+        :param threading.Lock writer: the lock to hold during the ``report``
+            and ``teardown`` phases, when plugins are executed concurrently
+        :param threading.Semaphore runners: the semaphore to hold while the
+            tool executes (ie. during the ``run`` phase), when plugins are
+            executed concurrently
+        :param PluginStats stats: the statistics to fill, if any
+        :param InputFingerprints fingerprints: the fingerprints of the inputs
+            of the plugins, if any
         :return: the execution time in seconds
         :rtype: int
         """
         elapsed = 0
+        writer = writer or threading.Lock()
+        runners = runners or threading.Lock()
+        stats = stats or PluginStats()
 
         if cls.should_execute(plugin):
             cls.info('execute plug-in %s', plugin.name)
@@ -379,22 +989,51 @@ class PluginRunner(object):
 
             LOG.info('%s: set up environment', plugin.name)
             start = time.time()
-            plugin.setup()
+            with stats.phase('setup'):
+                plugin.setup()
 
             if cls.execute_runners() and cls.is_runner(plugin):
-                LOG.info('%s: produce results', plugin.name)
-                plugin.exec_status = plugin.run()
-
-            if (cls.execute_reporters() and cls.is_reporter(plugin) and
-                    plugin.exec_status in (
-                        GNAThub.EXEC_SUCCESS, GNAThub.NOT_EXECUTED)):
-                LOG.info('%s: collect results', plugin.name)
-                plugin.exec_status = plugin.report()
-
-            LOG.info('%s: post execution', plugin.name)
-            plugin.teardown()
+                if fingerprints is not None:
+                    stats.decision = fingerprints.check(
+                        plugin, cls.scripts.get(type(plugin)))
+                    LOG.info('%s: %s (%s)', plugin.name,
+                             stats.decision.action, stats.decision.reason)
+
+                if stats.decision and stats.decision.skip_run:
+                    plugin.info('inputs unchanged, tool not executed')
+                    plugin.exec_status = GNAThub.EXEC_SUCCESS
+                else:
+                    with runners:
+                        LOG.info('%s: produce results', plugin.name)
+                        with stats.phase('run'):
+                            plugin.exec_status = plugin.run()
+
+            with writer:
+                rows = cls.inserted_rows()
+                reported = not cls.is_reporter(plugin)
+
+                if (cls.execute_reporters() and cls.is_reporter(plugin) and
+                        plugin.exec_status in (
+                            GNAThub.EXEC_SUCCESS, GNAThub.NOT_EXECUTED)):
+                    if stats.decision and stats.decision.skip_report:
+                        plugin.info('results already in the database')
+                    else:
+                        LOG.info('%s: collect results', plugin.name)
+                        with stats.phase('report'):
+                            plugin.exec_status = plugin.report()
+                    reported = True
+
+                LOG.info('%s: post execution', plugin.name)
+                with stats.phase('teardown'):
+                    plugin.teardown()
+
+                stats.rows = cls.inserted_rows() - rows
             elapsed = time.time() - start
 
+            if stats.decision is not None:
+                fingerprints.update(
+                    plugin, stats.decision, stats.processes, reported)
+
         if plugin.exec_status == GNAThub.EXEC_SUCCESS:
             plugin.info('completed (in %d seconds)' % elapsed)
         elif plugin.exec_status == GNAThub.EXEC_FAILURE:
@@ -404,6 +1043,175 @@ class PluginRunner(object):
             plugin.info('not executed')
         return elapsed
 
+    def process(self, clazz, writer=None, runners=None):
+        """Instantiate and execute a plugin, reporting any unexpected error.
+
+        With :command:`--profile`, the execution of the plugin is profiled
+        (see :meth:`save_profile`).
+
+        :param type clazz: the plugin type object
+        :param threading.Lock writer: see :meth:`execute`
+        :param threading.Semaphore runners: see :meth:`execute`
+        :return: the plugin instance, or ``None`` if it could not be created,
+            its execution time in seconds, or ``None`` on error, and the
+            statistics of its execution
+        :rtype: (GNAThub.Plugin | None, int | None, PluginStats)
+        """
+        plugin, elapsed, stats = None, None, PluginStats()
+        profiler = None
+        try:
+            # Create a new instance
+            plugin = clazz()
+
+            if GNAThub.profile() and not GNAThub.dry_run():
+                profiler = cProfile.Profile()
+                profiler.enable()
+
+            # Execute the plug-in
+            elapsed = self.execute(
+                plugin, writer, runners, stats, self.fingerprints)
+        except KeyboardInterrupt:
+            raise
+        except Exception as why:
+            LOG.exception('plug-in execution failed')
+            self.error('%s: unexpected error: %s',
+                       plugin.name if plugin else clazz.__name__, why)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self.save_profile(plugin, profiler)
+        return plugin, elapsed, stats
+
+    @classmethod
+    def save_profile(cls, plugin, profiler):
+        """Save the profile of a plugin execution.
+
+        The profile is saved as :file:`profiles/<plugin>.prof` in the GNAThub
+        directory, in the format of :mod:`pstats`.
+
+        :param GNAThub.Plugin plugin: the plugin executed
+        :param cProfile.Profile profiler: the profile of its execution
+        """
+        dest = os.path.join(GNAThub.root(), 'profiles', plugin.name + '.prof')
+        try:
+            if not os.path.isdir(os.path.dirname(dest)):
+                os.makedirs(os.path.dirname(dest))
+            profiler.dump_stats(dest)
+        except (IOError, OSError) as why:
+            LOG.exception('could not write profile %s', dest)
+            cls.error('%s: unexpected error: %s', dest, why)
+        else:
+            LOG.info('%s: profile saved as %s', plugin.name, dest)
+
+    @staticmethod
+    def jobs():
+        """Return the number of processes allowed for the entire run.
+
+        :rtype: int
+        """
+        return GNAThub.jobs() or multiprocessing.cpu_count()
+
+    def execute_all(self):
+        """Execute all plugins, concurrently if allowed.
+
+        This method is a generator, which yields on every plugin executed, in
+        the order of the schedule.
+
+        :return: the plugin instance, its execution time and its statistics
+            (see :meth:`process`)
+        :rtype: collections.Iterable[(GNAThub.Plugin, int, PluginStats)]
+        """
+        analyses = [c for c in self.plugins if not self.is_post_phase(c)]
+        if GNAThub.dry_run() or not self.execute_runners():
+            # There is no tool whose execution could overlap
+            concurrency = threads = 1
+        elif GNAThub.profile():
+            # Only one thread at a time can be profiled
+            concurrency = threads = 1
+        else:
+            concurrency = min(self.jobs(), len(analyses)) or 1
+            threads = concurrency
+            if GNAThub.pipeline():
+                # One more thread to collect the results of a plugin while
+                # the tool of the next one executes, if there is a next one:
+                # at least two threads, even with -j1.
+                threads = max(threads, min(concurrency + 1, len(analyses)))
+
+        if threads > 1:
+            LOG.info('execute %d plugins in %d threads (%d tools at once)',
+                     len(analyses), threads, concurrency)
+            for result in self.execute_concurrently(
+                    analyses, threads, concurrency):
+                yield result
+        else:
+            for clazz in analyses:
+                yield self.process(clazz)
+
+        for clazz in self.plugins:
+            if self.is_post_phase(clazz):
+                yield self.process(clazz)
+
+    def execute_concurrently(self, plugins, threads, concurrency):
+        """Execute plugins in a pool of threads.
+
+        The tools of up to ``concurrency`` plugins execute at once, sharing
+        the ``-j`` budget (see :class:`JobBudget`). The ``report`` and
+        ``teardown`` phases are serialized (see :meth:`execute`).
+
+        This method is a generator, which yields on every plugin executed, in
+        the order of ``plugins``.
+
+        :param list[type] plugins: the plugins to execute
+        :param int threads: the number of threads to use
+        :param int concurrency: the number of tools to execute at once
+        :rtype: collections.Iterable[(GNAThub.Plugin, int, PluginStats)]
+        """
+        pending = queue.Queue()
+        for index, clazz in enumerate(plugins):
+            pending.put((index, clazz))
+
+        results = [None] * len(plugins)
+        completed = threading.Condition()
+        writer = threading.Lock()
+        runners = threading.Semaphore(concurrency)
+        budget = JobBudget(self.jobs(), concurrency)
+
+        def worker():
+            """Execute the pending plugins until there are none left."""
+            while True:
+                try:
+                    index, clazz = pending.get_nowait()
+                except queue.Empty:
+                    return
+                result = None, None, None
+                try:
+                    with budget.assign():
+                        result = self.process(clazz, writer, runners)
+                finally:
+                    with completed:
+                        results[index] = result
+                        completed.notify_all()
+
+        with budget:
+            for _ in range(threads):
+                thread = threading.Thread(target=worker)
+                thread.daemon = True
+                thread.start()
+
+            try:
+                for index in range(len(plugins)):
+                    with completed:
+                        while results[index] is None:
+                            # Wake up regularly for KeyboardInterrupt to be
+                            # delivered.
+                            completed.wait(1)
+                    yield results[index]
+
+            finally:
+                # Do not start any other plugin if interrupted
+                while not pending.empty():
+                    pending.get_nowait()
+
     def mainloop(self):
         """Plugin main loop."""
         LOG.info('registered %d plugins', len(self.plugins))
@@ -418,43 +1226,36 @@ class PluginRunner(object):
         # and dump the list of plugins
         if GNAThub.dry_run_without_project():
             for cls in self.plugins:
-                plugin = cls()
-                self.info('%s plug-in is available', plugin.name)
-                plugin.exec_status = GNAThub.EXEC_SUCCESS
+                self.info('%s plug-in is available', self.plugin_name(cls))
             return
 
         # Execute each plug-in in order
         exec_failure = False
         try:
-            for cls in self.plugins:
-                try:
-                    # Create a new instance
-                    plugin, elapsed = cls(), None
-                    # Execute the plug-in
-                    elapsed = self.execute(plugin)
-                except KeyboardInterrupt:
-                    raise
-                except Exception as why:
-                    LOG.exception('plug-in execution failed')
-                    self.error('%s: unexpected error: %s', plugin.name, why)
-                finally:
-                    if plugin.exec_status != GNAThub.NOT_EXECUTED:
-                        # A plugin could not have been executed depending on
-                        # the command line (--runners-only/--reporters-only).
-                        backlog.append((plugin.name, {
-                            'time': elapsed or 0,
-                            'success': (
-                                plugin.exec_status == GNAThub.EXEC_SUCCESS)
-                        }))
-
-                        # Compute all plugins execution status
-                        exec_failure = (exec_failure or
-                                        (plugin.exec_status ==
-                                         GNAThub.EXEC_FAILURE))
+            for plugin, elapsed, stats in self.execute_all():
+                if (plugin is not None and
+                        plugin.exec_status != GNAThub.NOT_EXECUTED):
+                    # A plugin could not have been executed depending on
+                    # the command line (--runners-only/--reporters-only).
+                    results = {
+                        'time': elapsed or 0,
+                        'success': (
+                            plugin.exec_status == GNAThub.EXEC_SUCCESS)
+                    }
+                    results.update(stats.to_json())
+                    backlog.append((plugin.name, results))
+
+                    # Compute all plugins execution status
+                    exec_failure = (exec_failure or
+                                    (plugin.exec_status ==
+                                     GNAThub.EXEC_FAILURE))
 
         except KeyboardInterrupt:
             self.info(os.linesep + 'Interrupt caught...')
 
+        if self.fingerprints is not None and not GNAThub.dry_run():
+            self.fingerprints.save()
+
         # Write results to file
         fname = os.path.join(GNAThub.root(), 'gnathub.backlog')
         try:
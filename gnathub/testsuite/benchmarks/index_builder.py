@@ -0,0 +1,124 @@
+#! /usr/bin/env python
+
+"""Benchmark the aggregation of messages by the html-report index builder.
+
+Feed :class:`_report.IndexBuilder` with synthetic sources holding an
+increasing number of messages, spread over a large number of rules, and
+display the time spent per message. The index phase is expected to scale
+linearly with the number of messages, ie. the time per message should stay
+roughly constant from one row to the next.
+
+This benchmark does not need the GNAThub driver: it runs with any Python
+interpreter able to import Pygments, eg.::
+
+    $ python testsuite/benchmarks/index_builder.py
+"""
+
+import argparse
+import collections
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.realpath(__file__))))
+sys.path[:0] = [os.path.join(ROOT, 'src', 'lib'),
+                os.path.join(ROOT, 'share', 'gnathub', 'core')]
+
+import GNAThub      # noqa: E402
+
+# The Ada implementation of GNAThub.Project is not available outside of the
+# GNAThub driver: the index builder only needs the list of sources.
+GNAThub.Project.source_files = staticmethod(lambda: {})
+
+from _report import IndexBuilder    # noqa: E402
+
+Tool = collections.namedtuple('Tool', ('id', 'name'))
+Rule = collections.namedtuple('Rule', ('id', 'name', 'tool_id'))
+Property = collections.namedtuple('Property', ('id', 'name'))
+
+
+class Message(collections.namedtuple(
+        'Message', ('id', 'line', 'ranking', 'properties'))):
+    """A message, as returned by the GNAThub API."""
+
+    def get_properties(self):
+        return self.properties
+
+
+class Source(object):
+    """The subset of :class:`_report.SourceBuilder` used by the index."""
+
+    def __init__(self, index, messages):
+        self.project = 'benchmark'
+        self.filename = 'source_{}.adb'.format(index)
+        self.source_dir = 'src'
+        self.path = os.path.join(self.source_dir, self.filename)
+        self.file_coverage = None
+        self.messages = collections.defaultdict(list)
+        self.message_count = collections.defaultdict(int)
+        for message, rule, tool in messages:
+            self.messages[message.line].append((message, rule, tool))
+            self.message_count[tool.id] += 1
+
+    def sources_to_json(self, project_name):
+        return {'filename': self.filename, 'project_name': project_name}
+
+
+def make_sources(message_count, rule_count, messages_per_source=100):
+    """Generate synthetic sources.
+
+    :param int message_count: the total number of messages
+    :param int rule_count: the number of distinct rules
+    :param int messages_per_source: the number of messages of each source
+    :rtype: list[Source]
+    """
+    tools = [Tool(1, 'gnatcheck'), Tool(2, 'codepeer')]
+    props = [Property(1, 'unproved'), Property(2, 'new')]
+    rules = [Rule(i, 'rule_{}'.format(i), tools[i % 2].id)
+             for i in range(rule_count)]
+    messages = [
+        (Message(i, i % messages_per_source + 1, i % 5 + 1, props[:i % 3]),
+         rules[i % rule_count], tools[i % rule_count % 2])
+        for i in range(message_count)]
+    return [
+        Source(i, messages[start:start + messages_per_source])
+        for i, start in enumerate(
+            range(0, message_count, messages_per_source))]
+
+
+def run(message_count, rule_count):
+    """Time the indexing of ``message_count`` messages.
+
+    :return: the elapsed time in seconds
+    :rtype: float
+    """
+    sources = make_sources(message_count, rule_count)
+    index = IndexBuilder()
+    start = time.time()
+    for source in sources:
+        index.save_source(source)
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rules', type=int, default=5000,
+                        help='number of distinct rules (default: 5000)')
+    parser.add_argument('--messages', type=int, default=25000,
+                        help='initial number of messages (default: 25000)')
+    parser.add_argument('--steps', type=int, default=4,
+                        help='number of times the messages count is doubled')
+    args = parser.parse_args()
+
+    print('{:>10} {:>10} {:>16}'.format('messages', 'time (s)', 'us/message'))
+    message_count = args.messages
+    for _ in range(args.steps):
+        elapsed = run(message_count, args.rules)
+        print('{:>10} {:>10.3f} {:>16.2f}'.format(
+            message_count, elapsed, elapsed * 1e6 / message_count))
+        message_count *= 2
+
+
+if __name__ == '__main__':
+    main()
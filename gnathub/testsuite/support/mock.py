@@ -236,6 +236,18 @@ class GNAThub(object):
         if kwargs.get('reporters_only', False):
             argv.append('--reporters-only')
 
+        if kwargs.get('jobs', None):
+            argv.append('-j%d' % kwargs['jobs'])
+
+        if kwargs.get('pipeline', False):
+            argv.append('--pipeline')
+
+        if kwargs.get('profile', False):
+            argv.append('--profile')
+
+        if kwargs.get('skip_unchanged', False):
+            argv.append('--skip-unchanged')
+
         if kwargs.get('scenario_vars', None):
             scenario = kwargs['scenario_vars']
             assert isinstance(scenario, dict), 'invalid "scenario_vars" arg'
@@ -37,6 +37,9 @@ assertFalse(GNAThub.verbose())
 assertFalse(GNAThub.dry_run())
 assertTrue(GNAThub.runners_only())
 assertFalse(GNAThub.reporters_only())
+assertFalse(GNAThub.pipeline())
+assertFalse(GNAThub.profile())
+assertFalse(GNAThub.skip_unchanged())
 
 assertTrue(os.path.isfile(GNAThub.database()))
 assertEqual(
@@ -0,0 +1,43 @@
+"""Check that messages listed in bulk match the per-resource API."""
+
+import GNAThub
+
+from support.asserts import assertEqual, assertIn, assertNotEmpty
+
+
+base = GNAThub.Project.source_file('simple.adb')
+resource = GNAThub.Resource.get(base)
+tool = GNAThub.Tool('test-tool')
+rule = GNAThub.Rule('test-rule', 'test-rule-name', GNAThub.RULE_KIND, tool)
+prop = GNAThub.Property('test-prop', 'test-prop-name')
+
+resource.add_messages([
+    (GNAThub.Message(rule, 'test message 0'), 1, 1, 2),
+    (GNAThub.Message(rule, 'test message 1', properties=[prop]), 2, 3, 4)
+])
+
+bulk = GNAThub.Resource.list_all_messages()
+assertIn(base, bulk)
+
+for name, messages in bulk.items():
+    expected = GNAThub.Resource.get(name).list_messages()
+    assertEqual(len(expected), len(messages))
+
+    for reference, (message, msg_rule, msg_tool) in zip(expected, messages):
+        for attr in ('id', 'rule_id', 'data', 'ranking', 'line',
+                     'col_begin', 'col_end'):
+            assertEqual(getattr(reference, attr), getattr(message, attr))
+        assertEqual(message.rule_id, msg_rule.id)
+        assertEqual(msg_rule.tool_id, msg_tool.id)
+        assertEqual([p.id for p in reference.get_properties()],
+                    [p.id for p in message.get_properties()])
+
+assertNotEmpty(bulk[base][-1][0].get_properties())
+assertEqual(prop.identifier, bulk[base][-1][0].get_properties()[0].identifier)
+assertEqual(tool.name, bulk[base][-1][2].name)
+
+# The bounded-memory reader lists the same messages
+with GNAThub.MessageReader() as reader:
+    for name, messages in bulk.items():
+        assertEqual(messages, reader.messages(name))
+    assertEqual([], reader.messages('no-such-resource'))
@@ -0,0 +1,78 @@
+"""Check that filtered pages of messages match the bulk API."""
+
+import os
+import sqlite3
+
+import GNAThub
+
+from support.asserts import assertEqual, assertIn
+
+
+base = GNAThub.Project.source_file('simple.adb')
+resource = GNAThub.Resource.get(base)
+tool = GNAThub.Tool('test-tool')
+rule = GNAThub.Rule('test-rule', 'test-rule-name', GNAThub.RULE_KIND, tool)
+prop = GNAThub.Property('test-prop', 'test-prop-name')
+
+resource.add_messages([
+    (GNAThub.Message(rule, 'test message 0'), 1, 1, 2),
+    (GNAThub.Message(rule, 'test message 1', properties=[prop]), 2, 3, 4),
+    (GNAThub.Message(rule, 'test message 2',
+                     ranking=GNAThub.RANKING_HIGH), 3, 5, 6)
+])
+
+bulk = GNAThub.Resource.list_all_messages()
+everything = [(name, message.id)
+              for name, messages in bulk.items()
+              for message, _, _ in messages]
+
+# Without filter, all messages are listed
+total, page = GNAThub.query_messages()
+assertEqual(len(everything), total)
+assertEqual(sorted(everything),
+            sorted((name, message.id) for name, message, _, _ in page))
+
+# Filters are combined
+total, page = GNAThub.query_messages(tools=['test-tool'])
+assertEqual(3, total)
+assertEqual(['test message 0', 'test message 1', 'test message 2'],
+            [message.data for _, message, _, _ in page])
+
+total, page = GNAThub.query_messages(
+    tools=['test-tool'], files=[os.path.basename(base)],
+    rankings=[GNAThub.RANKING_HIGH])
+assertEqual(1, total)
+assertEqual('test message 2', page[0][1].data)
+
+total, page = GNAThub.query_messages(properties=['test-prop-name'])
+assertEqual(1, total)
+assertEqual(base, page[0][0])
+assertIn(prop.identifier, [p.identifier for p in page[0][1].properties])
+
+total, page = GNAThub.query_messages(rules=['no-such-rule'])
+assertEqual((0, []), (total, page))
+
+# Pages are consistent with the whole list
+total, page = GNAThub.query_messages(tools=['test-tool'], offset=1, limit=1)
+assertEqual(3, total)
+assertEqual(['test message 1'], [message.data for _, message, _, _ in page])
+
+# The queries are indexed
+connection = sqlite3.connect(GNAThub.database())
+indexes = [name for name, in connection.execute(
+    "SELECT name FROM sqlite_master WHERE type = 'index'")]
+connection.close()
+for index in ('gnathub_rm_resource', 'gnathub_rules_tool',
+              'gnathub_mp_message'):
+    assertIn(index, indexes)
+
+# The total is counted again once the database changed
+resource.add_messages([(GNAThub.Message(rule, 'test message 3'), 4, 1, 2)])
+total, page = GNAThub.query_messages(tools=['test-tool'], offset=1, limit=1)
+assertEqual(4, total)
+
+# Names are matched regardless of their case
+total, page = GNAThub.query_messages(
+    tools=['TEST-TOOL'], rules=['Test-Rule'], files=[base])
+assertEqual(4, total)
+assertEqual('test message 3', page[-1][1].data)
@@ -16,3 +16,9 @@ class TestSimpleExample(TestCase):
 
     def testCreateMessageWithProperty(self):
         self.gnathub.run(script='create-message-with-property.py')
+
+    def testListAllMessages(self):
+        self.gnathub.run(script='list-all-messages.py')
+
+    def testQueryMessages(self):
+        self.gnathub.run(script='query-messages.py')
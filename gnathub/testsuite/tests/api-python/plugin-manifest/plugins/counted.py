@@ -0,0 +1,14 @@
+"""A plug-in recording each load of its script in counted.loads."""
+
+import os
+
+import GNAThub
+
+from GNAThub import Plugin
+
+with open(os.path.join(GNAThub.root(), 'counted.loads'), 'a') as fd:
+    fd.write('loaded\n')
+
+
+class Counted(Plugin):
+    pass
@@ -0,0 +1,10 @@
+"""A plug-in that does nothing."""
+
+import GNAThub
+
+from GNAThub import Plugin, Reporter
+
+
+class Noop(Plugin, Reporter):
+    def report(self):
+        return GNAThub.EXEC_SUCCESS
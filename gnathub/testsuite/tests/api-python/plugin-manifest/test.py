@@ -0,0 +1,80 @@
+"""Check that the scripts are only loaded again when they changed."""
+
+import json
+import os.path
+import shutil
+
+from unittest import TestCase
+from support.mock import GNAThub, Project
+
+
+class TestSimpleExample(TestCase):
+    def setUp(self):
+        self.longMessage = True
+
+    def testPluginManifest(self):
+        PROJECT = Project.simple()
+        GNATHUB_DIR = os.path.join(PROJECT.install_dir, 'obj', 'gnathub')
+        MANIFEST = os.path.join(GNATHUB_DIR, 'plugins.manifest')
+        LOADS = os.path.join(GNATHUB_DIR, 'counted.loads')
+
+        # The scripts are modified below: use a copy of them
+        repository = os.path.join(PROJECT.install_dir, 'plugins')
+        shutil.copytree(os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), 'plugins'), repository)
+        script = os.path.join(repository, 'counted.py')
+
+        gpr = os.path.join(PROJECT.install_dir, 'simple.gpr')
+        with open(gpr, 'r') as fd:
+            content = fd.read()
+        with open(gpr, 'w') as fd:
+            fd.write(content.replace('end Simple;', '\n'.join([
+                'package Dashboard is',
+                '   for Local_Repository use "{}";'.format(repository),
+                'end Dashboard;', '', 'end Simple;'])))
+
+        def loads():
+            with open(LOADS, 'r') as fd:
+                return len(fd.readlines())
+
+        def entry():
+            with open(MANIFEST, 'r') as fd:
+                return json.load(fd)['scripts'][script]
+
+        def stamp():
+            info = os.stat(script)
+            return [info.st_mtime_ns, info.st_size]
+
+        # 1st run: the scripts are loaded, and their plug-ins recorded
+        gnathub = GNAThub(PROJECT, plugins=['noop'])
+        self.assertEqual(loads(), 1)
+        self.assertEqual(entry(), {
+            'stamp': stamp(), 'plugins': [['Counted', 'counted']]})
+        manifest_mtime = os.stat(MANIFEST).st_mtime_ns
+
+        # 2nd run: the manifest is reused, and not written again
+        gnathub.run(plugins=['noop'])
+        self.assertEqual(loads(), 1, 'the script should not be loaded')
+        self.assertEqual(os.stat(MANIFEST).st_mtime_ns, manifest_mtime)
+
+        # 3rd run: the modification time of the script changed
+        mtime = stamp()[0] + 10 ** 9
+        os.utime(script, ns=(mtime, mtime))
+        gnathub.run(plugins=['noop'])
+        self.assertEqual(loads(), 2, 'the script should be loaded again')
+        self.assertEqual(entry()['stamp'], [mtime, stamp()[1]])
+
+        gnathub.run(plugins=['noop'])
+        self.assertEqual(loads(), 2)
+
+        # 4th run: the size of the script changed, not its modification time
+        with open(script, 'a') as fd:
+            fd.write('# Modified\n')
+        os.utime(script, ns=(mtime, mtime))
+        gnathub.run(plugins=['noop'])
+        self.assertEqual(loads(), 3, 'the script should be loaded again')
+        self.assertEqual(entry()['stamp'], stamp())
+
+        # The selected plug-ins are still executed
+        with open(os.path.join(GNATHUB_DIR, 'gnathub.backlog'), 'r') as fd:
+            self.assertEqual([name for name, _ in json.load(fd)], ['noop'])
@@ -0,0 +1,71 @@
+"""Fake plug-ins recording the execution of their phases.
+
+Each phase is recorded in the events.log file of the GNAThub directory, as
+a JSON-encoded list: the name of the plug-in, the phase, the start and end
+times of the phase, and the value of GNAThub.jobs() during the phase.
+"""
+
+import json
+import os
+import threading
+import time
+
+import GNAThub
+
+from GNAThub import Plugin, Reporter, Runner
+
+_LOCK = threading.Lock()
+
+
+def _record(plugin, phase, duration=0, jobs=None):
+    start = time.time()
+    time.sleep(duration)
+    event = [plugin.name, phase, start, time.time(),
+             GNAThub.jobs() if jobs is None else jobs]
+    with _LOCK:
+        with open(os.path.join(GNAThub.root(), 'events.log'), 'a') as fd:
+            fd.write(json.dumps(event) + '\n')
+
+
+def _jobs_of_other_thread():
+    """Return GNAThub.jobs() as seen by a thread the plug-in starts."""
+    jobs = []
+    thread = threading.Thread(target=lambda: jobs.append(GNAThub.jobs()))
+    thread.start()
+    thread.join()
+    return jobs[0]
+
+
+def _plugin(class_name, name, duration):
+    """Create a plug-in whose tool executes for ``duration`` seconds."""
+
+    def setup(self):
+        Plugin.setup(self)
+        _record(self, 'setup')
+
+    def run(self):
+        _record(self, 'run', duration)
+        _record(self, 'run-thread', jobs=_jobs_of_other_thread())
+        return GNAThub.EXEC_SUCCESS
+
+    def report(self):
+        _record(self, 'report', 0.2)
+        return GNAThub.EXEC_SUCCESS
+
+    def teardown(self):
+        _record(self, 'teardown', 0.1)
+        Plugin.teardown(self)
+
+    return type(Plugin)(class_name, (Plugin, Runner, Reporter), {
+        'name': property(lambda self: name),
+        'setup': setup,
+        'run': run,
+        'report': report,
+        'teardown': teardown
+    })
+
+
+# The first plug-in completes last
+FakeSlow = _plugin('FakeSlow', 'fake-slow', 1.5)
+FakeFast = _plugin('FakeFast', 'fake-fast', 0.1)
+FakeMedium = _plugin('FakeMedium', 'fake-medium', 0.5)
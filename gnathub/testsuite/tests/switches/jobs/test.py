@@ -0,0 +1,69 @@
+"""Check the concurrent execution of the plug-ins with -j."""
+
+import json
+import os.path
+
+from collections import defaultdict
+from unittest import TestCase
+from support.mock import GNAThub, Project
+
+# The fake plug-ins of the plugins directory, in the order they are declared
+PLUGINS = ['fake-slow', 'fake-fast', 'fake-medium']
+
+
+class TestSimpleExample(TestCase):
+    def setUp(self):
+        self.longMessage = True
+
+    def testJobsSwitch(self):
+        PROJECT = Project.simple()
+        GNATHUB_DIR = os.path.join(PROJECT.install_dir, 'obj', 'gnathub')
+        REPOSITORY = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), 'plugins')
+
+        gpr = os.path.join(PROJECT.install_dir, 'simple.gpr')
+        with open(gpr, 'r') as fd:
+            content = fd.read()
+        with open(gpr, 'w') as fd:
+            fd.write(content.replace('end Simple;', '\n'.join([
+                'package Dashboard is',
+                '   for Local_Repository use "{}";'.format(REPOSITORY),
+                'end Dashboard;', '', 'end Simple;'])))
+
+        GNAThub(PROJECT, plugins=PLUGINS, jobs=2)
+
+        # Phase name -> plug-in name -> (start, end, jobs)
+        events = defaultdict(dict)
+        with open(os.path.join(GNATHUB_DIR, 'events.log'), 'r') as fd:
+            for line in fd:
+                name, phase, start, end, jobs = json.loads(line)
+                events[phase][name] = (start, end, jobs)
+        for phase in ('run', 'run-thread', 'report', 'teardown'):
+            self.assertEqual(sorted(events[phase]), sorted(PLUGINS), phase)
+
+        # The tools of two plug-ins execute at once
+        slow, fast = events['run']['fake-slow'], events['run']['fake-fast']
+        self.assertLess(fast[0], slow[1], 'tools should overlap')
+        self.assertLess(slow[0], fast[1], 'tools should overlap')
+
+        # The results are collected one plug-in at a time
+        collect = sorted(
+            (events['report'][name][0], events['teardown'][name][1])
+            for name in PLUGINS)
+        for (_, end), (start, _) in zip(collect, collect[1:]):
+            self.assertLessEqual(end, start, 'results collection overlap')
+
+        # The plug-ins are reported in order, though the first one completes
+        # last
+        self.assertLess(events['teardown']['fake-fast'][1],
+                        events['report']['fake-slow'][0])
+        with open(os.path.join(GNATHUB_DIR, 'gnathub.backlog'), 'r') as fd:
+            backlog = json.load(fd)
+        self.assertEqual([name for name, _ in backlog], PLUGINS)
+
+        # Each plug-in gets its share of the -j budget; the other threads
+        # still see the whole budget
+        for name in PLUGINS:
+            self.assertEqual(events['run'][name][2], 1, name)
+            self.assertEqual(events['report'][name][2], 1, name)
+            self.assertEqual(events['run-thread'][name][2], 2, name)
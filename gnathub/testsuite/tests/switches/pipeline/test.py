@@ -0,0 +1,44 @@
+"""Check that the tools and the results collection overlap with --pipeline."""
+
+import json
+import os.path
+
+from unittest import TestCase
+from support.mock import GNAThub, Project
+
+
+def intervals(backlog):
+    """Return the time interval of the execution of each plug-in.
+
+    :param str backlog: the path to gnathub.backlog
+    :rtype: dict[str, (float, float)]
+    """
+    with open(backlog, 'r') as fd:
+        plugins = json.load(fd)
+    return {
+        name: (min(phase['start'] for phase in results['phases'].values()),
+               max(phase['start'] + phase['time']
+                   for phase in results['phases'].values()))
+        for name, results in plugins}
+
+
+class TestSimpleExample(TestCase):
+    def setUp(self):
+        self.longMessage = True
+
+    def testPipelineSwitch(self):
+        PROJECT = Project.simple()
+        PLUGINS = ['gnatmetric', 'gnatcheck']
+        BACKLOG = os.path.join(
+            PROJECT.install_dir, 'obj', 'gnathub', 'gnathub.backlog')
+
+        # Without --pipeline, the plug-ins are executed one after the other
+        gnathub = GNAThub(PROJECT, plugins=PLUGINS, jobs=1)
+        (start1, end1), (start2, end2) = sorted(intervals(BACKLOG).values())
+        self.assertLessEqual(end1, start2, 'plug-ins should not overlap')
+
+        # With --pipeline, the second plug-in starts before the first one
+        # completed, even with -j1
+        gnathub.run(plugins=PLUGINS, jobs=1, pipeline=True)
+        (start1, end1), (start2, end2) = sorted(intervals(BACKLOG).values())
+        self.assertLess(start2, end1, 'plug-ins should overlap')
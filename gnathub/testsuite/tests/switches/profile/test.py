@@ -0,0 +1,43 @@
+"""Check that plug-ins are profiled with --profile."""
+
+import json
+import os.path
+import pstats
+
+from unittest import TestCase
+from support.mock import GNAThub, Project
+
+
+class TestSimpleExample(TestCase):
+    def setUp(self):
+        self.longMessage = True
+
+    def testProfileSwitch(self):
+        PROJECT = Project.simple()
+        PLUGINS = ['gnatmetric']
+        GNATHUB_DIR = os.path.join(PROJECT.install_dir, 'obj', 'gnathub')
+        PROFILE = os.path.join(GNATHUB_DIR, 'profiles', 'gnatmetric.prof')
+        BACKLOG = os.path.join(GNATHUB_DIR, 'gnathub.backlog')
+
+        # Without --profile, no profile is saved
+        gnathub = GNAThub(PROJECT, plugins=PLUGINS)
+        assert not os.path.exists(PROFILE), 'Profile should not exist'
+
+        # The statistics of the plug-in are recorded in any case
+        with open(BACKLOG, 'r') as fd:
+            (name, results), = json.load(fd)
+        self.assertEqual(name, 'gnatmetric')
+        self.assertEqual(
+            sorted(results['phases']), ['report', 'run', 'setup', 'teardown'])
+        self.assertGreaterEqual(results['processes']['count'], 1,
+                                'gnatmetric should have been spawned')
+        self.assertGreater(results['rows_estimate'], 0,
+                           'metrics should have been inserted')
+
+        # With --profile, the profile can be loaded by pstats
+        gnathub.run(plugins=PLUGINS, profile=True)
+        assert os.path.isfile(PROFILE), 'Profile should have been saved'
+        stats = pstats.Stats(PROFILE)
+        self.assertTrue(
+            any(func[2] == 'report' for func in stats.stats),
+            'The report phase of the plug-in should have been profiled')
@@ -0,0 +1,62 @@
+"""Check that the tools are only executed again when their inputs changed."""
+
+import json
+import os.path
+import shutil
+
+from unittest import TestCase
+from support.mock import GNAThub, Project
+
+
+class TestSimpleExample(TestCase):
+    def setUp(self):
+        self.longMessage = True
+
+    def testSkipUnchangedSwitch(self):
+        PROJECT = Project.simple()
+        PLUGINS = ['gnatmetric']
+        GNATHUB_DIR = os.path.join(PROJECT.install_dir, 'obj', 'gnathub')
+        BACKLOG = os.path.join(GNATHUB_DIR, 'gnathub.backlog')
+        FINGERPRINTS = os.path.join(GNATHUB_DIR, 'fingerprints.json')
+
+        def decision():
+            with open(BACKLOG, 'r') as fd:
+                (name, results), = json.load(fd)
+            self.assertEqual(name, 'gnatmetric')
+            return (results['fingerprint']['decision'],
+                    results['fingerprint']['reason'])
+
+        # 1st run: the tool is executed, and recorded as an input
+        gnathub = GNAThub(PROJECT, plugins=PLUGINS, skip_unchanged=True)
+        self.assertEqual(decision()[0], 'execute')
+        with open(FINGERPRINTS, 'r') as fd:
+            tools = json.load(fd)['plugins']['gnatmetric']['tools']
+        self.assertEqual(len(tools), 1, 'gnatmetric should be recorded')
+
+        # 2nd run: nothing changed, the tool is not executed
+        gnathub.run(plugins=PLUGINS, skip_unchanged=True)
+        self.assertEqual(decision(), ('skip run', 'inputs unchanged'))
+
+        # 3rd run: a source changed
+        with open(os.path.join(PROJECT.install_dir, 'src', 'f.adb'), 'a') as fd:
+            fd.write('--  Modified\n')
+        gnathub.run(plugins=PLUGINS, skip_unchanged=True)
+        self.assertEqual(decision(), ('execute', 'changed: sources'))
+
+        gnathub.run(plugins=PLUGINS, skip_unchanged=True)
+        self.assertEqual(decision()[0], 'skip run')
+
+        # 4th run: another executable of the tool is found first on the PATH
+        tool = shutil.which(tools[0])
+        wrapper = os.path.join(
+            PROJECT.install_dir, 'bin', os.path.basename(tool))
+        os.makedirs(os.path.dirname(wrapper), exist_ok=True)
+        with open(wrapper, 'w') as fd:
+            fd.write('#! /bin/sh\nexec "{}" "$@"\n'.format(tool))
+        os.chmod(wrapper, 0o755)
+        gnathub.run(plugins=PLUGINS, skip_unchanged=True)
+        self.assertEqual(decision(), ('execute', 'changed: tools'))
+
+        # The new executable is recorded in turn
+        gnathub.run(plugins=PLUGINS, skip_unchanged=True)
+        self.assertEqual(decision()[0], 'skip run')
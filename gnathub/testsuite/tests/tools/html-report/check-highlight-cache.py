@@ -0,0 +1,80 @@
+"""Check the eviction and the error handling of the highlight cache."""
+
+import os
+import sys
+import tempfile
+
+import GNAThub
+
+from support.asserts import (
+    assertEqual, assertFalse, assertIsNone, assertIsNotNone, assertTrue)
+
+sys.path.insert(0, GNAThub.repositories()['system'])
+
+from _report import HighlightCache  # noqa: E402
+
+
+def entries(cache):
+    """Return the names of the entries, not of the recorded sizes."""
+    return sorted(
+        name for root, _, files in os.walk(cache.path)
+        if root != cache.path for name in files)
+
+
+cache = HighlightCache()
+KEYS = ['{:040x}'.format(n) for n in range(3)]
+
+# The cache is disabled until opened
+cache.put(KEYS[0], ['<span>x</span>'])
+assertIsNone(cache.get(KEYS[0]))
+
+# Each entry is about 100 bytes: only two of them fit
+cache.open(tempfile.mkdtemp(), max_size=250)
+for mtime, key in enumerate(KEYS, start=1):
+    cache.put(key, ['x' * 100])
+    os.utime(cache._entry(key), (mtime, mtime))
+assertEqual(3, len(entries(cache)))
+
+# Reading an entry makes it the most recently used one
+assertEqual(['x' * 100], cache.get(KEYS[0]))
+cache.evict()
+assertIsNotNone(cache.get(KEYS[0]))
+assertIsNone(cache.get(KEYS[1]))
+assertIsNotNone(cache.get(KEYS[2]))
+
+
+def recorded_size(cache):
+    with open(os.path.join(cache.path, cache.SIZE_FILE), 'r') as fd:
+        return int(fd.read())
+
+
+ENTRY_SIZE = os.path.getsize(cache._entry(KEYS[0]))
+assertEqual(2 * ENTRY_SIZE, recorded_size(cache))
+
+# The cache is not walked again while it is small enough: a file saved
+# behind its back is left alone
+stray = os.path.join(os.path.dirname(cache._entry(KEYS[0])), 'stray.json')
+with open(stray, 'w') as fd:
+    fd.write('x' * 100)
+os.utime(stray, (0, 0))
+cache.evict()
+assertTrue(os.path.exists(stray))
+assertEqual(2 * ENTRY_SIZE, recorded_size(cache))
+
+# Until the entries saved since make it too large
+KEYS.append('{:040x}'.format(len(KEYS)))
+cache.put(KEYS[-1], ['x' * 100])
+for mtime, key in enumerate([KEYS[0], KEYS[2], KEYS[3]], start=10):
+    os.utime(cache._entry(key), (mtime, mtime))
+cache.evict()
+assertFalse(os.path.exists(stray))
+assertFalse(os.path.exists(cache._entry(KEYS[0])))
+assertTrue(os.path.exists(cache._entry(KEYS[2])))
+assertTrue(os.path.exists(cache._entry(KEYS[3])))
+assertEqual(2 * ENTRY_SIZE, recorded_size(cache))
+
+# An entry that cannot be saved leaves no temporary file behind
+before = entries(cache)
+cache.put('f' * 40, [object()])
+assertEqual(before, entries(cache))
+assertFalse(os.path.exists(cache._entry('f' * 40)))
@@ -0,0 +1,59 @@
+"""Check the resolution of the Pygments lexer of each source."""
+
+import logging
+import sys
+
+import GNAThub
+
+from support.asserts import (
+    assertEqual, assertIn, assertIs, assertIsNotNone, assertNotIn)
+
+sys.path.insert(0, GNAThub.repositories()['system'])
+
+from _report import LexerCache  # noqa: E402
+
+log = logging.getLogger('check-lexers')
+
+CMAKE = 'cmake_minimum_required(VERSION 3.0)\nproject(simple C)\n'
+
+
+def lexer_name(cache, path, content=''):
+    return cache.get(path, content, log).name
+
+
+# The source suffixes of the project are seeded
+cache = LexerCache()
+cache.seed_from_project()
+for suffix in GNAThub.Project.source_suffixes('Ada'):
+    assertEqual('Ada', cache.seeded[suffix].name)
+assertEqual('Ada', lexer_name(cache, '/src/simple.adb'))
+
+# Suffixes shared by several languages are not, and the longest suffixes
+# are checked first
+cache = LexerCache()
+cache.seed_languages({
+    'ada': ['.ada', '.1.ada'],
+    'c': ['.c', '.h'],
+    'cpp': ['.cc', '.h']
+})
+assertEqual(['.1.ada', '.ada', '.cc', '.c'], list(cache.seeded))
+assertNotIn('.h', cache.seeded)
+assertEqual('C', lexer_name(cache, '/src/f.c'))
+assertEqual('C++', lexer_name(cache, '/src/f.cc'))
+assertIsNotNone(cache.get('/src/f.h', 'int f (void);', log))
+
+# The lexer of a suffix is resolved once, and shared by its files...
+lexer = cache.get('/src/notes.txt', 'notes', log)
+assertEqual('Text only', lexer.name)
+assertIs(lexer, cache.get('/src/other.txt', 'other', log))
+assertIn('.txt', cache.lexers)
+
+# ... unless a file name matches a more specific pattern, whatever the
+# file of that suffix seen first
+for path in ('/src/CMakeLists.txt', '/build/CMakeLists.txt'):
+    assertEqual('CMake', lexer_name(cache, path, CMAKE))
+assertIs(lexer, cache.get('/src/more.txt', 'more', log))
+
+cache = LexerCache()
+assertEqual('CMake', lexer_name(cache, '/src/CMakeLists.txt', CMAKE))
+assertEqual('Text only', lexer_name(cache, '/src/notes.txt'))
@@ -0,0 +1,118 @@
+"""Check the split of the message index in shards."""
+
+import json
+import os
+import sys
+import tempfile
+
+import GNAThub
+
+from support.asserts import assertEqual, assertTrue
+
+sys.path.insert(0, GNAThub.repositories()['system'])
+
+from _report import IndexBuilder, _stream_json  # noqa: E402
+
+# (project, source directory, message count) of each source, in the order
+# they are added to the index. Sources of a directory are not contiguous.
+SOURCES = [
+    ('simple', '/src/a', 2),
+    ('simple', '/src/b', 1),
+    ('simple', '/src/a', 3),
+    ('simple', '/src/a', 0),
+    ('simple', '/src/a', 9),
+    ('other', '/src/a', 1),
+    ('simple', '/src/b', 4),
+    ('simple', '/src/a', 1),
+]
+
+# (project, source directory, message count of each source) of each shard
+EXPECTED_SHARDS = [
+    ('simple', '/src/a', [2, 3, 0]),
+    ('simple', '/src/a', [9]),
+    ('simple', '/src/a', [1]),
+    ('simple', '/src/b', [1, 4]),
+    ('other', '/src/a', [1]),
+]
+
+
+def encode_source(no, project, source_dir, count):
+    """Mimic SourceBuilder.sources_to_json."""
+    filename = 'f{}.adb'.format(no)
+    return {
+        'projectName': project,
+        'filename': filename,
+        'source_dir': source_dir,
+        'full_path': os.path.join(source_dir, filename),
+        'messages': [{'line': line} for line in range(count)] or None,
+        'coverage': None,
+        'message_count': {'1': count, '2': 1} if count else {},
+        '_total_message_count': count
+    }
+
+
+def load(path):
+    with open(path, 'r') as fd:
+        return json.load(fd)
+
+
+for spill in (False, True):
+    index = IndexBuilder(spill)
+    index.SHARD_MESSAGE_COUNT = 5
+    for no, source in enumerate(SOURCES):
+        encoded = encode_source(no, *source)
+        index.sources.append(encoded)
+        for tool_id, count in encoded['message_count'].items():
+            index.message_count[tool_id] += count
+
+    output_dir = tempfile.mkdtemp()
+    shard_dir = os.path.join(output_dir, 'messages')
+    os.makedirs(shard_dir)
+    index.message_to_json(os.path.join(output_dir, 'message.json'), shard_dir)
+
+    # The index only lists the shards, with their message counts
+    manifest = load(os.path.join(output_dir, 'message.json'))
+    assertEqual(sorted(['_total_message_count', 'shards']), sorted(manifest))
+    assertEqual(21 + 7, manifest['_total_message_count'])
+    assertEqual(len(EXPECTED_SHARDS), len(manifest['shards']))
+    assertEqual(len(EXPECTED_SHARDS), len(os.listdir(shard_dir)))
+
+    sources = []
+    for shard, (project, source_dir, counts) in zip(
+            manifest['shards'], EXPECTED_SHARDS):
+        assertEqual(project, shard['project'])
+        assertEqual(source_dir, shard['source_dir'])
+        assertEqual(len(counts), shard['source_count'])
+        assertEqual(
+            {'1': sum(counts), '2': len([c for c in counts if c])},
+            shard['message_count'])
+        assertEqual(sum(shard['message_count'].values()),
+                    shard['_total_message_count'])
+
+        # Shards are relative to the index, and use the former format of
+        # the index
+        assertTrue(shard['file'].startswith('messages/'))
+        content = load(os.path.join(output_dir, *shard['file'].split('/')))
+        assertEqual(['sources'], list(content))
+        assertEqual(counts, [
+            source['_total_message_count'] for source in content['sources']])
+        for source in content['sources']:
+            assertEqual((project, source_dir),
+                        (source['projectName'], source['source_dir']))
+        sources.extend(content['sources'])
+
+    # Put back together, the shards hold the former single-file index, with
+    # the sources grouped by source directory
+    single = os.path.join(output_dir, 'single.json')
+    _stream_json(single, {'sources': iter(index.sources)})
+    expected = load(single)['sources']
+    groups = []
+    for source in expected:
+        if (source['projectName'], source['source_dir']) not in groups:
+            groups.append((source['projectName'], source['source_dir']))
+    assertEqual(sorted(expected, key=lambda source: (
+        groups.index((source['projectName'], source['source_dir'])),
+        source['filename'])), sources)
+    assertEqual(list(index.sources.iter_by_source_dir()), sources)
+
+    index.sources.close()
@@ -0,0 +1,172 @@
+"""Check that the HTML report only saves again the sources that changed."""
+
+import json
+import os
+import re
+
+from shutil import rmtree
+from unittest import TestCase
+from support.mock import GNAThub, Project
+
+PLUGINS = ['gnatmetric', 'html-report']
+SOURCES = ['f.adb.json', 'f.ads.json', 'simple.adb.json']
+
+# The modification time given to the saved sources before a run, so that the
+# sources saved again by the run can be told from the skipped ones.
+OLD_MTIME = 1000000000
+
+
+class TestSimpleExample(TestCase):
+    def setUp(self):
+        self.longMessage = True
+        self.project = Project.simple()
+        self.report_dir = os.path.join(
+            self.project.install_dir, 'obj', 'gnathub', 'html-report')
+        self.src_dir = os.path.join(self.report_dir, 'data', 'src')
+
+    def sources(self):
+        """Return the content of each saved source.
+
+        Also give all sources an old modification time, see
+        :meth:`saved_again`.
+
+        :rtype: dict[str, bytes]
+        """
+        contents = {}
+        for name in sorted(os.listdir(self.src_dir)):
+            path = os.path.join(self.src_dir, name)
+            with open(path, 'rb') as fd:
+                contents[name] = fd.read()
+            os.utime(path, (OLD_MTIME, OLD_MTIME))
+        return contents
+
+    def saved_again(self):
+        """Return the sources saved since the last call to :meth:`sources`.
+
+        :rtype: list[str]
+        """
+        return sorted(
+            name for name in os.listdir(self.src_dir)
+            if os.stat(os.path.join(self.src_dir, name)).st_mtime != OLD_MTIME)
+
+    def source(self, name):
+        with open(os.path.join(self.src_dir, name), 'r') as fd:
+            return json.load(fd)
+
+    def set_dashboard(self, *attributes):
+        """Add the Dashboard package, with the given attributes, to the
+        project.
+        """
+        gpr = os.path.join(self.project.install_dir, 'simple.gpr')
+        with open(gpr, 'r') as fd:
+            content = fd.read()
+        with open(gpr, 'w') as fd:
+            fd.write(content.replace('end Simple;', '\n'.join(
+                ['package Dashboard is'] +
+                ['   for {} use "{}";'.format(*attr) for attr in attributes] +
+                ['end Dashboard;', '', 'end Simple;'])))
+
+    def report_data(self):
+        """Return the content of each file of the JSON-encoded report.
+
+        The creation time is left out, and so is the review exported by
+        codepeer_bridge, which is not built from the index.
+
+        :rtype: dict[str, bytes]
+        """
+        data_dir = os.path.join(self.report_dir, 'data')
+        contents = {}
+        for root, _, files in os.walk(data_dir):
+            for name in files:
+                if name == 'codepeer_review.xml':
+                    continue
+                path = os.path.join(root, name)
+                with open(path, 'rb') as fd:
+                    contents[os.path.relpath(path, data_dir)] = re.sub(
+                        rb'"creation_time": \d+', b'"creation_time": 0',
+                        fd.read())
+        return contents
+
+    def testRegenerate(self):
+        # 1st run: all sources are saved, by a pool of workers
+        gnathub = GNAThub(self.project, plugins=PLUGINS, jobs=2)
+        self.assertTrue(os.path.isfile(
+            os.path.join(self.report_dir, 'sources.manifest')))
+        expected = self.sources()
+        self.assertEqual(sorted(expected), SOURCES)
+        for line in self.source('simple.adb.json')['lines']:
+            self.assertIn('content', line)
+            self.assertIn('html_content', line)
+            self.assertIn('coverage', line)
+        self.assertTrue(os.listdir(os.path.join(
+            self.project.install_dir, 'obj', 'gnathub', 'cache', 'highlight')),
+            'the highlighted sources should be cached')
+
+        # 2nd run: no source changed, none is saved again
+        gnathub.run(plugins=PLUGINS, jobs=2)
+        self.assertEqual(self.saved_again(), [])
+        self.assertEqual(self.sources(), expected)
+
+        # 3rd run: without the manifest, all sources are saved again,
+        # serially this time, and are identical
+        os.remove(os.path.join(self.report_dir, 'sources.manifest'))
+        gnathub.run(plugins=PLUGINS, jobs=1)
+        self.assertEqual(self.saved_again(), SOURCES)
+        self.assertEqual(self.sources(), expected)
+
+        # 4th run: only the modified source is saved again
+        with open(os.path.join(
+                self.project.install_dir, 'src', 'f.adb'), 'a') as fd:
+            fd.write('--  Modified\n')
+        gnathub.run(plugins=PLUGINS, jobs=2)
+        self.assertEqual(self.saved_again(), ['f.adb.json'])
+        self.assertIn('--  Modified', self.source('f.adb.json')['lines'][-1]
+                      ['content'])
+        self.sources()
+
+        # 5th run: a change of format invalidates all sources
+        self.set_dashboard(
+            ('Compact_JSON', 'True'), ('Omit_Raw_Content', 'True'))
+        gnathub.run(plugins=PLUGINS, jobs=2)
+        self.assertEqual(self.saved_again(), SOURCES)
+        for name, content in self.sources().items():
+            self.assertNotIn(b'\n', content, 'should not be indented')
+            source = self.source(name)
+            self.assertTrue(source['compact'])
+            for line in source['lines']:
+                self.assertNotIn('content', line)
+                self.assertNotIn('coverage', line)
+                self.assertTrue(line['html_content'] is not None)
+
+        # 6th run: nothing changed again
+        gnathub.run(plugins=PLUGINS, jobs=2)
+        self.assertEqual(self.saved_again(), [])
+
+    def testHighlightCache(self):
+        gnathub = GNAThub(self.project, plugins=['gnatmetric'])
+        gnathub.run(script='check-highlight-cache.py')
+
+    def testLexers(self):
+        gnathub = GNAThub(self.project, plugins=['gnatmetric'])
+        gnathub.run(script='check-lexers.py')
+
+    def testMessageShards(self):
+        gnathub = GNAThub(self.project, plugins=['gnatmetric'])
+        gnathub.run(script='check-message-shards.py')
+
+    def testSpillToDisk(self):
+        plugins = ['codepeer'] + PLUGINS
+        gnathub = GNAThub(self.project, plugins=plugins)
+        expected = self.report_data()
+        self.assertIn('code.json', expected)
+        self.assertIn(os.path.join('messages', 'messages-0.json'), expected)
+        self.assertIn(b'"message_count": {', expected['code.json'])
+
+        # Spilling to disk does not change the report
+        self.set_dashboard(('Spill_To_Disk', 'True'))
+        rmtree(os.path.join(self.report_dir, 'data'))
+        gnathub.run(plugins=plugins)
+        actual = self.report_data()
+        self.assertEqual(sorted(actual), sorted(expected))
+        for name, content in expected.items():
+            self.assertEqual(actual[name], content, name)
@@ -0,0 +1,105 @@
+"""Check the pre-forked worker processes of the WebUI server."""
+
+import http.client
+import os
+import signal
+import socket
+import time
+import urllib.request
+
+import GNAThub
+
+from support.asserts import assertEqual, assertNotIn, assertTrue
+
+
+if not os.path.isdir(GNAThub.logs()):
+    os.makedirs(GNAThub.logs())
+
+# Load the server as server-runner.py does, without serving
+script = os.path.join(GNAThub.engine_repository(), 'server.py')
+server = {'__name__': 'gnathub_server', '__file__': script}
+exec(compile(open(script).read(), script, 'exec'), server)
+app = server['app']
+
+
+@app.route('/test/pid')
+def _get_pid():
+    return str(os.getpid())
+
+
+@app.route('/test/sleep/<int:seconds>')
+def _sleep(seconds):
+    time.sleep(seconds)
+    return 'OK'
+
+
+# The settings of the pool of workers, as read when serving
+workers = server['_project_int']('Server_Workers', 0)
+timeout = server['_project_int'](
+    'Server_Timeout', server['DEFAULT_REQUEST_TIMEOUT'])
+assertEqual((2, 1), (workers, timeout))
+
+sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+sock.bind(('127.0.0.1', 0))
+port = sock.getsockname()[1]
+sock.close()
+
+main = os.fork()
+if main == 0:
+    try:
+        server['_serve_prefork'](port, workers, timeout)
+    finally:
+        os._exit(0)
+
+
+def get(path):
+    url = 'http://127.0.0.1:{}{}'.format(port, path)
+    with urllib.request.urlopen(url, timeout=10) as resp:
+        return resp.read().decode('utf-8')
+
+
+def worker_pid(excluded=(), deadline=10):
+    """Return the PID of a worker serving requests, other than ``excluded``.
+
+    Workers accept connections in turn, in no particular order.
+    """
+    end = time.time() + deadline
+    while True:
+        try:
+            pid = int(get('/test/pid'))
+        except (OSError, http.client.HTTPException):
+            # The server is not listening yet
+            pid = None
+        if pid is not None and pid not in excluded:
+            return pid
+        assertTrue(time.time() < end)
+        time.sleep(0.05)
+
+
+try:
+    # Both workers serve requests
+    pids = set()
+    pids.add(worker_pid())
+    pids.add(worker_pid(pids))
+
+    # A killed worker is replaced, and the other one serves meanwhile
+    killed = pids.pop()
+    os.kill(killed, signal.SIGKILL)
+    pids.add(worker_pid(pids))
+    assertNotIn(killed, pids)
+    assertEqual(2, len(pids))
+
+    # A request exceeding the timeout is cut off, and its worker replaced
+    start = time.time()
+    try:
+        get('/test/sleep/10')
+        cut_off = False
+    except (OSError, http.client.HTTPException):
+        cut_off = True
+    assertTrue(cut_off)
+    assertTrue(time.time() - start < 5)
+    assertEqual('OK', get('/test/sleep/0'))
+    worker_pid(pids)
+finally:
+    os.kill(main, signal.SIGTERM)
+    os.waitpid(main, 0)
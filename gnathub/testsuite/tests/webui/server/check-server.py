@@ -0,0 +1,317 @@
+"""Check the responses of the WebUI server, through the Flask test client."""
+
+import gzip
+import os
+import tempfile
+import threading
+import time
+
+from xml.etree import ElementTree
+
+import GNAThub
+
+from support.asserts import assertEqual, assertIn, assertNotIn, assertTrue
+
+
+DATA_DIR = GNAThub.html_data()
+if not os.path.isdir(DATA_DIR):
+    os.makedirs(DATA_DIR)
+if not os.path.isdir(GNAThub.logs()):
+    os.makedirs(GNAThub.logs())
+
+
+def write(path, content, mtime=None):
+    with open(path, 'w') as fd:
+        fd.write(content)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+write(os.path.join(DATA_DIR, 'filter.json'), '{"project": "simple"}')
+
+# Load the server as server-runner.py does, without serving
+script = os.path.join(GNAThub.engine_repository(), 'server.py')
+server = {'__name__': 'gnathub_server', '__file__': script}
+exec(compile(open(script).read(), script, 'exec'), server)
+client = server['app'].test_client()
+
+
+# Data files are served with an ETag, and not sent again while unchanged
+resp = client.get('/json/filter.json')
+assertEqual(200, resp.status_code)
+assertEqual(b'{"project": "simple"}', resp.data)
+etag = resp.headers['ETag']
+
+resp = client.get('/json/filter.json', headers={'If-None-Match': etag})
+assertEqual(304, resp.status_code)
+assertEqual(b'', resp.data)
+
+write(os.path.join(DATA_DIR, 'filter.json'), '{"project": "other"}',
+      time.time() + 10)
+resp = client.get('/json/filter.json', headers={'If-None-Match': etag})
+assertEqual(200, resp.status_code)
+assertEqual(b'{"project": "other"}', resp.data)
+assertTrue(resp.headers['ETag'] != etag)
+
+
+# The gzip-compressed copy is only sent while up to date
+path = os.path.join(DATA_DIR, 'code.json')
+write(path, '{"modules": []}', 1000000000)
+with gzip.open(path + '.gz', 'wb') as fd:
+    fd.write(b'{"modules": []}')
+os.utime(path + '.gz', (1000000000, 1000000000))
+
+resp = client.get('/json/code.json', headers={'Accept-Encoding': 'gzip'})
+assertEqual(200, resp.status_code)
+assertEqual('gzip', resp.headers.get('Content-Encoding'))
+assertEqual(b'{"modules": []}', gzip.decompress(resp.data))
+
+resp = client.get('/json/code.json')
+assertNotIn('Content-Encoding', resp.headers)
+assertEqual(b'{"modules": []}', resp.data)
+
+write(path, '{"modules": [{}]}', 1000000100)
+resp = client.get('/json/code.json', headers={'Accept-Encoding': 'gzip'})
+assertEqual(200, resp.status_code)
+assertNotIn('Content-Encoding', resp.headers)
+assertEqual(b'{"modules": [{}]}', resp.data)
+
+
+def write_gzip(path, content, mtime):
+    write(path, content, mtime)
+    with gzip.open(path + '.gz', 'wb') as fd:
+        fd.write(content.encode('utf-8'))
+    os.utime(path + '.gz', (mtime, mtime))
+
+
+# So are the ones of the sharded message index and of its shards
+shard_dir = os.path.join(DATA_DIR, 'messages')
+os.makedirs(shard_dir)
+index = ('{"_total_message_count": 0, "shards": '
+         '[{"file": "messages/messages-0.json"}]}')
+write_gzip(os.path.join(DATA_DIR, 'message.json'), index, 1000000000)
+write_gzip(os.path.join(shard_dir, 'messages-0.json'), '{"sources": []}',
+           1000000000)
+
+for name, content in (('message.json', index),
+                      ('messages-0.json', '{"sources": []}')):
+    resp = client.get('/json/' + name, headers={'Accept-Encoding': 'gzip'})
+    assertEqual(200, resp.status_code)
+    assertEqual('gzip', resp.headers.get('Content-Encoding'))
+    assertIn('Accept-Encoding', resp.headers.get('Vary'))
+    assertEqual(content.encode('utf-8'), gzip.decompress(resp.data))
+    etag = resp.headers['ETag']
+    resp = client.get('/json/' + name, headers={
+        'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assertEqual(304, resp.status_code)
+    resp = client.get('/json/' + name)
+    assertNotIn('Content-Encoding', resp.headers)
+    assertEqual(content.encode('utf-8'), resp.data)
+
+# Single-file message indexes are converted, and sent uncompressed
+write_gzip(os.path.join(DATA_DIR, 'message.json'),
+           '{"sources": [{"filename": "f.adb"}]}', 1000000100)
+resp = client.get('/json/message.json', headers={'Accept-Encoding': 'gzip'})
+assertEqual(200, resp.status_code)
+assertNotIn('Content-Encoding', resp.headers)
+assertIn('sourcekeys', resp.get_json(force=True))
+
+
+# New files and directories are found, removed ones are not anymore
+assertEqual(404, client.get('/source/new.adb.json').status_code)
+subdir = os.path.join(DATA_DIR, 'sources')
+os.makedirs(subdir)
+write(os.path.join(subdir, 'new.adb.json'), '{"filename": "new.adb"}')
+resp = client.get('/source/new.adb.json')
+assertEqual(200, resp.status_code)
+assertEqual(b'{"filename": "new.adb"}', resp.data)
+
+os.remove(os.path.join(subdir, 'new.adb.json'))
+assertEqual(404, client.get('/source/new.adb.json').status_code)
+
+
+# Concurrent requests for the reviews wait for the same export
+exports = []
+
+
+def export(filename):
+    exports.append(filename)
+    time.sleep(0.5)
+    write(server['_review_path'](filename), '<audit_trail/>')
+
+
+server['_export_codeper_bridge'] = export
+statuses = []
+
+
+def get_review():
+    resp = server['app'].test_client().get('/get-review/codepeer_review.xml')
+    statuses.append(resp.status_code)
+
+
+threads = [threading.Thread(target=get_review) for _ in range(4)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+assertEqual([200] * 4, statuses)
+assertEqual(['codepeer_review.xml'], exports)
+
+# The export is up to date as long as no review is imported
+assertEqual(200, client.get('/get-review/codepeer_review.xml').status_code)
+assertEqual(['codepeer_review.xml'], exports)
+
+
+# The version of codepeer is only probed again when the executable changes
+bindir = tempfile.mkdtemp()
+codepeer = os.path.join(bindir, 'codepeer')
+probes = os.path.join(bindir, 'probes')
+
+
+def make_codepeer(version, mtime):
+    write(codepeer, '#! /bin/sh\necho x >> {}\necho "CodePeer version {} '
+          '(20200101)"\n'.format(probes, version), mtime)
+    os.chmod(codepeer, 0o755)
+
+
+def probe_count():
+    with open(probes, 'r') as fd:
+        return len(fd.readlines())
+
+
+version_path = os.path.join(server['CODEPEER_OBJ_DIR'], 'version.txt')
+if not os.path.isdir(os.path.dirname(version_path)):
+    os.makedirs(os.path.dirname(version_path))
+write(version_path, '21.0w')
+
+path = os.environ['PATH']
+os.environ['PATH'] = bindir
+try:
+    make_codepeer('21.0w', 1000000000)
+    assertEqual(200, client.get('/codepeer-passed').status_code)
+    assertEqual(200, client.get('/codepeer-passed').status_code)
+    assertEqual(1, probe_count())
+
+    make_codepeer('22.0w', 1000000100)
+    assertEqual(202, client.get('/codepeer-passed').status_code)
+    assertEqual(2, probe_count())
+
+    os.remove(codepeer)
+    assertEqual(204, client.get('/codepeer-passed').status_code)
+finally:
+    os.environ['PATH'] = path
+
+
+# The metrics count the requests, by route and status, and their latency
+def metrics():
+    """Return the value of each sample of the metrics."""
+    text = client.get('/metrics').data.decode('utf-8')
+    return dict(line.rsplit(' ', 1)
+                for line in text.splitlines() if not line.startswith('#'))
+
+
+server['METRICS'].reset()
+server['SLOW_REQUEST'] = 1e-9
+log_start = os.path.getsize(server['SERVER_LOG'])
+for _ in range(3):
+    assertEqual(200, client.get('/json/filter.json').status_code)
+assertEqual(404, client.get('/json/missing.json').status_code)
+server['SLOW_REQUEST'] = 0
+assertEqual(404, client.get('/source/missing.json').status_code)
+
+samples = metrics()
+route = 'route="/json/<filename>"'
+assertEqual('1', samples['gnathub_http_requests_in_flight'])
+assertEqual('3', samples['gnathub_http_requests_total{{{},method="GET",'
+                         'status="200"}}'.format(route)])
+assertEqual('1', samples['gnathub_http_requests_total{{{},method="GET",'
+                         'status="404"}}'.format(route)])
+assertEqual('4', samples[
+    'gnathub_http_request_duration_seconds_count{{{}}}'.format(route)])
+assertEqual('4', samples[
+    'gnathub_http_request_duration_seconds_bucket{{{},le="+Inf"}}'.format(
+        route)])
+buckets = [int(samples[
+    'gnathub_http_request_duration_seconds_bucket{{{},le="{}"}}'.format(
+        route, bound)]) for bound in server['Metrics'].BUCKETS]
+assertEqual(sorted(buckets), buckets)
+assertEqual(4, buckets[-1])
+assertTrue(float(samples[
+    'gnathub_http_request_duration_seconds_sum{{{}}}'.format(route)]) > 0)
+with open(os.path.join(DATA_DIR, 'filter.json'), 'rb') as fd:
+    filter_size = len(fd.read())
+assertEqual(str(3 * filter_size + len(b'Not Found')), samples[
+    'gnathub_http_response_bytes_total{{{}}}'.format(route)])
+
+# Requests slower than Server_Slow_Request are logged
+with open(server['SERVER_LOG'], 'r') as fd:
+    fd.seek(log_start)
+    slow = [line for line in fd if 'slow request:' in line]
+assertEqual(3, len([line for line in slow
+                    if 'GET /json/filter.json' in line]))
+assertEqual(1, len([line for line in slow
+                    if 'GET /json/missing.json' in line]))
+assertEqual(4, len(slow))
+
+
+# Malformed reviews are rejected, and not recorded in the journal
+journal_size = server['JOURNAL']._size()
+resp = client.post('/post-review/', data=b'<audit_trail><review>')
+assertEqual(400, resp.status_code)
+assertEqual(journal_size, server['JOURNAL']._size())
+
+
+# Consecutive audit trails are merged, in order; other documents are kept
+# apart
+def trail(*names):
+    return '<audit_trail>{}</audit_trail>'.format(
+        ''.join('<{}/>'.format(name) for name in names)).encode('utf-8')
+
+
+def reviews(data):
+    """Return the elements of an audit trail, or the other documents."""
+    try:
+        root = ElementTree.fromstring(data)
+    except ElementTree.ParseError:
+        return data
+    if root.tag != 'audit_trail':
+        return data
+    return [child.tag for child in root]
+
+
+batches = server['_merge_reviews']([
+    (trail('a'), 10), (trail('b', 'c'), 20), (b'<audit_trail>', 30),
+    (trail('d'), 40), (b'<other/>', 50), (trail('e'), 60), (trail('f'), 70)])
+assertEqual([20, 30, 40, 50, 70], [offset for _, offset in batches])
+assertEqual([['a', 'b', 'c'], b'<audit_trail>', ['d'], b'<other/>',
+             ['e', 'f']],
+            [reviews(data) for data, _ in batches])
+
+
+# A record not completely written is dropped when the journal is reopened;
+# the complete ones are then imported at once
+journal_path = os.path.join(tempfile.mkdtemp(), 'review-journal')
+journal = server['ReviewJournal'](journal_path)
+journal.append(trail('a'))
+journal.append(trail('b'))
+complete_size = journal._size()
+with open(journal_path, 'ab') as fd:
+    fd.write(b'40\n<audit_trail><c/>')
+
+imports = []
+server['REVIEW_BATCH_WINDOW'] = 0.1
+server['_import_reviews'] = imports.append
+journal = server['ReviewJournal'](journal_path)
+assertEqual(complete_size, journal._size())
+journal.start()
+journal.wait_imported()
+assertEqual([['a', 'b']], [reviews(data) for data in imports])
+assertEqual(complete_size, journal.position())
+assertEqual(0, journal._size())
+
+# The next submissions are recorded in a new journal
+journal.append(trail('c'))
+journal.wait_imported()
+assertEqual([['a', 'b'], ['c']], [reviews(data) for data in imports])
+record = '{}\n{}\n'.format(len(trail('c')), trail('c').decode('utf-8'))
+assertEqual(complete_size + len(record), journal.position())
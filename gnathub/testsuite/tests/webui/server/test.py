@@ -0,0 +1,31 @@
+"""Check the caching and the background tasks of the WebUI server."""
+
+import os
+
+from unittest import TestCase
+from support.mock import GNAThub, Project
+
+
+class TestSimpleExample(TestCase):
+    def setUp(self):
+        self.longMessage = True
+        self.gnathub = GNAThub(Project.simple(), plugins=['gnatmetric'])
+
+    def testServerResponses(self):
+        self.gnathub.run(script='check-server.py')
+
+    def testPrefork(self):
+        if not hasattr(os, 'fork'):
+            self.skipTest('worker processes require fork')
+        gpr = os.path.join(self.gnathub.project.install_dir, 'simple.gpr')
+        with open(gpr, 'r') as fd:
+            content = fd.read()
+        with open(gpr, 'w') as fd:
+            fd.write(content.replace('end Simple;', '\n'.join([
+                'package Dashboard is',
+                '   for Server_Workers use "2";',
+                '   for Server_Timeout use "1";',
+                'end Dashboard;',
+                '',
+                'end Simple;'])))
+        self.gnathub.run(script='check-prefork.py')
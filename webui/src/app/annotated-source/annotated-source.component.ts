@@ -124,6 +124,20 @@ export class AnnotatedSourceComponent
         this.createInlineAnnotations();
         this.afterInitProcess(this.selectedLine, this.selectedId);
         this.checkChanges();
+
+        // The message list of the source is only available once the shard
+        // of its source directory is loaded.
+        this.reportService.loadMessageShards(this.source.project,
+                                             this.source.source_dir)
+            .subscribe(
+                messages => {
+                    if (this.selectedId) {
+                        this.initSelectMsg(this.selectedId);
+                    }
+                    this.checkChanges();
+                }, error => {
+                    console.error('[Error] processSource :', error);
+                });
     }
 
     private afterInitProcess(line: number, id: number): void {
@@ -189,7 +203,10 @@ export class AnnotatedSourceComponent
     }
 
     public toList(sources: any): ISourceNav[] {
-        if (this.sourceMessageList.length === 0) {
+        // The list grows as the shards of the message index are loaded
+        const count: number = (Array.isArray(sources) ?
+                               sources.length : Object.keys(sources).length);
+        if (this.sourceMessageList.length !== count) {
             this.sourceMessageList = Object['values'](sources);
         }
         return this.sourceMessageList;
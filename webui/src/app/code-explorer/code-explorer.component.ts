@@ -70,6 +70,17 @@ export class CodeExplorerComponent implements OnInit, OnDestroy, AfterViewInit {
         source.expand = !source.expand;
     }
 
+    public openCloseFolder(project: IModule, folder: ISourceDir): void {
+        this.openClose(folder);
+        if (folder.expand) {
+            // Refine the message counts of the directory with the filters
+            this.reportService.loadMessageShards(project.name, folder.name)
+                .subscribe(
+                    messages => undefined,
+                    error => console.log('[Error] code-explorer:openCloseFolder : ', error));
+        }
+    }
+
     public showFilesChanges(): void {
         this.reportService.showFiles = !this.reportService.showFiles;
     }
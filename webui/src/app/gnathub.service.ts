@@ -5,7 +5,8 @@ import { Http, Response } from '@angular/http';
 import xml2js from 'xml2js';
 
 import { IAnnotatedSourceFile, IFilterIndex, ICodeIndex,
-        IMessageIndex, IReviewUser } from 'gnat';
+        IMessageIndex, IMessageManifest, IMessageShard,
+        IReviewUser } from 'gnat';
 import { createDisplayName } from './utils/createDisplayName';
 
 @Injectable()
@@ -24,11 +25,16 @@ export class GNAThubService {
             map(this.handleResults),
             catchError(this.handleError), );
     }
-    public getMessage(): Observable<IMessageIndex> {
+    public getMessage(): Observable<IMessageIndex | IMessageManifest> {
         return this.http.get('data/message.json').pipe(
             map(this.handleResults),
             catchError(this.handleError), );
     }
+    public getMessageShard(shard: IMessageShard): Observable<IMessageIndex> {
+        return this.http.get('data/' + shard.file).pipe(
+            map(this.handleResults),
+            catchError(this.handleError), );
+    }
     public getReview(): Observable<any> {
         return this.http.get('data/codepeer_review.xml').pipe(
             map(this.convertToJson),
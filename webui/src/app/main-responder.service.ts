@@ -2,6 +2,7 @@ import { Injectable, Inject } from '@angular/core';
 import { GNAThubService } from './gnathub.service';
 import {
     IFilterIndex, ICodeIndex,  IMessageIndex, IMessage,
+    IMessageManifest, IMessageShard,
     IModule, ISourceDir, ISource, IReviewFilter,
     IRankingFilter, ISort, ITool, IReviewUser, ISourceNav
 } from 'gnat';
@@ -14,6 +15,8 @@ import {
     getStoredMessageSort, getStoredProjectSort
 } from './utils/dataStorage';
 import { DOCUMENT } from '@angular/common';
+import { forkJoin, Observable, of, ReplaySubject } from 'rxjs';
+import { map, mergeMap, shareReplay, take, tap } from 'rxjs/operators';
 
 export type InteralStateType = {
     [key: string]: any
@@ -109,6 +112,11 @@ export class SharedReport {
 
     public sourceMessageList: ISourceNav[] = [];
 
+    /* Correspond to the shards of the message index, see loadMessageShards */
+    private messageManifest: ReplaySubject<IMessageManifest> = new ReplaySubject(1);
+    private messageShards: { [file: string]: Observable<IMessageIndex> } = {};
+    public pendingMessageShards: IMessageShard[] = [];
+
     constructor(@Inject(DOCUMENT) private document: Document,
                 private gnathub: GNAThubService,
                 private http: Http) {
@@ -281,11 +289,7 @@ export class SharedReport {
         this.http.get(this.url + 'json/message.json')
             .subscribe(
                 data => {
-                    this.message = JSON.parse(data['_body']);
-                    if (this.codepeerReview){
-                        this.addUserReview();
-                    }
-                    this.refreshFilter();
+                    this.loadMessage(JSON.parse(data['_body']));
                 }, error => {
                     console.log('[Error] get message : ', error);
                     this.getMessageOffline();
@@ -296,17 +300,92 @@ export class SharedReport {
     private getMessageOffline(): void {
         this.gnathub.getMessage().subscribe(
             messages => {
-                this.message = messages;
-                if (this.isCodepeer) {
-                    this.getUserReview();
-                }
-                this.refreshFilter();
+                this.loadMessage(messages);
             }, error => {
                 this.isReportFetchError = true;
             }
         );
     }
 
+    /* message.json either holds all the messages or, for reports split in
+     * shards, only lists the shards. Shards are then only fetched when the
+     * messages of their source directory are displayed, see
+     * loadMessageShards.
+     */
+    private loadMessage(index: any): void {
+        if (index.shards == null) {
+            this.addMessages(index);
+            this.messageManifest.next({
+                shards: [],
+                _total_message_count: index._total_message_count
+            });
+        } else {
+            this.pendingMessageShards = index.shards.slice();
+            this.addMessages({ sources: [] });
+            this.messageManifest.next(index);
+        }
+    }
+
+    /* Fetch the shards holding the messages of a project, or of one of its
+     * source directories. Each shard is only fetched once, and its messages
+     * are added to the report as soon as it is loaded. The returned
+     * observable emits once all these shards are loaded.
+     */
+    public loadMessageShards(project: string,
+                             sourceDir?: string): Observable<IMessageIndex[]> {
+        return this.messageManifest.pipe(
+            take(1),
+            mergeMap(manifest => {
+                const shards: Array<Observable<IMessageIndex>> = manifest.shards
+                    .filter(shard => shard.project === project &&
+                            (sourceDir == null || shard.source_dir === sourceDir))
+                    .map(shard => this.fetchMessageShard(shard));
+                return shards.length > 0 ? forkJoin(shards) : of([]);
+            }));
+    }
+
+    private fetchMessageShard(shard: IMessageShard): Observable<IMessageIndex> {
+        if (!this.messageShards[shard.file]) {
+            this.pendingMessageShards = this.pendingMessageShards.filter(
+                pending => pending.file !== shard.file);
+            this.messageShards[shard.file] = this.getMessageShard(shard).pipe(
+                tap(messages => this.addMessages(messages)),
+                shareReplay(1));
+            this.messageShards[shard.file].subscribe(
+                messages => undefined,
+                error => {
+                    console.log('[Error] get message shard ' + shard.file + ' : ', error);
+                    this.isReportFetchError = true;
+                });
+        }
+        return this.messageShards[shard.file];
+    }
+
+    private getMessageShard(shard: IMessageShard): Observable<IMessageIndex> {
+        if (this.isOnline) {
+            return this.http.get(this.url + 'json/' + shard.file.split('/').pop())
+                .pipe(map(data => JSON.parse(data['_body'])));
+        }
+        return this.gnathub.getMessageShard(shard);
+    }
+
+    private addMessages(messages: IMessageIndex): void {
+        if (this.message) {
+            this.message.sources = this.toList(this.message.sources)
+                                       .concat(messages.sources);
+            this.sourceMessageList = [];
+        } else {
+            this.message = messages;
+        }
+
+        if (this.codepeerReview) {
+            this.addUserReview();
+        } else if (!this.isOnline && this.isCodepeer) {
+            this.getUserReview();
+        }
+        this.refreshFilter();
+    }
+
     private sortReviewStatus(array: string[], myKind: string, priority: number): any {
         let tmpArray: any[] = [];
         array.sort((a, b) => (a > b ? -1 : 1));
@@ -660,11 +739,14 @@ export class SharedReport {
     }
 
     private addUserReview(): void {
+        // Run again as the shards of the message index are loaded: count the
+        // reviews of all the loaded messages from scratch.
+        this.userReviewFilter = undefined;
         let sources: any[] = this.toList(this.message.sources);
         if (this.checkArray(sources, 'main-responder.service',
                             'addUserReview', 'message.sources')) {
             sources.forEach(function (source: ISourceNav): void {
-                source.expand = false;
+                source.expand = source.expand || false;
                 if (source.messages) {
                     source.messages.forEach(function (message: IMessage): void {
                         if (this.codepeerReview[message.tool_msg_id]) {
@@ -3,7 +3,7 @@ import { SharedReport } from '../main-responder.service';
 import { sortMessageArray } from '../utils/sortArray';
 import { storeMessageSort } from '../utils/dataStorage';
 import { DOCUMENT } from '@angular/common';
-import { ISort, ISourceNav, IMessage } from 'gnat';
+import { ISort, ISourceNav, IMessage, IMessageShard } from 'gnat';
 
 @Component({
     selector: 'message-explorer',
@@ -26,7 +26,10 @@ export class MessageExplorerComponent implements OnInit, AfterViewInit {
         });
     }
     public toList(sources: any): ISourceNav[] {
-        if (this.sourceMessageList.length === 0) {
+        // The list grows as the shards of the message index are loaded
+        const count: number = (Array.isArray(sources) ?
+                               sources.length : Object.keys(sources).length);
+        if (this.sourceMessageList.length !== count) {
             this.sourceMessageList = Object['values'](sources);
         }
         return this.sourceMessageList;
@@ -58,6 +61,13 @@ export class MessageExplorerComponent implements OnInit, AfterViewInit {
         source.expand = isOpen;
     }
 
+    public loadShard(shard: IMessageShard): void {
+        this.reportService.loadMessageShards(shard.project, shard.source_dir)
+            .subscribe(
+                messages => undefined,
+                error => console.log('[Error] message-explorer:loadShard : ', error));
+    }
+
     public showFilesChanges(): void {
         this.reportService.showFiles = !this.reportService.showFiles;
     }
@@ -69,4 +79,8 @@ export class MessageExplorerComponent implements OnInit, AfterViewInit {
     public trackSrc(index: number, source: ISourceNav): string{
         return source ? source.filename : undefined;
     }
+
+    public trackShard(index: number, shard: IMessageShard): string{
+        return shard ? shard.file : undefined;
+    }
 }
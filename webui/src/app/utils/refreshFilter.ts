@@ -118,7 +118,9 @@ export function updateFilter(reportService: any): void {
             folder._ui_total_message_count = 0;
 
             folder.sources.forEach(function(codeSource: ISource): void {
-                codeSource._ui_total_message_count = 0;
+                // Only set once the messages of the source are loaded, see
+                // SharedReport.loadMessageShards
+                codeSource._ui_total_message_count = undefined;
 
                 Object['values'](reportService.message.sources).forEach(
                     function(source: ISourceNav): void {
@@ -135,6 +137,7 @@ export function updateFilter(reportService: any): void {
                             source.messages != null){
                             source.countRanking = initCountRanking();
                             source._ui_total_message_count = 0;
+                            codeSource._ui_total_message_count = 0;
 
                             source.messages.forEach(function(
                                 message: IMessage): void {
@@ -203,6 +206,14 @@ export function updateFilter(reportService: any): void {
                                 }.bind(this));
                         }
                     }.bind(this));
+
+                // Count all the messages of the sources not loaded yet
+                if (codeSource._ui_total_message_count == null) {
+                    const count: number = codeSource._total_message_count || 0;
+                    folder._ui_total_message_count += count;
+                    myModule._ui_total_message_count += count;
+                    reportService.totalMessageCount += count;
+                }
             }.bind(this));
         }.bind(this));
     }.bind(this));
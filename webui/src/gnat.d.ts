@@ -176,6 +176,23 @@ declare module 'gnat' {
         _ui_total_message_count?: number;
     }
 
+    // message.json only lists the shards holding the messages, each shard
+    // being an IMessageIndex of its own.
+
+    export interface IMessageShard {
+        file: string;
+        project: string;
+        source_dir: string;
+        source_count: number;
+        message_count?: { [toolId: number]: number };
+        _total_message_count: number;
+    }
+
+    export interface IMessageManifest {
+        shards: IMessageShard[];
+        _total_message_count: number;
+    }
+
     // **
     //  Part for the FILENAME.json (annotated-source)
     // **
@@ -197,10 +214,14 @@ declare module 'gnat' {
         _ui_hidden?: boolean;
     }
 
+    // In the compact format, |messages| holds indexes in the |messages|
+    // list of the source, and |coverage| is omitted.
     export interface IAnnotatedSourceLine {
         number: number;
-        content: string;
+        content?: string;
         html_content: string;
+        coverage?: ICoverage;
+        messages?: Array<IAnnotatedSourceMessage | number>;
     }
 
     export interface IAnnotatedSourceFile {
@@ -213,6 +234,7 @@ declare module 'gnat' {
         coverage?: { [line: number]: ICoverage };
         messages?: IAnnotatedSourceMessage[];
         annotations?: IAnnotatedSourceMessage[];
+        compact?: boolean;
     }
 
     // Interface for the sorting instance